@@ -2,11 +2,25 @@
 Main entry point for the msr package.
 Allows execution via 'python -m msr'.
 msr 패키지의 실행 진입점입니다.
+- 인자 없이 실행하면 GUI, `--watch <소스 폴더>`이면 GUI 없이 감시 모드로 실행합니다.
+- `--dry-run`/`--apply <소스 폴더> --plan-file <계획 파일>`도 GUI 없이 실행합니다.
 """
-from msr.app import MediaShotdateRenamerApp
+import sys
+
+from msr.cli import build_parser, run_apply, run_dry_run, run_watch
 
 def main():
     """Initializes and runs the application."""
+    args = build_parser().parse_args()
+    if args.watch:
+        sys.exit(run_watch(args))
+    if args.dry_run:
+        sys.exit(run_dry_run(args))
+    if args.apply:
+        sys.exit(run_apply(args))
+
+    # 감시 모드는 tkinter 없이도 실행되도록 GUI는 여기서 불러온다.
+    from msr.app import MediaShotdateRenamerApp
     app = MediaShotdateRenamerApp()
     app.mainloop()
 
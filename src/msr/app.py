@@ -11,6 +11,7 @@ from queue import Queue, Empty
 from threading import Thread, Event
 
 from msr.ui.gui import MainWindow
+from msr.core.copier import OUTPUT_COPY
 from msr.core.file_processor import FileProcessor
 
 
@@ -40,12 +41,21 @@ class MediaShotdateRenamerApp(tk.Tk):
         # M3-02: 주기적으로 Queue를 확인하는 `after` 콜백 설정
         self.after(100, self.on_processing_event)
 
-    def start_processing(self, source_directory: str):
+    def start_processing(
+        self,
+        source_directory: str,
+        incremental: bool = False,
+        output_mode: str = OUTPUT_COPY,
+        verify: bool = False,
+    ):
         """
         Starts the file processing in a separate worker thread.
         - Disables the 'Start' button to prevent multiple runs.
         - Creates and starts the worker thread.
         - PRD NFR-01: GUI 프리징이 없어야 한다.
+        - incremental: 지난 실행 이후 바뀌지 않은 파일은 건너뛴다(msr.core.manifest).
+        - output_mode: 결과 파일을 만드는 방식(copy/hardlink/move, msr.core.copier).
+        - verify: 복사하면서 체크섬을 기록하고 복사본을 다시 읽어 확인한다(msr.core.checksums).
         """
         if not source_directory or not os.path.exists(source_directory):
             messagebox.showwarning("경고", "유효한 소스 폴더를 선택해주세요.")
@@ -53,7 +63,14 @@ class MediaShotdateRenamerApp(tk.Tk):
         
         # M3-02: 워커 스레드 생성 및 시작 로직
         self.stop_event.clear()
-        processor = FileProcessor(source_directory, self.queue, self.stop_event)
+        processor = FileProcessor(
+            source_directory,
+            self.queue,
+            self.stop_event,
+            incremental=incremental,
+            output_mode=output_mode,
+            verify=verify,
+        )
         worker = Thread(target=processor.process_files, daemon=True)
         worker.start()
 
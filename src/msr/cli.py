@@ -0,0 +1,159 @@
+"""
+This module defines the headless (console) entry points.
+- 감시 모드(드롭 폴더): `python -m msr --watch <소스 폴더>`
+- 드라이런: `python -m msr --dry-run <소스 폴더> [--plan-file plan.jsonl|plan.csv]` (복사 없이 계획만 기록)
+- 계획 적용: `python -m msr --apply <소스 폴더> --plan-file plan.jsonl` (ExifTool 없이 계획대로 복사)
+- CRG 5.2: 코어 로직은 GUI와 같은 이벤트(LOG/ERROR/COMPLETE)로만 결과를 알린다.
+"""
+import argparse
+import signal
+import sys
+from threading import Event
+
+from msr.core.copier import OUTPUT_COPY, OUTPUT_MODES
+from msr.core.copy_engine import DEFAULT_DURABILITY, DURABILITY_LEVELS
+from msr.core.exiftool import FAST_LEVELS
+from msr.core.file_processor import DEFAULT_BATCH_WINDOW, FileProcessor
+from msr.core.watcher import DEFAULT_POLL_INTERVAL, DEFAULT_SETTLE_SECONDS
+
+
+class ConsoleEventSink:
+    """FileProcessor 이벤트를 콘솔에 출력한다(event_queue 대신 사용)."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.failed = False  # ERROR 이벤트를 받았는지(종료 코드용)
+
+    def put(self, event: dict):
+        etype = event["type"]
+        if etype == "LOG":
+            print(event["msg"], file=self.stream, flush=True)
+        elif etype == "ERROR":
+            self.failed = True
+            print(f"오류: {event['msg']}", file=self.stream, flush=True)
+        elif etype == "COMPLETE":
+            print(event["summary"], file=self.stream, flush=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="msr", description="Media Shotdate Renamer")
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument(
+        "--watch", metavar="SOURCE", help="GUI 없이 SOURCE 폴더를 감시하며 새 파일을 처리합니다."
+    )
+    modes.add_argument(
+        "--dry-run", metavar="SOURCE",
+        help="SOURCE 폴더를 계획까지만 처리하고, 복사 대신 실행 계획을 --plan-file에 기록합니다.",
+    )
+    modes.add_argument(
+        "--apply", metavar="SOURCE",
+        help="--plan-file의 계획을 SOURCE 폴더에 적용합니다(메타데이터 추출/재계획 없음).",
+    )
+    parser.add_argument(
+        "--plan-file", metavar="FILE",
+        help="실행 계획 파일(.jsonl 또는 .csv). 드라이런에서 생략하면 result/plan-*.jsonl",
+    )
+    parser.add_argument(
+        "--output-mode", choices=OUTPUT_MODES, default=OUTPUT_COPY,
+        help="결과 파일을 만드는 방식: copy(복사), hardlink(하드링크), move(이동)",
+    )
+    parser.add_argument(
+        "--checksum", action="store_true",
+        help="복사하면서 BLAKE2b 체크섬을 계산해 result/checksums-*.b2sum 에 기록합니다.",
+    )
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="--checksum에 더해 복사본을 다시 읽어 체크섬을 확인합니다.",
+    )
+    parser.add_argument(
+        "--durability", choices=DURABILITY_LEVELS, default=DEFAULT_DURABILITY,
+        help="복사본을 최종 이름으로 옮기기 전 fsync 수준: none, file(파일), full(파일+폴더)",
+    )
+    parser.add_argument(
+        "--camera-rules", metavar="FILE",
+        help="카메라 정규화 규칙 파일(JSON). 생략하면 기본 규칙(EOSR7, EOS200D2, iPhone)",
+    )
+    parser.add_argument(
+        "--exiftool-fast", type=int, choices=FAST_LEVELS, default=0,
+        help="ExifTool 빠른 조회: 1(-fast), 2(-fast2). 촬영일을 못 찾은 파일은 전체 태그로 다시 조회합니다.",
+    )
+    parser.add_argument(
+        "--settle", type=float, default=DEFAULT_SETTLE_SECONDS,
+        help="파일 크기/수정시간이 이 시간(초) 동안 그대로이면 쓰기가 끝난 것으로 봅니다.",
+    )
+    parser.add_argument(
+        "--batch-window", type=float, default=DEFAULT_BATCH_WINDOW,
+        help="쓰기가 끝난 파일을 이 시간(초) 동안 모아 한 번에 처리합니다.",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+        help="inotify를 쓸 수 없을 때 다시 수집하는 주기(초)",
+    )
+    return parser
+
+
+def _stop_on_signal() -> Event:
+    """SIGINT/SIGTERM을 받으면 설정되는 stop_event를 만든다."""
+    stop_event = Event()
+
+    def request_stop(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    return stop_event
+
+
+def run_watch(args: argparse.Namespace) -> int:
+    stop_event = _stop_on_signal()
+    processor = FileProcessor(
+        args.watch,
+        ConsoleEventSink(),
+        stop_event,
+        output_mode=args.output_mode,
+        checksum=args.checksum,
+        verify=args.verify,
+        durability=args.durability,
+        camera_rules_path=args.camera_rules,
+        exiftool_fast=args.exiftool_fast,
+    )
+    processor.watch_folder(
+        settle_seconds=args.settle,
+        batch_window=args.batch_window,
+        poll_interval=args.poll_interval,
+    )
+    return 0
+
+
+def run_dry_run(args: argparse.Namespace) -> int:
+    sink = ConsoleEventSink()
+    processor = FileProcessor(
+        args.dry_run,
+        sink,
+        _stop_on_signal(),
+        output_mode=args.output_mode,
+        dry_run=True,
+        plan_path=args.plan_file,
+        camera_rules_path=args.camera_rules,
+        exiftool_fast=args.exiftool_fast,
+    )
+    processor.process_files()
+    return 1 if sink.failed else 0
+
+
+def run_apply(args: argparse.Namespace) -> int:
+    if not args.plan_file:
+        print("오류: --apply에는 --plan-file이 필요합니다.", file=sys.stderr)
+        return 2
+    sink = ConsoleEventSink()
+    processor = FileProcessor(
+        args.apply,
+        sink,
+        _stop_on_signal(),
+        output_mode=args.output_mode,
+        checksum=args.checksum,
+        verify=args.verify,
+        durability=args.durability,
+    )
+    processor.apply_plan(args.plan_file)
+    return 1 if sink.failed else 0
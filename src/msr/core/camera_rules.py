@@ -0,0 +1,130 @@
+"""
+msr.core.camera_rules
+
+카메라 정규화 규칙 표. (Make, Model) 쌍을 카메라 토큰으로 바꾼다.
+
+- CRG 4.4: 카메라 정규화. 기본 규칙은 DEFAULT_RULES이고, JSON 파일로 바꿀 수 있다
+  (load_camera_rules). 카메라를 추가할 때 코드를 고치지 않는다.
+- 규칙 1개: 제조사(make)에 make 문자열이 들어 있고, 모델(model)에 models 중 하나가 들어 있으면
+  token. 비교는 대소문자를 무시하고, 위에서부터 처음 맞는 규칙을 쓴다.
+- 모든 규칙을 정규식 하나로 컴파일해 한 번에 판별하고, 결과는 (Make, Model) 쌍마다 기억한다
+  (한 촬영분에는 기종이 몇 개뿐이다).
+
+규칙 파일 형식(JSON):
+    {"rules": [
+        {"token": "EOSR7", "make": "canon", "models": ["eos r7"]},
+        {"token": "iPhone", "make": "apple", "models": ["iphone"]}
+    ]}
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+UNKNOWN_CAMERA = "UNKNOWN"
+
+# 판별 문자열에서 제조사와 모델을 나누는 문자(EXIF 문자열 끝의 NUL은 미리 지운다)
+_SEPARATOR = "\x00"
+
+
+class CameraRule(NamedTuple):
+    """제조사에 make가, 모델에 models 중 하나가 들어 있으면 token."""
+
+    token: str
+    make: str
+    models: tuple[str, ...]
+
+
+# CRG 4.4: 출력 토큰 EOSR7, EOS200D2, iPhone. EOS 200D II 표기 다양성은 모두 EOS200D2.
+DEFAULT_RULES: tuple[CameraRule, ...] = (
+    CameraRule("EOSR7", "canon", ("eos r7",)),
+    CameraRule("EOS200D2", "canon", ("eos 200d ii", "eos 200d2", "eos kiss x10i")),
+    CameraRule("iPhone", "apple", ("iphone",)),
+)
+
+
+class CameraNormalizer:
+    """규칙 표를 정규식 하나로 컴파일한 판별기. 결과는 (Make, Model) 쌍마다 기억한다."""
+
+    def __init__(self, rules: Iterable[CameraRule] = DEFAULT_RULES):
+        """
+        Raises
+        - ValueError: 토큰/제조사/모델 문자열이 비어 있는 규칙
+        """
+        self.rules = tuple(rules)
+        branches = []
+        for rule in self.rules:
+            if not rule.token or not rule.make.strip() or not any(m.strip() for m in rule.models):
+                raise ValueError(f"잘못된 카메라 규칙: {rule}")
+            models = "|".join(re.escape(m.strip().lower()) for m in rule.models if m.strip())
+            # 제조사 부분에서 make를, 구분 문자 뒤 모델 부분에서 models 중 하나를 찾는다.
+            branches.append(
+                rf"[^{_SEPARATOR}]*?{re.escape(rule.make.strip().lower())}"
+                rf"[^{_SEPARATOR}]*{_SEPARATOR}.*?(?:{models})"
+            )
+        # 앞에서부터 맞춰 보므로(re.match + 분기 순서) 규칙의 우선순위가 유지된다.
+        self._matcher = (
+            re.compile("|".join(f"({b})" for b in branches), re.DOTALL) if branches else None
+        )
+        self._memo: dict[tuple[Optional[str], Optional[str]], str] = {}
+        self._lock = threading.Lock()
+
+    def normalize(self, make: Optional[str], model: Optional[str]) -> str:
+        key = (make, model)
+        token = self._memo.get(key)
+        if token is None:
+            token = self._match(make, model)
+            with self._lock:
+                self._memo[key] = token
+        return token
+
+    def _match(self, make: Optional[str], model: Optional[str]) -> str:
+        if not make or not model or self._matcher is None:
+            return UNKNOWN_CAMERA
+        subject = (
+            make.replace(_SEPARATOR, "").lower()
+            + _SEPARATOR
+            + model.replace(_SEPARATOR, "").lower()
+        )
+        match = self._matcher.match(subject)
+        if match is None:
+            return UNKNOWN_CAMERA
+        assert match.lastindex is not None  # 맞은 분기(규칙) 번호, 1부터
+        return self.rules[match.lastindex - 1].token
+
+
+def load_camera_rules(path: Path) -> tuple[CameraRule, ...]:
+    """
+    JSON 규칙 파일을 읽는다(형식은 모듈 설명 참고). 최상위가 목록이면 그 목록을 규칙으로 본다.
+
+    Raises
+    - OSError: 파일을 읽을 수 없는 경우
+    - ValueError: JSON 형식 오류, 빠진 항목 또는 잘못된 규칙(항목 번호 포함)
+    - TypeError: 'rules' 목록이 없거나, 규칙이 객체가 아니거나, token/make/models가 문자열이 아닌 경우
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    entries = data.get("rules") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise TypeError(f"{path}: 'rules' 목록이 없습니다")
+    rules = []
+    for no, entry in enumerate(entries, start=1):
+        if not isinstance(entry, dict):
+            raise TypeError(f"{path}: {no}번째 규칙이 객체가 아닙니다")
+        try:
+            token, make, models = entry["token"], entry["make"], entry["models"]
+        except KeyError as e:
+            raise ValueError(f"{path}: {no}번째 규칙에 {e} 항목이 없습니다") from e
+        if isinstance(models, str):
+            models = [models]
+        if not isinstance(models, list) or not all(
+            isinstance(value, str) for value in (token, make, *models)
+        ):
+            raise TypeError(f"{path}: {no}번째 규칙의 token/make/models는 문자열이어야 합니다")
+        rules.append(CameraRule(token, make, tuple(models)))
+    CameraNormalizer(rules)  # 잘못된 규칙은 여기서 ValueError
+    return tuple(rules)
@@ -0,0 +1,73 @@
+"""
+msr.core.checksums
+
+실행별 체크섬 목록(b2sum 형식)과 이전 실행 목록의 색인.
+
+- 위치: [SourceRoot]/result/checksums-YYYYMMDD-HHMMSS.b2sum (CRG 11: 결과/로그는 result/ 아래)
+- 형식: "<BLAKE2b-512 16진수>  <result/ 기준 상대 경로>" 한 줄에 파일 1개.
+  result/ 에서 `b2sum -c checksums-....b2sum` 으로 그대로 검증할 수 있다.
+- 줄은 복사 단계가 소스 순서대로 쓴다(NFR-03 결정성).
+- load_checksum_index: 이전 실행 목록들을 읽어 결과 파일 -> 해시 색인을 만든다(나중 실행이 우선).
+  충돌 판정(is_same_file)에서 크기는 같고 수정시간만 다른 파일을 해시로 비교하는 데 쓴다.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Optional, TextIO
+
+CHECKSUM_PREFIX = "checksums-"
+CHECKSUM_SUFFIX = ".b2sum"
+
+
+class ChecksumWriter:
+    """실행 1회의 체크섬 목록 파일. 첫 add() 때 파일을 만든다."""
+
+    def __init__(self, result_root: Path, started: Optional[float] = None):
+        self.result_root = result_root
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started))
+        self.path = result_root / f"{CHECKSUM_PREFIX}{stamp}{CHECKSUM_SUFFIX}"
+        self.count = 0
+        self._file: Optional[TextIO] = None
+
+    def __enter__(self) -> "ChecksumWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add(self, dst_path: Path, digest: str) -> None:
+        """
+        Raises
+        - OSError: 목록 파일을 만들거나 쓸 수 없는 경우
+        """
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8", newline="\n")
+        rel = dst_path.relative_to(self.result_root).as_posix()
+        self._file.write(f"{digest}  {rel}\n")
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def load_checksum_index(result_root: Path) -> dict[Path, str]:
+    """result_root의 체크섬 목록들을 읽어 결과 파일 경로 -> 해시 색인을 만든다. 깨진 줄은 무시한다."""
+    index: dict[Path, str] = {}
+    try:
+        manifests = sorted(result_root.glob(f"{CHECKSUM_PREFIX}*{CHECKSUM_SUFFIX}"))
+    except OSError:
+        return index
+    for manifest in manifests:
+        try:
+            lines = manifest.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            digest, sep, rel = line.partition("  ")
+            if sep and digest and rel:
+                index[result_root / rel] = digest
+    return index
@@ -0,0 +1,149 @@
+"""
+msr.core.chunking
+
+측정된 추출 지연 시간에 맞춰 배치(chunk) 크기를 조절하는 적응형 chunker.
+
+- CRG 6.1: 배치 추출 단위. 고정 500개는 NAS의 대용량 MOV에는 너무 크고(실패 시 손실/진행 정체),
+  로컬 SSD의 작은 JPEG 수천 개에는 너무 작다.
+- 앞선 배치에서 측정한 "파일당 초"와 "초당 바이트"의 이동 평균(EWMA)으로 다음 chunk가
+  target_seconds 안에 끝나도록 크기를 정한다.
+  - 파일당 초 기준: target_seconds / seconds_per_file 개
+  - 초당 바이트 기준: 누적 크기가 target_seconds * bytes_per_second 를 넘기 전까지
+  두 기준 중 작은 쪽을 택하므로, 작은 파일 폴더에서 대용량 파일 폴더로 넘어가도 chunk가 곧바로 줄어든다.
+- 항상 [min_size, max_size] 범위를 지킨다.
+- chunk는 요청될 때 만들어지므로(지연 생성) 이미 제출된 chunk의 측정값이 다음 chunk에 반영된다.
+- 입력은 목록뿐 아니라 수집 단계가 채우는 스트림(반복자)이어도 된다. 필요한 만큼만 읽는다.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping, Optional
+
+if TYPE_CHECKING:
+    from msr.core.scanner import FileStat
+
+DEFAULT_MIN_CHUNK_SIZE = 20
+DEFAULT_MAX_CHUNK_SIZE = 2000
+DEFAULT_INITIAL_CHUNK_SIZE = 100
+DEFAULT_TARGET_SECONDS = 5.0
+
+# 이동 평균에서 최근 측정값의 비중
+EWMA_ALPHA = 0.5
+
+
+class AdaptiveChunker:
+    """파일 목록을 측정 기반 크기의 chunk로 나누는 반복자. record()는 워커 스레드에서 호출해도 된다."""
+
+    def __init__(
+        self,
+        files: Iterable[Path],
+        min_size: int = DEFAULT_MIN_CHUNK_SIZE,
+        max_size: int = DEFAULT_MAX_CHUNK_SIZE,
+        target_seconds: float = DEFAULT_TARGET_SECONDS,
+        initial_size: Optional[int] = None,
+        file_stats: Optional[Mapping[Path, "FileStat"]] = None,
+    ):
+        """
+        file_stats: 수집 단계의 stat(있으면 파일 크기를 다시 stat하지 않음)
+
+        Raises
+        - ValueError: min_size < 1, max_size < min_size 또는 target_seconds <= 0 인 경우
+        """
+        if min_size < 1 or max_size < min_size:
+            raise ValueError(f"잘못된 chunk 크기 범위: min={min_size}, max={max_size}")
+        if target_seconds <= 0:
+            raise ValueError(f"target_seconds는 0보다 커야 합니다: {target_seconds}")
+        self.files = files
+        self.file_stats = file_stats
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        if initial_size is None:
+            initial_size = DEFAULT_INITIAL_CHUNK_SIZE
+        self.initial_size = self._clamp(initial_size)
+        self.seconds_per_file: Optional[float] = None
+        self.bytes_per_second: Optional[float] = None
+        self.chunk_sizes: list[int] = []
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[list[Path]]:
+        it = iter(self.files)
+        carry: Optional[Path] = None  # 바이트 예산을 넘겨 다음 chunk로 넘긴 파일
+        while True:
+            limit, budget = self.next_limits()
+            chunk: list[Path] = []
+            total = 0
+            while len(chunk) < limit:
+                if carry is not None:
+                    path, carry = carry, None
+                else:
+                    next_path = next(it, None)
+                    if next_path is None:
+                        break
+                    path = next_path
+                if budget is not None:
+                    size = file_size(path, self.file_stats)
+                    if len(chunk) >= self.min_size and total + size > budget:
+                        carry = path
+                        break
+                    total += size
+                chunk.append(path)
+            if not chunk:
+                return
+            self.chunk_sizes.append(len(chunk))
+            yield chunk
+
+    def _clamp(self, size: int) -> int:
+        return max(self.min_size, min(self.max_size, size))
+
+    def next_limits(self) -> tuple[int, Optional[float]]:
+        """
+        다음 chunk의 (최대 파일 수, 바이트 예산)을 정한다.
+        바이트 예산이 None이면 파일 수로만 자른다. 예산을 넘겨도 min_size개까지는 채운다.
+        """
+        with self._lock:
+            spf = self.seconds_per_file
+            bps = self.bytes_per_second
+        if spf is None:
+            return self.initial_size, None
+
+        size = self.max_size if spf <= 0 else self._clamp(int(self.target_seconds / spf))
+        budget = self.target_seconds * bps if bps else None
+        return size, budget
+
+    def record(self, file_count: int, byte_count: int, seconds: float) -> None:
+        """추출이 끝난 chunk의 측정값(파일 수, 총 바이트, 소요 초)을 반영한다."""
+        if file_count <= 0 or seconds < 0:
+            return
+        spf = seconds / file_count
+        bps = byte_count / seconds if seconds > 0 else None
+        with self._lock:
+            self.seconds_per_file = _ewma(self.seconds_per_file, spf)
+            if bps is not None:
+                self.bytes_per_second = _ewma(self.bytes_per_second, bps)
+
+
+def _ewma(previous: Optional[float], value: float) -> float:
+    if previous is None:
+        return value
+    return EWMA_ALPHA * value + (1 - EWMA_ALPHA) * previous
+
+
+def file_size(path: Path, file_stats: Optional[Mapping[Path, "FileStat"]] = None) -> int:
+    """수집 단계가 기록한 크기(file_stats)를 쓰고, 없으면 stat한다(stat 실패 파일은 0)."""
+    if file_stats is not None:
+        stat = file_stats.get(path)
+        if stat is not None:
+            return stat.size
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def chunk_bytes(files: list[Path], file_stats: Optional[Mapping[Path, "FileStat"]] = None) -> int:
+    """chunk의 총 파일 크기(stat 실패 파일은 0으로 계산)."""
+    return sum(file_size(p, file_stats) for p in files)
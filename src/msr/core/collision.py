@@ -5,29 +5,115 @@ This module defines the collision resolution logic.
 """
 import re
 from pathlib import Path
+from typing import TYPE_CHECKING, Mapping, Optional
+
+from msr.core.copy_engine import file_checksum
+
+if TYPE_CHECKING:
+    from msr.core.dest_index import DestEntry, DestinationIndex
+    from msr.core.scanner import FileStat
 
 COLLISION_NUMERIC_SUFFIX_PATTERN = re.compile(r"^(?P<base>.*)(?P<suffix>\d+)$")
 
-def is_same_file(src: Path, dst: Path) -> bool:
-    """원본과 대상이 동일한 파일인지 크기와 수정시간으로 확인합니다."""
+def is_same_file(
+    src: Path,
+    dst: Path,
+    src_stat: Optional["FileStat"] = None,
+    checksums: Optional[Mapping[Path, str]] = None,
+    dst_entry: Optional["DestEntry"] = None,
+) -> bool:
+    """
+    원본과 대상이 동일한 파일인지 크기와 수정시간으로 확인합니다.
+    src_stat(수집 단계의 stat)이 주어지면 원본은 다시 stat하지 않습니다.
+    dst_entry(결과 폴더 색인의 항목)가 주어지면 대상도 다시 stat하지 않습니다.
+    하드링크 출력이면 대상이 원본과 같은 inode이므로 그대로 동일한 파일로 봅니다.
+    checksums(결과 파일 -> 복사 시 기록한 해시)에 대상이 있으면, 크기는 같고 수정시간만 다를 때
+    원본 해시와 비교합니다(수정시간을 보존하지 않는 도구로 옮겨진 파일 등).
+    """
     try:
-        s_stat = src.stat()
-        d_stat = dst.stat()
+        if dst_entry is None:
+            d_stat = dst.stat()
+            d_size, d_mtime_ns, d_ino, d_dev = (
+                d_stat.st_size, d_stat.st_mtime_ns, d_stat.st_ino, d_stat.st_dev
+            )
+        else:
+            d_size, d_mtime_ns, d_ino, d_dev = dst_entry
+        if src_stat is not None:
+            if src_stat.inode == d_ino and src_stat.inode:
+                # inode 번호는 장치마다 따로 매기므로 장치까지 같아야 같은 파일이다.
+                if src.stat().st_dev == d_dev:
+                    return True
+            s_size, s_mtime_ns = src_stat.size, src_stat.mtime_ns
+        else:
+            s = src.stat()
+            if d_ino and (s.st_dev, s.st_ino) == (d_dev, d_ino):
+                return True
+            s_size, s_mtime_ns = s.st_size, s.st_mtime_ns
+        if s_size != d_size:
+            return False
         # shutil.copy2는 mtime을 보존하므로 0.1초 오차 범위 내에서 비교
-        return s_stat.st_size == d_stat.st_size and abs(s_stat.st_mtime - d_stat.st_mtime) < 0.1
+        if abs(s_mtime_ns - d_mtime_ns) < 100_000_000:
+            return True
+        known = checksums.get(dst) if checksums is not None else None
+        return known is not None and file_checksum(src) == known
     except OSError:
         return False
 
-def resolve_collision(src_path: Path, dst_path: Path, _is_retry: bool = False) -> Path:
+
+def _is_pending_same(
+    src: Path, src_stat: Optional["FileStat"], pending_stat: Optional["FileStat"]
+) -> bool:
+    """이번 계획에서 배정된(아직 쓰이지 않은) 대상의 원본 stat과 크기/수정시간을 비교합니다."""
+    if pending_stat is None:
+        return False
+    try:
+        if src_stat is not None:
+            s_size, s_mtime_ns = src_stat.size, src_stat.mtime_ns
+        else:
+            s = src.stat()
+            s_size, s_mtime_ns = s.st_size, s.st_mtime_ns
+    except OSError:
+        return False
+    return s_size == pending_stat.size and abs(s_mtime_ns - pending_stat.mtime_ns) < 100_000_000
+
+def resolve_collision(
+    src_path: Path,
+    dst_path: Path,
+    _is_retry: bool = False,
+    *,
+    src_stat: Optional["FileStat"] = None,
+    pending: Optional[Mapping[Path, Optional["FileStat"]]] = None,
+    checksums: Optional[Mapping[Path, str]] = None,
+    index: Optional["DestinationIndex"] = None,
+) -> Path:
     """
     Resolves filename collisions by adding a numeric suffix.
     CRG 4.7: 동일 결과명 존재 시 식별번호 뒤에 숫자를 언더바 없이 증가.
+    src_stat: 수집 단계의 원본 stat(멱등성 비교 시 원본을 다시 stat하지 않음)
+    pending: 이번 계획에서 이미 배정된 대상 경로 -> 그 원본의 stat(DestinationAssigner의 배정 표).
+             디스크에 있는 파일과 같이 취급하여, 한 실행 안에서 두 원본이 같은 이름을 받지 않게 합니다.
+    checksums: 결과 파일 -> 이전 실행에서 기록한 해시(is_same_file 참고)
+    index: 결과 폴더 색인(msr.core.dest_index). 주어지면 존재/동일 여부를 디스크 대신 색인으로 확인합니다.
     """
-    if not dst_path.exists():
+    def exists(path: Path) -> bool:
+        if pending is not None and path in pending:
+            return True
+        return index.exists(path) if index is not None else path.exists()
+
+    def same_file(path: Path) -> bool:
+        # 이번 계획에서 배정된 이름이면 디스크 대신 그 이름을 배정받은 원본과 비교한다.
+        if pending is not None and path in pending:
+            return _is_pending_same(src_path, src_stat, pending[path])
+        if index is not None:
+            entry = index.get(path)
+            return entry is not None and is_same_file(src_path, path, src_stat, checksums, entry)
+        return is_same_file(src_path, path, src_stat, checksums)
+
+    if not exists(dst_path):
         return dst_path
 
     # 멱등성 체크: 이미 동일한 파일이 결과 폴더에 있다면 해당 경로 반환 (복사 스킵 유도)
-    if not _is_retry and is_same_file(src_path, dst_path):
+    if not _is_retry and same_file(dst_path):
         return dst_path
 
     name = dst_path.name
@@ -67,10 +153,13 @@ def resolve_collision(src_path: Path, dst_path: Path, _is_retry: bool = False) -
     new_name = f"{new_stem}{suffix}"
     new_path = dst_path.with_name(new_name)
 
-    if new_path.exists():
+    if exists(new_path):
         # 이미 존재하는 파일이 원본과 같다면 해당 경로 반환
-        if is_same_file(src_path, new_path):
+        if same_file(new_path):
             return new_path
-        return resolve_collision(src_path, new_path, _is_retry=True)
+        return resolve_collision(
+            src_path, new_path, _is_retry=True, src_stat=src_stat, pending=pending,
+            checksums=checksums, index=index,
+        )
 
     return new_path
@@ -2,33 +2,98 @@
 This module defines the file copying and idempotency logic.
 - DTL M1-06: 복사/멱등성(Copier)
 - CRG 4.7: 충돌 및 재실행 정책
-- CRG 7: 파일 I/O 규칙
+- CRG 7: 파일 I/O 규칙 (데이터 복사는 msr.core.copy_engine: reflink → copy_file_range → sendfile → 버퍼)
 """
-import shutil
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import TYPE_CHECKING, Tuple, Optional
+
+from msr.core.copy_engine import (
+    DEFAULT_DURABILITY,
+    CopyReport,
+    copy_with_engine,
+    hardlink_or_copy,
+    move_or_copy,
+)
+
+if TYPE_CHECKING:
+    from msr.core.dest_index import DestinationIndex
+
+# 출력 방식: 복사(기본), 하드링크(다른 장치면 복사), 이동(같은 장치면 rename)
+OUTPUT_COPY = "copy"
+OUTPUT_HARDLINK = "hardlink"
+OUTPUT_MOVE = "move"
+OUTPUT_MODES = (OUTPUT_COPY, OUTPUT_HARDLINK, OUTPUT_MOVE)
+
+_TRANSFER = {
+    OUTPUT_COPY: copy_with_engine,
+    OUTPUT_HARDLINK: hardlink_or_copy,
+    OUTPUT_MOVE: move_or_copy,
+}
 
 # Define a return type for copy_file to indicate status
 # (success: bool, message: str, final_dst_path: Path, collision_resolved_from: Optional[Path])
 # collision_resolved_from is for logging if a collision was resolved, though not directly used here.
 CopyResult = Tuple[bool, str, Path, Optional[Path]]
 
-def copy_file(src_path: Path, final_dst_path: Path) -> CopyResult:
+def copy_file(
+    src_path: Path,
+    final_dst_path: Path,
+    report: Optional[CopyReport] = None,
+    mode: str = OUTPUT_COPY,
+    checksum: bool = False,
+    verify: bool = False,
+    durability: str = DEFAULT_DURABILITY,
+    index: Optional["DestinationIndex"] = None,
+) -> CopyResult:
     """
     Copies a file from src_path to final_dst_path.
     Handles idempotency: if final_dst_path already exists, it skips the copy.
     Assumes final_dst_path is the result of prior planning and collision resolution
     (if any) and represents the *intended* final destination.
+    report: 주어지면 파일별 복사 방식/속도를 기록한다.
+    mode: 출력 방식(OUTPUT_MODES). hardlink/move도 대상이 이미 있으면 같은 규칙으로 스킵한다.
+    checksum: 복사하면서 BLAKE2b 해시를 계산한다(report에 기록). verify: 복사본을 다시 읽어 확인한다.
+    durability: 임시 파일 fsync 수준(msr.core.copy_engine.DURABILITY_LEVELS).
+      복사는 임시 파일에 쓴 뒤 옮기므로 중단되어도 final_dst_path에 잘린 파일이 남지 않는다.
+    index: 결과 폴더 색인. 주어지면 폴더 생성/존재 확인을 색인으로 하고, 만든 파일을 색인에 더한다.
+
+    Raises
+    - ValueError: 알 수 없는 mode
     """
+    transfer = _TRANSFER.get(mode)
+    if transfer is None:
+        raise ValueError(f"알 수 없는 출력 방식: {mode}")
+
     # CRG 7: 결과 폴더 생성은 exist_ok=True
-    final_dst_path.parent.mkdir(parents=True, exist_ok=True)
+    if index is not None:
+        index.ensure_dir(final_dst_path.parent)
+        exists = index.exists(final_dst_path)
+    else:
+        final_dst_path.parent.mkdir(parents=True, exist_ok=True)
+        exists = final_dst_path.exists()
 
     # DTL M1-06: “최종 결과 경로 존재 시 스킵” 구현 (Idempotency)
-    if final_dst_path.exists():
+    if exists:
         return False, f"Skipped: File already exists at {final_dst_path}", final_dst_path, None
 
     try:
-        shutil.copy2(src_path, final_dst_path)
-        return True, f"Copied: {src_path.name} to {final_dst_path.name}", final_dst_path, None
+        stats = transfer(src_path, final_dst_path, checksum, verify, durability)
+    except FileExistsError:
+        # 존재 확인 이후에 다른 쪽이 먼저 만든 경우(대상은 덮어쓰지 않는다)
+        if index is not None:
+            index.add(final_dst_path)
+        return False, f"Skipped: File already exists at {final_dst_path}", final_dst_path, None
     except Exception as e:
         return False, f"Error copying {src_path.name}: {e}", final_dst_path, None
+
+    if index is not None:
+        index.add(final_dst_path)
+    if report is not None:
+        report.add(final_dst_path, stats)
+    return (
+        True,
+        f"Copied: {src_path.name} to {final_dst_path.name} "
+        f"({stats.method}, {stats.bytes_per_second / 1e6:.1f} MB/s)",
+        final_dst_path,
+        None,
+    )
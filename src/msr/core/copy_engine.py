@@ -0,0 +1,454 @@
+"""
+msr.core.copy_engine
+
+커널 안에서 데이터를 옮기는 파일 복사 엔진.
+
+- CRG 7: 파일 I/O 규칙. 수 GB 동영상을 사용자 공간 read/write 루프(shutil.copy2) 없이 복사한다.
+- 시도 순서(앞 방식이 지원되지 않으면 다음 방식으로, 이미 복사한 위치부터 이어서):
+  1. reflink(FICLONE ioctl): btrfs/XFS 같은 파일 시스템 안에서는 데이터를 복사하지 않고 공유한다.
+  2. os.copy_file_range: 커널 안 복사(같은 파일 시스템이면 서버 측 복사/reflink가 될 수 있음)
+  3. os.sendfile: 커널 안 복사(파일 시스템이 달라도 동작)
+  4. 큰 버퍼(8 MiB) read/write
+- 메타데이터(권한, 시간, 플래그, xattr)는 shutil.copy2와 같이 shutil.copystat으로 복사한다.
+- 원자적 복사: 같은 폴더의 임시 파일(".<이름>.<pid>.msr-part")에 쓴 뒤 최종 이름으로 옮긴다.
+  실행이 도중에 죽어도 최종 이름에는 완성된 파일만 생긴다(잘린 파일이 "이미 존재"로 영원히 스킵되지 않음).
+  - 옮길 때 기존 대상은 덮어쓰지 않는다(이미 있으면 FileExistsError). POSIX는 link+unlink,
+    링크를 지원하지 않는 파일 시스템은 확인 후 rename, Windows는 rename(덮어쓰지 않음).
+  - durability: none(fsync 안 함), file(임시 파일 데이터를 fsync한 뒤 옮김),
+    full(file + 옮긴 뒤 폴더도 fsync). 프로세스 강제 종료에는 모두 안전하고, 전원 차단에는 file/full.
+  - 실패하면 임시 파일을 지운다. 중단된 실행이 남긴 임시 파일은 remove_partial_files로 지운다.
+- checksum=True이면 커널 복사 대신 한 번 읽은 데이터로 BLAKE2b 해시를 계산하면서 쓴다(단일 패스).
+  커널 안 복사(reflink/copy_file_range/sendfile)는 데이터를 사용자 공간으로 가져오지 않으므로
+  해시를 함께 계산할 수 없다. verify=True이면 대상 파일을 다시 읽어 해시를 비교한다.
+- 복사하지 않는 출력 방식:
+  - hardlink_or_copy: 하드링크(데이터/메타데이터 공유). 다른 장치이거나 링크를 지원하지 않으면 복사한다.
+  - move_or_copy: 같은 장치면 rename(원자적 이동). 다른 장치면 복사 후 원본을 지운다.
+"""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import os
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+METHOD_REFLINK = "reflink"
+METHOD_COPY_FILE_RANGE = "copy_file_range"
+METHOD_SENDFILE = "sendfile"
+METHOD_BUFFERED = "buffered"
+METHOD_HARDLINK = "hardlink"
+METHOD_RENAME = "rename"
+
+PARTIAL_SUFFIX = ".msr-part"
+
+DURABILITY_NONE = "none"
+DURABILITY_FILE = "file"
+DURABILITY_FULL = "full"
+DURABILITY_LEVELS = (DURABILITY_NONE, DURABILITY_FILE, DURABILITY_FULL)
+DEFAULT_DURABILITY = DURABILITY_FILE
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+BUFFER_SIZE = 8 * 1024 * 1024
+# copy_file_range/sendfile 1회 호출 최대 크기(32비트 size_t 플랫폼에서도 안전)
+_KERNEL_CHUNK = 1 << 30
+
+# 이 오류는 "이 방식은 여기서 지원되지 않음"으로 보고 다음 방식으로 넘어간다.
+_UNSUPPORTED_ERRNOS = frozenset(
+    e for e in (
+        errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL,
+        errno.ENOTTY, errno.EBADF, errno.EPERM, errno.ETXTBSY, getattr(errno, "ENOTSOCK", None),
+    ) if e is not None
+)
+
+# 하드링크/rename을 쓸 수 없어(다른 장치, 링크 미지원 파일 시스템 등) 복사로 대신하는 오류
+_NO_LINK_ERRNOS = frozenset(
+    e for e in (
+        errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EMLINK, errno.ENOSYS,
+    ) if e is not None
+)
+
+
+class ChecksumMismatchError(Exception):
+    """복사본을 다시 읽은 해시가 복사 중 계산한 해시와 다른 경우."""
+    pass
+
+
+@dataclass
+class CopyStats:
+    """파일 1개 복사 결과(사용한 방식, 바이트, 소요 초, 복사 중 계산한 BLAKE2b 해시)."""
+    method: str
+    bytes_copied: int
+    seconds: float
+    checksum: Optional[str] = None
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_copied / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class CopyReport:
+    """실행 1회 동안의 복사 통계. 여러 스레드에서 add()해도 안전하다."""
+    files: dict[Path, CopyStats] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, dst_path: Path, stats: CopyStats) -> None:
+        with self._lock:
+            self.files[dst_path] = stats
+
+    def method_counts(self) -> dict[str, int]:
+        with self._lock:
+            counts: dict[str, int] = {}
+            for stats in self.files.values():
+                counts[stats.method] = counts.get(stats.method, 0) + 1
+            return counts
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(s.bytes_copied for s in self.files.values())
+
+    @property
+    def total_seconds(self) -> float:
+        with self._lock:
+            return sum(s.seconds for s in self.files.values())
+
+
+def _unsupported(error: OSError) -> bool:
+    return error.errno in _UNSUPPORTED_ERRNOS
+
+
+def _try_reflink(src_fd: int, dst_fd: int) -> bool:
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError as e:
+        if _unsupported(e):
+            return False
+        raise
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, offset: int, size: int) -> int:
+    """offset부터 복사하고 새 offset을 돌려준다. 지원되지 않으면 멈춘 위치를 돌려준다."""
+    while offset < size:
+        try:
+            n = os.copy_file_range(src_fd, dst_fd, min(_KERNEL_CHUNK, size - offset), offset, offset)
+        except OSError as e:
+            if _unsupported(e):
+                return offset
+            raise
+        if n == 0:
+            break
+        offset += n
+    return offset
+
+
+def _sendfile(src_fd: int, dst_fd: int, offset: int, size: int) -> int:
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    while offset < size:
+        try:
+            n = os.sendfile(dst_fd, src_fd, offset, min(_KERNEL_CHUNK, size - offset))
+        except OSError as e:
+            if _unsupported(e):
+                return offset
+            raise
+        if n == 0:
+            break
+        offset += n
+    return offset
+
+
+def _buffered(src_fd: int, dst_fd: int, offset: int, size: int) -> int:
+    if offset >= size and not os.pread(src_fd, 1, offset):
+        return offset  # 이미 끝까지 복사함(큰 버퍼를 만들지 않음)
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    buf = bytearray(BUFFER_SIZE)
+    view = memoryview(buf)
+    with os.fdopen(src_fd, "rb", buffering=0, closefd=False) as src:
+        while True:
+            n = src.readinto(buf)
+            if not n:
+                break
+            written = 0
+            while written < n:
+                written += os.write(dst_fd, view[written:n])
+            offset += n
+    return offset
+
+
+def new_hasher():
+    """체크섬 해시 객체. b2sum(BLAKE2b-512)과 같은 값이다."""
+    return hashlib.blake2b()
+
+
+def file_checksum(path: Path) -> str:
+    """파일 내용의 BLAKE2b 해시(16진수)."""
+    h = new_hasher()
+    buf = bytearray(BUFFER_SIZE)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def _hashing_copy(src_fd: int, dst_fd: int) -> tuple[int, str]:
+    """한 번 읽은 데이터를 해시에 넣고 그대로 쓴다. (복사한 바이트, 해시)"""
+    h = new_hasher()
+    buf = bytearray(BUFFER_SIZE)
+    view = memoryview(buf)
+    copied = 0
+    with os.fdopen(src_fd, "rb", buffering=0, closefd=False) as src:
+        while True:
+            n = src.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+            written = 0
+            while written < n:
+                written += os.write(dst_fd, view[written:n])
+            copied += n
+    return copied, h.hexdigest()
+
+
+def partial_path(dst_path: Path) -> Path:
+    """dst_path를 만드는 동안 쓰는 임시 파일 경로(같은 폴더, 숨김 파일)."""
+    return dst_path.with_name(f".{dst_path.name}.{os.getpid()}{PARTIAL_SUFFIX}")
+
+
+def copy_with_engine(
+    src_path: Path,
+    dst_path: Path,
+    checksum: bool = False,
+    verify: bool = False,
+    durability: str = DEFAULT_DURABILITY,
+) -> CopyStats:
+    """
+    src_path를 dst_path로 복사하고 메타데이터를 복사한다(shutil.copy2와 같은 결과).
+    임시 파일에 쓴 뒤 dst_path로 옮기므로 dst_path에는 완성된 파일만 나타난다.
+    checksum: 복사하면서 해시를 계산한다(CopyStats.checksum). verify는 checksum을 포함한다.
+    durability: DURABILITY_LEVELS 중 하나
+
+    Raises
+    - FileExistsError: dst_path가 이미 있는 경우(기존 파일은 건드리지 않음)
+    - ChecksumMismatchError: verify 시 복사본 해시가 다른 경우(복사본은 지움)
+    - OSError: 읽기/쓰기 실패(임시 파일은 지움)
+    """
+    started = time.perf_counter()
+    if os.path.lexists(dst_path):
+        raise FileExistsError(errno.EEXIST, "File exists", str(dst_path))
+    tmp_path = partial_path(dst_path)
+    flags_src = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+    flags_dst = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    src_fd = os.open(src_path, flags_src)
+    try:
+        size = os.fstat(src_fd).st_size
+        dst_fd = os.open(tmp_path, flags_dst, 0o666)
+        digest: Optional[str] = None
+        try:
+            if checksum or verify:
+                method = METHOD_BUFFERED
+                copied, digest = _hashing_copy(src_fd, dst_fd)
+            else:
+                method, copied = _copy_data(src_fd, dst_fd, size)
+            if durability != DURABILITY_NONE:
+                os.fsync(dst_fd)
+        except BaseException:
+            os.close(dst_fd)
+            _remove_quietly(tmp_path)
+            raise
+        os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+    try:
+        shutil.copystat(src_path, tmp_path)
+        if verify and file_checksum(tmp_path) != digest:
+            raise ChecksumMismatchError(f"복사본 체크섬이 원본과 다릅니다: {dst_path}")
+        _publish(tmp_path, dst_path)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+    if durability == DURABILITY_FULL:
+        _sync_dir(dst_path.parent)
+    return CopyStats(method, copied, time.perf_counter() - started, digest)
+
+
+def _publish(tmp_path: Path, dst_path: Path) -> None:
+    """
+    완성된 임시 파일을 dst_path로 원자적으로 옮긴다. 기존 dst_path는 덮어쓰지 않는다.
+
+    Raises
+    - FileExistsError: dst_path가 이미 있는 경우
+    - OSError: 옮기기 실패
+    """
+    if os.name == "nt":
+        os.rename(tmp_path, dst_path)  # Windows rename은 기존 대상이 있으면 실패한다.
+        return
+    try:
+        os.link(tmp_path, dst_path)
+    except FileExistsError:
+        raise
+    except OSError as e:
+        if e.errno not in _NO_LINK_ERRNOS:
+            raise
+        # 하드링크를 지원하지 않는 파일 시스템(exFAT, 일부 SMB 등): 확인 후 rename
+        if os.path.lexists(dst_path):
+            raise FileExistsError(errno.EEXIST, "File exists", str(dst_path)) from e
+        os.rename(tmp_path, dst_path)
+        return
+    os.unlink(tmp_path)
+
+
+def _sync_dir(path: Path) -> None:
+    """폴더 항목(새 이름)을 디스크에 기록한다. 폴더를 열 수 없는 플랫폼(Windows)에서는 건너뛴다."""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def remove_partial_files(root: Path, dirs: Optional[Iterable[Path]] = None) -> int:
+    """
+    남은 복사 중 임시 파일(중단된 실행의 흔적)을 지우고 지운 개수를 돌려준다.
+    dirs를 주면 그 폴더들만(하위 폴더 제외) 보고, 없으면 root 아래 전체를 훑는다.
+    전체를 훑는 것은 중단된 실행이 확인된 경우에만 쓴다(SMB 등에서는 트리 전체 탐색이 비싸다).
+    """
+    if dirs is None:
+        listings = ((dirpath, filenames) for dirpath, _, filenames in os.walk(root))
+    else:
+        listings = ((str(d), _file_names(d)) for d in dirs)
+    removed = 0
+    for dirpath, filenames in listings:
+        for name in filenames:
+            if name.startswith(".") and name.endswith(PARTIAL_SUFFIX):
+                try:
+                    os.unlink(os.path.join(dirpath, name))
+                    removed += 1
+                except OSError:
+                    pass
+    return removed
+
+
+def _file_names(directory: Path) -> list[str]:
+    """directory 바로 아래 파일 이름. 없거나 읽을 수 없는 폴더는 빈 목록."""
+    try:
+        with os.scandir(directory) as it:
+            return [entry.name for entry in it if entry.is_file(follow_symlinks=False)]
+    except OSError:
+        return []
+
+
+def _copy_data(src_fd: int, dst_fd: int, size: int) -> tuple[str, int]:
+    """데이터를 복사하고 (처음 데이터를 옮긴 방식, 복사한 바이트)를 돌려준다."""
+    if size > 0 and _try_reflink(src_fd, dst_fd):
+        return METHOD_REFLINK, size
+
+    offset = 0
+    method: Optional[str] = None  # 처음으로 데이터를 옮긴 방식
+    if hasattr(os, "copy_file_range") and offset < size:
+        offset = _copy_file_range(src_fd, dst_fd, offset, size)
+        if offset > 0:
+            method = METHOD_COPY_FILE_RANGE
+    if hasattr(os, "sendfile") and offset < size:
+        offset = _sendfile(src_fd, dst_fd, offset, size)
+        if offset > 0 and method is None:
+            method = METHOD_SENDFILE
+    # 남은 부분(또는 복사 중 늘어난 내용)은 EOF까지 버퍼로 옮긴다(copy2와 같음).
+    end = _buffered(src_fd, dst_fd, offset, size)
+    return method or METHOD_BUFFERED, end
+
+
+def _remove_quietly(path: Path) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def hardlink_or_copy(
+    src_path: Path,
+    dst_path: Path,
+    checksum: bool = False,
+    verify: bool = False,
+    durability: str = DEFAULT_DURABILITY,
+) -> CopyStats:
+    """
+    dst_path를 src_path의 하드링크로 만든다. 링크할 수 없으면 copy_with_engine으로 복사한다.
+    checksum/verify는 복사로 대신할 때만 적용된다(링크는 데이터를 읽지 않음).
+
+    Raises
+    - FileExistsError: dst_path가 이미 있는 경우
+    - OSError: 링크/복사 실패
+    """
+    started = time.perf_counter()
+    try:
+        os.link(src_path, dst_path)
+    except FileExistsError:
+        raise
+    except OSError as e:
+        if e.errno not in _NO_LINK_ERRNOS:
+            raise
+        return copy_with_engine(src_path, dst_path, checksum, verify, durability)
+    if durability == DURABILITY_FULL:
+        _sync_dir(dst_path.parent)
+    return CopyStats(METHOD_HARDLINK, os.stat(dst_path).st_size, time.perf_counter() - started)
+
+
+def move_or_copy(
+    src_path: Path,
+    dst_path: Path,
+    checksum: bool = False,
+    verify: bool = False,
+    durability: str = DEFAULT_DURABILITY,
+) -> CopyStats:
+    """
+    src_path를 dst_path로 옮긴다. 같은 장치면 rename, 다른 장치면 복사 후 원본을 지운다.
+    checksum/verify는 복사로 대신할 때만 적용된다(rename은 데이터를 읽지 않음).
+
+    Raises
+    - FileExistsError: dst_path가 이미 있는 경우(덮어쓰지 않음)
+    - OSError: 이동/복사 실패, 또는 복사 후 원본 삭제 실패(복사본은 남는다)
+    """
+    started = time.perf_counter()
+    size = os.stat(src_path).st_size
+    # POSIX rename은 기존 대상을 덮어쓰므로 먼저 확인한다(Windows는 rename이 FileExistsError).
+    if os.path.lexists(dst_path):
+        raise FileExistsError(errno.EEXIST, "File exists", str(dst_path))
+    try:
+        os.rename(src_path, dst_path)
+    except FileExistsError:
+        raise
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        stats = copy_with_engine(src_path, dst_path, checksum, verify, durability)
+        os.unlink(src_path)
+        return stats
+    if durability == DURABILITY_FULL:
+        _sync_dir(dst_path.parent)
+    return CopyStats(METHOD_RENAME, size, time.perf_counter() - started)
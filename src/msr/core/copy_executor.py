@@ -0,0 +1,195 @@
+"""
+msr.core.copy_executor
+
+여러 파일을 동시에 복사하는 스레드 풀과 진행 중 바이트 예산.
+
+- CRG 7: 파일 I/O 규칙. NAS는 여러 스트림을 동시에 처리할 수 있으므로 파일 단위로 병렬 복사한다.
+- ByteBudget: 동시에 복사 중인 파일 크기의 합을 max_bytes 이하로 제한한다.
+  - 예산보다 큰 파일도 진행 중인 복사가 없으면 시작한다(영원히 기다리지 않음).
+- 예산은 작업을 워커에 넘기기 전에 배정(dispatch)하면서 잡는다. 워커는 예산을 기다리지 않으므로,
+  대용량 MOV 몇 개가 예산을 기다리는 동안에도 비어 있는 워커는 예산에 맞는 작은 파일을 복사한다.
+  - 배정은 제출 순서대로 보되, 예산이 모자란 작업은 건너뛰고 뒤의 맞는 작업을 먼저 시작한다.
+  - 한 작업이 max_bypass번 추월당하면 그 작업이 시작될 때까지 뒤의 작업을 시작하지 않는다(기아 방지).
+- 결과 기록(로그/요약)은 호출하는 쪽이 제출 순서대로 한다(NFR-03 결정성).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_COPY_WORKERS = 4
+DEFAULT_MAX_INFLIGHT_BYTES = 512 * 1024 * 1024
+# 예산을 기다리는 작업을 뒤의 작업이 앞지를 수 있는 횟수
+DEFAULT_MAX_BYPASS = 32
+
+
+class ByteBudget:
+    """동시에 진행 중인 바이트 수를 제한하는 세마포어."""
+
+    def __init__(self, max_bytes: int):
+        """
+        Raises
+        - ValueError: max_bytes < 1
+        """
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes는 1 이상이어야 합니다: {max_bytes}")
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self.peak = 0  # 관측된 최대 진행 중 바이트(통계/테스트용)
+        self._cond = threading.Condition()
+
+    def _fits(self, size: int) -> bool:
+        return self.in_flight == 0 or self.in_flight + size <= self.max_bytes
+
+    def _take(self, size: int) -> None:
+        self.in_flight += size
+        self.peak = max(self.peak, self.in_flight)
+
+    def acquire(self, size: int) -> None:
+        """size바이트가 들어갈 때까지 기다렸다가 잡는다."""
+        size = max(0, size)
+        with self._cond:
+            while not self._fits(size):
+                self._cond.wait()
+            self._take(size)
+
+    def try_acquire(self, size: int) -> bool:
+        """기다리지 않는 acquire. 지금 들어가지 않으면 False."""
+        size = max(0, size)
+        with self._cond:
+            if not self._fits(size):
+                return False
+            self._take(size)
+            return True
+
+    def release(self, size: int) -> None:
+        with self._cond:
+            self.in_flight -= max(0, size)
+            self._cond.notify_all()
+
+
+class _Job(Generic[T]):
+    """배정을 기다리는 작업 1개."""
+
+    __slots__ = ("bypassed", "fn", "future", "size")
+
+    def __init__(self, fn: Callable[[], T], size: int):
+        self.fn = fn
+        self.size = max(0, size)
+        self.future: "Future[T]" = Future()
+        self.bypassed = 0  # 뒤의 작업이 먼저 시작된 횟수
+
+
+class CopyExecutor:
+    """
+    파일 복사 작업을 workers개 스레드에서 실행한다. 작업마다 크기만큼 ByteBudget을 차지한다.
+    예산은 배정할 때 잡으므로, 워커에 넘어간 작업은 바로 실행된다.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_inflight_bytes: int = DEFAULT_MAX_INFLIGHT_BYTES,
+        max_bypass: int = DEFAULT_MAX_BYPASS,
+    ):
+        """
+        workers: None이면 DEFAULT_COPY_WORKERS (CPU 수가 더 적으면 CPU 수, 최소 1)
+        max_bypass: 예산을 기다리는 작업을 뒤의 작업이 앞지를 수 있는 횟수
+
+        Raises
+        - ValueError: workers < 1, max_inflight_bytes < 1 또는 max_bypass < 0
+        """
+        if workers is None:
+            workers = max(1, min(DEFAULT_COPY_WORKERS, os.cpu_count() or 1))
+        if workers < 1:
+            raise ValueError(f"workers는 1 이상이어야 합니다: {workers}")
+        if max_bypass < 0:
+            raise ValueError(f"max_bypass는 0 이상이어야 합니다: {max_bypass}")
+        self.workers = workers
+        self.max_bypass = max_bypass
+        self.budget = ByteBudget(max_inflight_bytes)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="msr-copy")
+        self._pending: deque[_Job] = deque()
+        self._running = 0
+        self._idle = threading.Condition()
+
+    def __enter__(self) -> "CopyExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit(self, fn: Callable[[], T], size: int) -> "Future[T]":
+        """fn()을 워커에서 실행한다. size바이트의 예산이 나면 배정된다(제출하는 쪽은 막히지 않음)."""
+        job: _Job[T] = _Job(fn, size)
+        with self._idle:
+            self._pending.append(job)
+            self._dispatch_locked()
+        return job.future
+
+    def _dispatch_locked(self) -> None:
+        """빈 워커가 있는 동안 예산에 맞는 작업을 골라 워커에 넘긴다. _idle을 잡고 호출한다."""
+        while self._running < self.workers:
+            job = self._next_job_locked()
+            if job is None:
+                return
+            self._running += 1
+            self._executor.submit(self._run, job)
+
+    def _next_job_locked(self) -> Optional[_Job]:
+        """다음에 시작할 작업(예산을 잡은 상태). 없으면 None."""
+        skipped: list[_Job] = []
+        for job in list(self._pending):
+            if job.future.cancelled():
+                self._pending.remove(job)
+                continue
+            if self.budget.try_acquire(job.size):
+                if not job.future.set_running_or_notify_cancel():
+                    self.budget.release(job.size)
+                    self._pending.remove(job)
+                    continue
+                self._pending.remove(job)
+                for waiting in skipped:
+                    waiting.bypassed += 1
+                return job
+            if job.bypassed >= self.max_bypass:
+                return None  # 이 작업이 시작될 때까지 뒤의 작업은 기다린다.
+            skipped.append(job)
+        return None
+
+    def _run(self, job: _Job) -> None:
+        result = error = None
+        try:
+            result = job.fn()
+        except BaseException as e:
+            error = e
+        # 결과를 알리기 전에 예산/워커를 돌려주고 다음 작업을 배정한다.
+        self.budget.release(job.size)
+        with self._idle:
+            self._running -= 1
+            self._dispatch_locked()
+            self._idle.notify_all()
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+
+    def close(self, cancel_pending: bool = False) -> None:
+        """
+        진행 중인 작업(cancel_pending이 아니면 배정을 기다리는 작업까지)이 끝날 때까지 기다린다.
+        cancel_pending이면 시작 전 작업은 취소한다.
+        """
+        with self._idle:
+            if cancel_pending:
+                for job in self._pending:
+                    job.future.cancel()
+                self._pending.clear()
+            while self._pending or self._running:
+                self._idle.wait()
+        self._executor.shutdown(wait=True)
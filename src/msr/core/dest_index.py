@@ -0,0 +1,130 @@
+"""
+msr.core.dest_index
+
+결과 폴더(result/)의 메모리 색인. 충돌 해결과 멱등성 확인이 파일마다 디스크를 stat하지 않도록 한다.
+
+- CRG 4.7: 충돌 및 재실행 정책. SMB/NAS에서는 exists/stat 하나가 네트워크 왕복 1회다.
+- 폴더(result/YYYY-MM-DD)마다 처음 조회할 때 한 번만 목록을 읽는다(readdir 1회).
+- 이름은 목록에서 바로 알고, 크기/mtime/inode는 그 이름이 실제로 비교될 때(충돌) 한 번 stat해 둔다.
+  Windows는 목록을 읽을 때 크기/mtime을 함께 받으므로 stat하지 않는다.
+- 복사 단계가 파일을 만들면 add()로 색인을 갱신한다(여러 복사 워커에서 호출해도 안전).
+- 실행 도중 다른 프로그램이 result/를 바꾸는 것은 반영하지 않는다. 실행 1회(감시 모드는 배치 1개)
+  동안만 쓴다. 최종 쓰기는 덮어쓰지 않으므로(msr.core.copy_engine) 색인이 낡아도 기존 파일은 안전하다.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+class DestEntry(NamedTuple):
+    """결과 파일 1개의 크기, 수정 시각, inode/장치 번호(모르면 0)."""
+
+    size: int
+    mtime_ns: int
+    inode: int = 0
+    device: int = 0
+
+    @classmethod
+    def from_stat(cls, st: os.stat_result) -> "DestEntry":
+        return cls(st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
+
+
+# 폴더 목록: 이름 -> 항목(아직 stat하지 않았으면 None). 폴더가 없으면 목록 자체가 None.
+_Listing = Optional[dict[str, Optional[DestEntry]]]
+
+
+class DestinationIndex:
+    """결과 파일 경로 -> DestEntry 색인. 폴더 단위로 필요할 때 읽는다."""
+
+    def __init__(self, result_root: Path):
+        self.result_root = result_root
+        self._dirs: dict[Path, _Listing] = {}
+        self._lock = threading.Lock()
+        self.dir_loads = 0  # 읽은 폴더 수(통계/테스트용)
+
+    def _listing(self, directory: Path) -> _Listing:
+        """
+        directory의 목록. 처음이면 디스크에서 읽는다. 호출하는 쪽이 _lock을 잡고 있어야 한다.
+
+        Raises
+        - OSError: 폴더를 읽을 수 없는 경우(없는 폴더는 오류가 아님)
+        """
+        if directory in self._dirs:
+            return self._dirs[directory]
+        listing: _Listing
+        try:
+            with os.scandir(directory) as it:
+                listing = {entry.name: _entry_from_dirent(entry) for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            listing = None
+        self.dir_loads += 1
+        self._dirs[directory] = listing
+        return listing
+
+    def exists(self, path: Path) -> bool:
+        with self._lock:
+            listing = self._listing(path.parent)
+            return listing is not None and path.name in listing
+
+    def get(self, path: Path) -> Optional[DestEntry]:
+        """path의 항목. 없으면 None. 아직 stat하지 않은 이름이면 한 번 stat해 둔다."""
+        with self._lock:
+            listing = self._listing(path.parent)
+            if listing is None or path.name not in listing:
+                return None
+            entry = listing[path.name]
+        if entry is not None:
+            return entry
+        try:
+            entry = DestEntry.from_stat(os.stat(path))
+        except FileNotFoundError:
+            self.discard(path)
+            return None
+        with self._lock:
+            listing = self._dirs.get(path.parent)
+            if listing is not None and path.name in listing:
+                listing[path.name] = entry
+        return entry
+
+    def ensure_dir(self, directory: Path) -> None:
+        """
+        directory가 없으면 만든다. 이미 있다고 알고 있으면 디스크를 건드리지 않는다.
+
+        Raises
+        - OSError: 폴더를 만들 수 없는 경우
+        """
+        with self._lock:
+            if self._listing(directory) is not None:
+                return
+        # CRG 7: 결과 폴더 생성은 exist_ok=True
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            if self._dirs.get(directory) is None:
+                self._dirs[directory] = {}
+
+    def add(self, path: Path, entry: Optional[DestEntry] = None) -> None:
+        """path가 만들어졌음을 기록한다. entry가 없으면 필요할 때 stat한다."""
+        with self._lock:
+            if path.parent not in self._dirs:
+                return  # 아직 읽지 않은 폴더는 나중에 읽을 때 포함된다.
+            listing = self._dirs[path.parent]
+            if listing is None:
+                listing = self._dirs[path.parent] = {}
+            listing[path.name] = entry
+
+    def discard(self, path: Path) -> None:
+        with self._lock:
+            listing = self._dirs.get(path.parent)
+            if listing is not None:
+                listing.pop(path.name, None)
+
+
+def _entry_from_dirent(entry: os.DirEntry) -> Optional[DestEntry]:
+    if os.name == "nt":
+        # Windows는 목록과 함께 받은 정보로 stat을 채운다(추가 I/O 없음, inode는 0).
+        return DestEntry.from_stat(entry.stat())
+    return None
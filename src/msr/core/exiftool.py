@@ -6,8 +6,18 @@ ExifTool 실행 파일 경로 탐지 및 배치 메타데이터 추출 유틸리
 DTL/CRG 매핑(요약)
 - M2-01: ExifTool 번들 경로 탐지(get_exiftool_path)
 - M2-02: 배치 추출(성능 저하 예방) - extract_metadata_batch
-- M2-03 ExifTool 오류/재시도(권장)
+- M2-03 ExifTool 오류/재시도(권장) - 이분 탐색으로 실패 파일 격리, 결과는 ExtractionReport
+  - ExifTool이 파일별로 알려 준 오류(stderr의 'Error: ... - <파일>', JSON의 Error 태그)는 배치를
+    실패시키지 않고 그 파일의 실패 사유로 바로 기록한다(분할 탐색 없음).
+- CRG 6.1: stay_open(지속 프로세스) 세션 - ExifToolSession
+- 감시(watchdog): 파일 수/크기에 비례한 시간 예산 초과, 출력 없이 무응답 예산 초과, 또는 사용자 중단 시
+  프로세스 강제 종료
+- 병렬 추출: 세션 N개를 보유한 워커 풀 - ExifToolPool
+- 스트리밍 추출: 레코드 단위 JSON 해석 - iter_metadata_batch / MetadataStream
 - CRG 4.3: 촬영일 태그 우선순위는 msr.core.metadata.extract_and_normalize_metadata에서 적용
+- CRG 6.2: 이미지/동영상은 따로 배치를 나눠 그 종류의 우선순위 태그만 조회한다(tag_groups).
+  fast(1: -fast, 2: -fast2)를 주면 파일 끝까지 읽지 않으며, 촬영일을 못 찾은 파일만 전체 태그로
+  다시 조회한다.
 - CRG 4.4: 카메라 정규화는 msr.core.metadata.normalize_camera_model에서 적용
 
 정책(중요)
@@ -18,19 +28,67 @@ DTL/CRG 매핑(요약)
 
 from __future__ import annotations
 
+import heapq
 import json
 import os
+import queue
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, TYPE_CHECKING
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+    TYPE_CHECKING,
+)
+
+from msr.core.chunking import file_size
+from msr.core.metadata import (
+    DATETIME_TAG_PRIORITY_IMAGE,
+    DATETIME_TAG_PRIORITY_VIDEO,
+    SUPPORTED_IMAGE_EXTENSIONS,
+    SUPPORTED_VIDEO_EXTENSIONS,
+)
+
+if TYPE_CHECKING:
+    from msr.core.metadata import MetaRecord
+    from msr.core.scanner import FileStat
+
 
 class ExifToolError(RuntimeError):
     """ExifTool 관련 오류(경로 탐지 실패, 실행 실패, 파싱 실패 등)."""
     pass
 
 
+class ExifToolTimeoutError(ExifToolError):
+    """
+    ExifTool 실행이 시간 예산을 넘겨 강제 종료된 경우(손상 파일로 인한 멈춤 등).
+
+    - partial_output: 종료 전까지 받은 stdout
+    - partial: partial_output에서 살린 레코드(resolve()된 경로 -> MetaRecord)
+    """
+
+    def __init__(self, message: str, partial_output: str = ""):
+        super().__init__(message)
+        self.partial_output = partial_output
+        self.partial: dict[Path, "MetaRecord"] = {}
+
+
+class ExifToolCancelledError(ExifToolError):
+    """사용자 중단(stop_event)으로 실행 중인 ExifTool을 종료한 경우. 재시도하지 않는다."""
+    pass
+
+
 def _default_exe_name() -> str:
     """OS에 따른 ExifTool 실행 파일명 결정."""
     return "exiftool.exe" if sys.platform.startswith("win") else "exiftool"
@@ -91,21 +149,522 @@ def get_exiftool_path(
 
 
 # CRG 6.2: 필요한 태그만 조회 (SourceFile은 매핑을 위해 필수)
-EXIFTOOL_TAGS = [
+_COMMON_ARGS = [
     "-charset", "filename=utf8",  # 인코딩 문제 방지 (특히 PyInstaller 환경)
     "-SourceFile",
+    "-Error",  # 읽을 수 없는 파일의 사유(파일별 오류, _file_errors)
+]
+_CAMERA_TAGS = ["-Make", "-Model"]
+
+# 전체 태그: 종류를 모르는 파일과 fast 조회에서 촬영일을 못 찾은 파일의 재조회에 쓴다.
+EXIFTOOL_TAGS = [
+    *_COMMON_ARGS,
     "-DateTimeOriginal",
     "-CreateDate",
     "-MediaCreateDate",
     "-TrackCreateDate",
-    "-Make",
-    "-Model",
+    *_CAMERA_TAGS,
 ]
+# 종류별 태그: 촬영일 우선순위(CRG 4.3)에 있는 태그만. JPEG에서 QuickTime 트랙을, MP4에서 EXIF를
+# 찾느라 파일을 더 읽지 않는다.
+IMAGE_TAGS = [*_COMMON_ARGS, *(f"-{t}" for t in DATETIME_TAG_PRIORITY_IMAGE), *_CAMERA_TAGS]
+VIDEO_TAGS = [*_COMMON_ARGS, *(f"-{t}" for t in DATETIME_TAG_PRIORITY_VIDEO), *_CAMERA_TAGS]
+
+# fast 수준: 0(끝까지 읽음), 1(-fast: 이미지 뒤 트레일러를 읽지 않음), 2(-fast2: 메이커노트도 읽지 않음)
+FAST_LEVELS = (0, 1, 2)
+_FAST_ARGS = {0: [], 1: ["-fast"], 2: ["-fast2"]}
+
+
+def tag_groups(files: Sequence[Path], fast: int = 0) -> list[tuple[list[str], list[Path]]]:
+    """
+    files를 종류(이미지/동영상/그 밖)별로 나눠 (조회 인자, 파일 목록)을 돌려준다.
+    그룹 순서는 그 종류가 처음 나온 순서이고, 그룹 안에서는 입력 순서를 유지한다.
+
+    Raises
+    - ValueError: 알 수 없는 fast 수준
+    """
+    if fast not in _FAST_ARGS:
+        raise ValueError(f"알 수 없는 fast 수준: {fast}")
+    groups: dict[int, tuple[list[str], list[Path]]] = {}
+    for path in files:
+        suffix = path.suffix.lower()
+        if suffix in SUPPORTED_IMAGE_EXTENSIONS:
+            key, tags = 0, IMAGE_TAGS
+        elif suffix in SUPPORTED_VIDEO_EXTENSIONS:
+            key, tags = 1, VIDEO_TAGS
+        else:
+            key, tags = 2, EXIFTOOL_TAGS
+        if key not in groups:
+            groups[key] = ([*_FAST_ARGS[fast], *tags], [])
+        groups[key][1].append(path)
+    return list(groups.values())
+
+# stay_open 세션 종료/stderr 수집 대기 시간(초)
+SESSION_CLOSE_TIMEOUT = 5.0
+SESSION_STDERR_TIMEOUT = 5.0
+
+# 배치 1회의 시간 예산 = 기본 + 파일당 초 x 파일 수 + 총 바이트 / 최소 읽기 속도
+# (손상된 MOV 1개로 ExifTool이 멈춰도 워커가 영원히 막히지 않도록 한다)
+TIMEOUT_BASE_SECONDS = 10.0
+TIMEOUT_PER_FILE_SECONDS = 2.0
+TIMEOUT_MIN_BYTES_PER_SECOND = 20 * 1024 * 1024
+WATCHDOG_POLL_INTERVAL = 0.05
+
+# 무응답 예산: 출력이 도착할 때마다 다시 센다. ExifTool은 출력 버퍼를 몇 레코드씩 묶어 비우므로
+# 가장 큰 파일 IDLE_WINDOW_FILES개를 연달아 읽을 시간(배치 예산과 같은 식)을 준다.
+# 2000개 chunk에서 파일 1개가 멈춰도 배치 예산(수십 분) 대신 이 예산 안에 종료된다.
+IDLE_WINDOW_FILES = 32
+
+
+def extraction_budget(
+    files: list[Path],
+    file_stats: Optional[Mapping[Path, "FileStat"]] = None,
+) -> tuple[float, float]:
+    """
+    files를 한 번에 추출할 때의 (배치 시간 예산, 무응답 예산)(초).
+
+    - 배치 예산은 파일 수와 총 크기에, 무응답 예산은 가장 큰 파일 IDLE_WINDOW_FILES개에 비례한다.
+    - 크기는 수집 단계가 기록한 file_stats에서 읽고, 없는 파일만 stat한다.
+    """
+    sizes = [file_size(p, file_stats) for p in files]
+    window = heapq.nlargest(IDLE_WINDOW_FILES, sizes)
+    timeout = (
+        TIMEOUT_BASE_SECONDS
+        + TIMEOUT_PER_FILE_SECONDS * len(sizes)
+        + sum(sizes) / TIMEOUT_MIN_BYTES_PER_SECOND
+    )
+    idle_timeout = (
+        TIMEOUT_BASE_SECONDS
+        + TIMEOUT_PER_FILE_SECONDS * len(window)
+        + sum(window) / TIMEOUT_MIN_BYTES_PER_SECOND
+    )
+    return timeout, idle_timeout
+
+
+class _Watchdog:
+    """
+    실행 중인 ExifTool 프로세스를 감시하다가 시간 예산을 넘기거나 cancel_event가 설정되면 강제 종료한다.
+    프로세스가 죽으면 읽기 쪽은 EOF를 받으므로, 호출자는 fired로 종료 원인을 구분한다.
+
+    - idle_timeout: 출력 없이 지나도 되는 최대 시간(초). 읽는 쪽이 출력을 받을 때마다 touch()로
+      다시 센다.
+    """
+
+    def __init__(
+        self,
+        proc: subprocess.Popen,
+        timeout: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+        idle_timeout: Optional[float] = None,
+    ):
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.fired: Optional[str] = None  # "timeout" | "idle" | "cancel"
+        self._proc = proc
+        self._cancel_event = cancel_event
+        self._last_output = time.monotonic()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if timeout is not None or idle_timeout is not None or cancel_event is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def __enter__(self) -> "_Watchdog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def touch(self) -> None:
+        """출력을 받았음을 알린다(무응답 시간을 다시 센다)."""
+        self._last_output = time.monotonic()
+
+    def _run(self) -> None:
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self._done.wait(WATCHDOG_POLL_INTERVAL):
+            now = time.monotonic()
+            if self._cancel_event is not None and self._cancel_event.is_set():
+                self.fired = "cancel"
+            elif deadline is not None and now >= deadline:
+                self.fired = "timeout"
+            elif self.idle_timeout is not None and now - self._last_output >= self.idle_timeout:
+                self.fired = "idle"
+            else:
+                continue
+            try:
+                self._proc.kill()
+            except OSError:
+                pass
+            return
+
+    def stop(self) -> None:
+        self._done.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def raise_if_fired(self) -> None:
+        """감시자가 프로세스를 종료했다면 그 원인에 맞는 예외를 발생시킨다."""
+        if self.fired == "cancel":
+            raise ExifToolCancelledError("ExifTool extraction cancelled by user")
+        if self.fired == "timeout":
+            raise ExifToolTimeoutError(f"ExifTool timed out after {self.timeout:.1f}s")
+        if self.fired == "idle":
+            raise ExifToolTimeoutError(
+                f"ExifTool timed out: no output for {self.idle_timeout:.1f}s"
+            )
+
+
+def _creationflags() -> int:
+    """Windows에서 콘솔 창이 뜨는 것을 방지하기 위한 플래그."""
+    if sys.platform == "win32":
+        return subprocess.CREATE_NO_WINDOW
+    return 0
+
+
+class ExifToolSession:
+    """
+    `-stay_open True -@ -` 모드로 ExifTool 프로세스를 한 번만 기동하여 여러 배치에 재사용한다.
+
+    - CRG 6.1: stay_open(지속 프로세스) 최적화 - chunk마다 Perl 인터프리터를 새로 띄우지 않음
+    - 명령은 stdin 으로 한 줄에 인자 1개씩 전달하고 `-executeN` 으로 마무리한다.
+    - 출력 끝은 stdout 의 `{readyN}`, stderr 끝은 `-echo4 {readyN}` 으로 구분한다.
+    - 프로세스가 죽으면 다음 execute 호출 시 자동으로 재기동한다.
+    - 프로세스는 첫 execute 시점에 지연 기동된다(생성만으로는 ExifTool을 실행하지 않음).
+    - 명령마다 timeout(초)과 idle_timeout(출력 없이 기다릴 최대 초)을 줄 수 있고, cancel_event가
+      설정되면 실행 중인 명령도 즉시 중단한다. 모두 프로세스를 종료하며 다음 명령에서 재기동된다.
+    """
+
+    def __init__(
+        self,
+        exiftool_path: Optional[Path] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ):
+        self._exiftool_path = exiftool_path
+        self.cancel_event = cancel_event
+        self._proc: Optional[subprocess.Popen] = None
+        self._stderr_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.start_count = 0  # 기동 횟수(재기동 포함)
+        self.last_stderr = ""  # 마지막 명령의 stderr
+
+    def __enter__(self) -> "ExifToolSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def is_alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self) -> None:
+        """
+        ExifTool 프로세스를 기동한다. 이미 살아있으면 아무것도 하지 않는다.
+
+        Raises
+        - ExifToolError: 실행 파일 탐지/기동 실패
+        """
+        if self.is_alive:
+            return
+        self._kill()
+
+        exiftool = self._exiftool_path or get_exiftool_path()
+        cmd = [str(exiftool), "-stay_open", "True", "-@", "-"]
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                creationflags=_creationflags(),
+            )
+        except FileNotFoundError as e:
+            raise ExifToolError("ExifTool executable not found") from e
+        except OSError as e:
+            raise ExifToolError(f"Failed to start ExifTool session: {e}") from e
+
+        # stderr 파이프가 가득 차 프로세스가 멈추지 않도록 별도 스레드에서 계속 비운다.
+        stderr_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        threading.Thread(
+            target=self._drain_stderr, args=(proc, stderr_queue), daemon=True
+        ).start()
+
+        self._proc = proc
+        self._stderr_queue = stderr_queue
+        self.start_count += 1
+
+    @staticmethod
+    def _drain_stderr(proc: subprocess.Popen, out: "queue.Queue[Optional[str]]") -> None:
+        assert proc.stderr is not None
+        for line in proc.stderr:
+            out.put(line)
+        out.put(None)  # EOF
+
+    def execute(
+        self,
+        args: list[str],
+        timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> tuple[str, str]:
+        """
+        인자 목록으로 ExifTool 명령 1회를 실행하고 (stdout, stderr) 텍스트를 반환한다.
+
+        Raises
+        - ExifToolError: 기동 실패 또는 실행 중 프로세스 종료(세션은 다음 호출 시 재기동)
+        - ExifToolTimeoutError: timeout(초) 안에 끝나지 않았거나 idle_timeout(초) 동안 출력이 없음
+        - ExifToolCancelledError: cancel_event 설정으로 중단됨
+        """
+        lines: list[str] = []
+        try:
+            lines.extend(self.execute_lines(args, timeout, idle_timeout))
+        except ExifToolTimeoutError as e:
+            e.partial_output = "".join(lines)
+            raise
+        return "".join(lines), self.last_stderr
+
+    def execute_lines(
+        self,
+        args: list[str],
+        timeout: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> Iterator[str]:
+        """
+        execute와 같지만 stdout을 도착하는 대로 한 줄씩 내보낸다.
+        명령이 끝나면 stderr는 last_stderr에 저장된다.
+
+        소비자가 중간에 멈추면 남은 출력이 다음 명령과 섞이지 않도록 프로세스를 종료한다
+        (다음 호출 시 재기동).
 
-MAX_RETRIES = 2
+        Raises
+        - ExifToolError: 기동 실패 또는 실행 중 프로세스 종료
+        - ExifToolTimeoutError / ExifToolCancelledError: execute 참고
+        """
+        with self._lock:
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                raise ExifToolCancelledError("ExifTool extraction cancelled by user")
+            self.start()
+            proc = self._proc
+            assert proc is not None and proc.stdin is not None and proc.stdout is not None
 
+            self._seq += 1
+            ready = f"{{ready{self._seq}}}"
+            payload = "\n".join([*args, "-echo4", ready, f"-execute{self._seq}"]) + "\n"
+            self.last_stderr = ""
 
-def extract_metadata_batch(files: list[Path], _retry_count: int = 0) -> dict[Path, "MetaRecord"]:
+            try:
+                proc.stdin.write(payload)
+                proc.stdin.flush()
+            except (OSError, ValueError) as e:
+                self._kill()
+                raise ExifToolError(f"ExifTool session terminated unexpectedly: {e}") from e
+
+            finished = False
+            watchdog = _Watchdog(proc, timeout, self.cancel_event, idle_timeout)
+            try:
+                while True:
+                    line = proc.stdout.readline()
+                    watchdog.touch()
+                    if not line:
+                        watchdog.stop()
+                        watchdog.raise_if_fired()
+                        raise ExifToolError("ExifTool session terminated unexpectedly")
+                    if line.rstrip("\r\n") == ready:
+                        break
+                    yield line
+                watchdog.stop()
+                self.last_stderr = self._collect_stderr(ready)
+                finished = True
+            finally:
+                watchdog.stop()
+                if not finished:
+                    self._kill()
+
+    def _collect_stderr(self, ready: str) -> str:
+        err_lines: list[str] = []
+        while True:
+            try:
+                line = self._stderr_queue.get(timeout=SESSION_STDERR_TIMEOUT)
+            except queue.Empty:
+                break
+            if line is None or line.rstrip("\r\n") == ready:
+                break
+            err_lines.append(line)
+        return "".join(err_lines)
+
+    def close(self) -> None:
+        """세션을 정상 종료(-stay_open False)하고, 응답이 없으면 강제 종료한다."""
+        with self._lock:
+            proc = self._proc
+            if proc is None:
+                return
+            if proc.poll() is None:
+                try:
+                    assert proc.stdin is not None
+                    proc.stdin.write("-stay_open\nFalse\n")
+                    proc.stdin.flush()
+                    proc.wait(timeout=SESSION_CLOSE_TIMEOUT)
+                except (OSError, ValueError, subprocess.TimeoutExpired):
+                    pass
+            self._kill()
+
+    def _kill(self) -> None:
+        proc = self._proc
+        self._proc = None
+        if proc is None:
+            return
+        if proc.poll() is None:
+            try:
+                proc.kill()
+                proc.wait(timeout=SESSION_CLOSE_TIMEOUT)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        for stream in (proc.stdin, proc.stdout):
+            try:
+                if stream is not None:
+                    stream.close()
+            except OSError:
+                pass
+
+
+def default_worker_count() -> int:
+    """ExifTool 워커 수 자동 기본값: CPU 코어 수(최소 1)."""
+    return max(1, os.cpu_count() or 1)
+
+
+# 풀에서 실행되는 추출 함수 형태: fn(job, session=...) -> {Path: MetaRecord}
+# job은 보통 chunk(list[Path])이며, 스트리밍 모드에서는 (chunk, MetadataStream) 등 호출자가 정한다.
+BatchExtractor = Callable[..., dict[Path, "MetaRecord"]]
+Job = TypeVar("Job")
+
+
+class ExifToolPool:
+    """
+    ExifToolSession N개를 보유하고 여러 chunk를 동시에 추출하는 워커 풀.
+
+    - ExifTool은 CPU 바운드(Perl)이므로 코어 수만큼 프로세스를 띄워 병렬 처리한다.
+    - 각 워커 스레드는 실행 동안 세션 1개를 빌려 쓰고 반납한다(세션은 지연 기동).
+    - imap은 결과를 제출 순서(소스 정렬 순서)대로 돌려주어 NFR-03 결정성을 유지한다.
+    - cancel_event(사용자 중단)가 설정되면 모든 세션의 실행 중인 명령이 즉시 중단된다.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        exiftool_path: Optional[Path] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ):
+        self.workers = workers if workers and workers > 0 else default_worker_count()
+        self.sessions = [
+            ExifToolSession(exiftool_path, cancel_event) for _ in range(self.workers)
+        ]
+        self._idle: "queue.Queue[ExifToolSession]" = queue.Queue()
+        for session in self.sessions:
+            self._idle.put(session)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="exiftool"
+        )
+
+    def __enter__(self) -> "ExifToolPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit(self, fn: BatchExtractor, job) -> "Future[dict[Path, MetaRecord]]":
+        """fn(job, session=<빌린 세션>)을 워커 스레드에서 실행하도록 예약한다."""
+        return self._executor.submit(self._run, fn, job)
+
+    def _run(self, fn: BatchExtractor, job) -> dict[Path, "MetaRecord"]:
+        session = self._idle.get()
+        try:
+            return fn(job, session=session)
+        finally:
+            self._idle.put(session)
+
+    def imap(
+        self, fn: BatchExtractor, chunks: Iterable[Job]
+    ) -> Iterator[tuple[Job, "Future[dict[Path, MetaRecord]]"]]:
+        """
+        chunk(job)들을 순서대로 제출하고 (chunk, future)를 제출 순서대로 내보낸다.
+
+        소비자가 한 chunk를 처리하는 동안 최대 workers개의 chunk가 미리 추출된다.
+        """
+        window: deque[tuple[Job, Future]] = deque()
+        for chunk in chunks:
+            window.append((chunk, self.submit(fn, chunk)))
+            if len(window) > self.workers:
+                yield window.popleft()
+        while window:
+            yield window.popleft()
+
+    def close(self) -> None:
+        """대기 중인 작업을 취소하고 모든 세션을 종료한다."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for session in self.sessions:
+            session.close()
+
+
+@dataclass
+class ExtractionReport:
+    """
+    DTL M2-03: 배치 재시도 결과 집계(워커 스레드에서 공유).
+
+    - failures: 실패 파일(resolve()된 경로) -> 실패 사유. ExifTool이 파일별로 알려 준 오류와
+      분할 탐색으로 끝까지 격리된 실패를 모두 담는다.
+    - retry_calls: 실패 배치를 나누며 추가로 실행한 ExifTool 호출 수
+    - retry_seconds: 재시도(분할 탐색)에 쓴 시간(초)
+    - quarantined: 시간 예산을 넘겨 ExifTool을 멈추게 한 것으로 격리된 파일
+    - fast_requeried: fast 조회에서 촬영일을 못 찾아 전체 태그로 다시 조회한 파일 수
+    """
+
+    failures: dict[Path, str] = field(default_factory=dict)
+    retry_calls: int = 0
+    retry_seconds: float = 0.0
+    quarantined: list[Path] = field(default_factory=list)
+    fast_requeried: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add_failure(self, path: Path, reason: str, quarantined: bool = False) -> None:
+        resolved = path.resolve()
+        with self._lock:
+            self.failures[resolved] = reason
+            if quarantined:
+                self.quarantined.append(resolved)
+
+    def record_error(self, path: Path, error: ExifToolError) -> None:
+        """파일 1개 배치의 최종 실패를 기록한다. 시간 초과면 격리 목록에도 넣는다."""
+        self.add_failure(path, str(error), quarantined=isinstance(error, ExifToolTimeoutError))
+
+    def add_retry_call(self) -> None:
+        with self._lock:
+            self.retry_calls += 1
+
+    def add_retry_time(self, seconds: float) -> None:
+        with self._lock:
+            self.retry_seconds += seconds
+
+    def add_fast_requeried(self, count: int) -> None:
+        with self._lock:
+            self.fast_requeried += count
+
+    def failure_reason(self, path: Path) -> Optional[str]:
+        with self._lock:
+            return self.failures.get(path)
+
+
+def extract_metadata_batch(
+    files: list[Path],
+    _retry_count: int = 0,
+    *,
+    session: Optional[ExifToolSession] = None,
+    report: Optional[ExtractionReport] = None,
+    fast: int = 0,
+    file_stats: Optional[Mapping[Path, "FileStat"]] = None,
+) -> dict[Path, "MetaRecord"]:
     """
     ExifTool을 1회 호출하여 여러 파일의 메타데이터를 JSON으로 추출 후,
     파일별로 MetaRecord(정규화 포함)로 변환하여 반환한다.
@@ -113,6 +672,19 @@ def extract_metadata_batch(files: list[Path], _retry_count: int = 0) -> dict[Pat
     - 빈 입력이면 {} 반환
     - ExifTool 실행 실패/파싱 실패 시 ExifToolError 발생 (재시도 로직 포함)
     - ExifTool JSON 엔트리 중 SourceFile이 누락된 항목은 skip
+    - session이 주어지면 새 프로세스를 띄우지 않고 stay_open 세션으로 실행한다(재시도 포함).
+    - DTL M2-03: 여러 파일 배치가 실패하면 이분 탐색으로 실패 파일만 격리하고 나머지 결과를 반환한다.
+      실패 파일 k개를 찾는 데 추가 호출은 O(k log n)회. 실패 파일/사유와 재시도 호출 수/시간은
+      report에 기록된다. 파일 1개 배치의 실패만 ExifToolError로 전파된다.
+    - 배치마다 파일 수/크기에 비례한 시간 예산과 무응답 예산(extraction_budget)을 두고, 넘기면
+      ExifTool을 종료한다. 종료 전까지 받은 레코드는 살리고 나머지 파일만 이어서 추출하며, 멈춤을
+      일으킨 파일은 격리된다. 파일 크기는 file_stats(수집 단계의 stat 결과)에서 읽는다.
+    - 사용자 중단(ExifToolCancelledError)은 재시도 없이 그대로 전파된다.
+    - _retry_count > 0 이면 이 호출 자체를 재시도로 집계한다(스트리밍 추출의 나머지 파일 재추출 등).
+    - CRG 6.2: 이미지/동영상은 따로 실행해 그 종류의 태그만 조회한다(tag_groups). 한 종류의 파일 1개
+      배치가 실패해도 다른 종류의 결과는 반환하고, 모든 종류가 실패했을 때만 ExifToolError를 전파한다.
+    - fast > 0이면 -fast/-fast2로 조회하고, 촬영일을 못 찾은 파일만 전체 태그(EXIFTOOL_TAGS)로
+      다시 조회한다. 재조회가 실패하면 fast 조회 결과를 그대로 쓴다.
 
     Note:
     - MetaRecord/정규화 로직은 msr.core.metadata에 위임한다.
@@ -120,11 +692,310 @@ def extract_metadata_batch(files: list[Path], _retry_count: int = 0) -> dict[Pat
     if not files:
         return {}
 
+    if report is None:
+        report = ExtractionReport()
+    groups = tag_groups(files, fast)
+    results: dict[Path, MetaRecord] = {}
+    failed: Optional[ExifToolError] = None
+    for tag_args, group in groups:
+        try:
+            results.update(
+                _extract_tagged(group, tag_args, _retry_count, session, report, file_stats)
+            )
+        except ExifToolCancelledError:
+            raise
+        except ExifToolError as e:
+            if len(groups) == 1:
+                raise
+            failed = e  # 파일 1개 배치의 실패(사유는 report에 기록됨)
+    if failed is not None and not results:
+        raise failed
+    if fast:
+        results.update(_requery_undated(files, results, session, report, file_stats))
+    return results
+
+
+def _requery_undated(
+    files: list[Path],
+    results: dict[Path, "MetaRecord"],
+    session: Optional[ExifToolSession],
+    report: ExtractionReport,
+    file_stats: Optional[Mapping[Path, "FileStat"]] = None,
+) -> dict[Path, "MetaRecord"]:
+    """fast 조회에서 레코드는 있지만 촬영일이 없는 파일을 전체 태그로 다시 조회한다."""
+    undated = []
+    for path in files:
+        meta = results.get(path.resolve())
+        if meta is not None and not meta.datetime_original:
+            undated.append(path)
+    if not undated:
+        return {}
+    report.add_fast_requeried(len(undated))
+    try:
+        return _extract_tagged(undated, EXIFTOOL_TAGS, 0, session, report, file_stats)
+    except ExifToolCancelledError:
+        raise
+    except ExifToolError:
+        return {}
+
+
+def _extract_tagged(
+    files: list[Path],
+    tag_args: Sequence[str],
+    _retry_count: int,
+    session: Optional[ExifToolSession],
+    report: ExtractionReport,
+    file_stats: Optional[Mapping[Path, "FileStat"]] = None,
+) -> dict[Path, "MetaRecord"]:
+    """같은 조회 인자(tag_args)로 files를 추출한다(분할 재시도 포함). extract_metadata_batch 참고."""
+    exiftool = get_exiftool_path() if session is None else None
+
+    retrying = _retry_count > 0
+    if retrying:
+        report.add_retry_call()
+    started = time.perf_counter()
+    try:
+        try:
+            return _extract_once(files, session, exiftool, tag_args, report, file_stats)
+        except ExifToolCancelledError:
+            raise
+        except ExifToolError as e:
+            if len(files) == 1:
+                report.record_error(files[0], e)
+                raise
+            if not retrying:
+                # 첫 호출 시간은 제외하고 분할 탐색 시간만 재시도 시간으로 집계
+                retrying = True
+                started = time.perf_counter()
+            results = _salvage(e)
+            rest = [p for p in files if p.resolve() not in results]
+            if rest:
+                isolated, _ = _isolate_failures(
+                    rest, session, exiftool, report, known_bad=True, tag_args=tag_args,
+                    file_stats=file_stats,
+                )
+                results.update(isolated)
+            return results
+    finally:
+        if retrying:
+            report.add_retry_time(time.perf_counter() - started)
+
+
+def _isolate_failures(
+    files: list[Path],
+    session: Optional[ExifToolSession],
+    exiftool: Optional[Path],
+    report: ExtractionReport,
+    known_bad: bool = False,
+    tag_args: Sequence[str] = EXIFTOOL_TAGS,
+    file_stats: Optional[Mapping[Path, "FileStat"]] = None,
+) -> tuple[dict[Path, "MetaRecord"], bool]:
+    """
+    DTL M2-03: 실패 배치를 이분 탐색하여 실패 파일만 report에 기록하고 나머지 결과를 반환한다.
+
+    - known_bad: 이 범위에 실패 파일이 있음이 이미 알려진 경우. 통째 호출 없이 바로 나눈다.
+    - 반환: (결과, 이 범위를 1회 호출로 모두 추출했는지 여부)
+    - 사용자 중단(ExifToolCancelledError)은 그대로 전파한다.
+    - 앞 절반이 한 번에 성공했다면 실패 원인은 뒤 절반에 있으므로 뒤 절반도 통째 호출을 생략한다.
+      (파일 1개 범위는 일시적 세션 오류일 수 있으므로 항상 다시 실행해 사유를 확인한다.)
+    """
+    results: dict[Path, MetaRecord] = {}
+    if not known_bad or len(files) == 1:
+        report.add_retry_call()
+        try:
+            return _extract_once(files, session, exiftool, tag_args, report, file_stats), True
+        except ExifToolCancelledError:
+            raise
+        except ExifToolError as e:
+            if len(files) == 1:
+                report.record_error(files[0], e)
+                return {}, False
+            # 시간 초과 전까지 받은 레코드는 살리고 나머지 범위에서 원인을 찾는다.
+            results = _salvage(e)
+            files = [p for p in files if p.resolve() not in results]
+            if len(files) == 1:
+                single, _ = _isolate_failures(
+                    files, session, exiftool, report, tag_args=tag_args, file_stats=file_stats
+                )
+                results.update(single)
+            if len(files) < 2:
+                return results, False
+
+    mid = len(files) // 2
+    left, left_ok = _isolate_failures(
+        files[:mid], session, exiftool, report, tag_args=tag_args, file_stats=file_stats
+    )
+    right, _ = _isolate_failures(
+        files[mid:], session, exiftool, report, known_bad=left_ok, tag_args=tag_args,
+        file_stats=file_stats,
+    )
+    results.update(left)
+    results.update(right)
+    return results, False
+
+
+def _salvage(error: ExifToolError) -> dict[Path, "MetaRecord"]:
+    """시간 초과로 종료된 실행에서 이미 받은 레코드를 꺼낸다(그 외 오류는 빈 dict)."""
+    if isinstance(error, ExifToolTimeoutError):
+        return dict(error.partial)
+    return {}
+
+
+def _extract_once(
+    files: list[Path],
+    session: Optional[ExifToolSession],
+    exiftool: Optional[Path],
+    tag_args: Sequence[str] = EXIFTOOL_TAGS,
+    report: Optional[ExtractionReport] = None,
+    file_stats: Optional[Mapping[Path, "FileStat"]] = None,
+) -> dict[Path, "MetaRecord"]:
+    """
+    ExifTool을 1회 실행하여 결과를 MetaRecord로 변환한다(재시도 없음).
+
+    - ExifTool이 파일별로 알려 준 오류(stderr, JSON Error 태그)는 그 파일만 결과에서 빼고 report에
+      사유를 기록한다. 배치 실패로 보지 않는다(파일 오류가 있으면 종료 코드가 1이어도 마찬가지).
+
+    Raises
+    - ExifToolError: 실행/JSON 해석 실패(원인 예외는 __cause__)
+    - ExifToolTimeoutError: 시간 예산 초과. 종료 전까지 받은 레코드는 partial에 담긴다.
+    - ExifToolCancelledError: 사용자 중단
+    """
     # 지연 import(순환참조 방지)
-    from msr.core.metadata import MetaRecord, extract_and_normalize_metadata
+    from msr.core.metadata import extract_and_normalize_metadata
+
+    timeout, idle_timeout = extraction_budget(files, file_stats)
+    try:
+        if session is not None:
+            stdout, stderr = _run_session(files, session, timeout, tag_args, idle_timeout)
+        else:
+            assert exiftool is not None
+            try:
+                stdout, stderr = _run_subprocess(files, exiftool, timeout, tag_args)
+            except subprocess.CalledProcessError as e:
+                # 파일 하나라도 오류가 나면 ExifTool은 1로 끝난다. 파일별 오류면 나머지 출력은 유효하다.
+                if not _file_errors(e.stderr, files):
+                    raise
+                stdout, stderr = e.stdout or "", e.stderr
+        data = json.loads(stdout or "[]")
+    except ExifToolTimeoutError as e:
+        e.partial = _decode_partial(e.partial_output)
+        raise
+    except ExifToolError:
+        raise
+    except subprocess.TimeoutExpired as e:
+        output = e.stdout or b""
+        if isinstance(output, bytes):
+            output = output.decode("utf-8", errors="replace")
+        err = ExifToolTimeoutError(f"ExifTool timed out after {timeout:.1f}s", output)
+        err.partial = _decode_partial(output)
+        raise err from e
+    except (
+        subprocess.CalledProcessError,
+        json.JSONDecodeError,
+        FileNotFoundError,
+        OSError,
+    ) as e:
+        if isinstance(e, FileNotFoundError):
+            msg = "ExifTool executable not found"
+        elif isinstance(e, subprocess.CalledProcessError):
+            msg = f"ExifTool batch command failed: {e.stderr or ''}"
+        else:
+            msg = f"Failed to parse ExifTool JSON output or OS error: {e}"
+        raise ExifToolError(msg) from e
 
-    exiftool = get_exiftool_path()
+    result: dict[Path, MetaRecord] = {}
 
+    if not isinstance(data, list):
+        # 방어적 처리(정상이라면 list)
+        raise ExifToolError("Failed to parse ExifTool JSON output")
+
+    errors = _file_errors(stderr, files)
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+
+        source = entry.get("SourceFile")
+        if not source:
+            continue
+
+        # ExifTool은 슬래시(/)를 반환하거나 경로 형식이 다를 수 있으므로,
+        # 입력 Path와 일치시키기 위해 resolve()로 정규화합니다.
+        src_path = Path(source).resolve()
+        if entry.get("Error"):
+            errors[src_path] = f"Error: {entry['Error']}"
+            continue
+
+        # 정규화는 metadata 모듈이 책임
+        meta = extract_and_normalize_metadata(src_path, entry)
+        result[src_path] = meta
+
+    if report is not None:
+        for src_path, reason in errors.items():
+            if src_path not in result:
+                report.add_failure(src_path, reason)
+    return result
+
+
+def _file_errors(stderr: object, files: list[Path]) -> dict[Path, str]:
+    """
+    stderr에서 ExifTool의 파일별 오류('Error: <사유> - <파일>')를 찾아 {resolve()된 경로: 사유}로
+    돌려준다. files에 없는 경로와 경고(Warning)는 무시한다.
+    """
+    if not isinstance(stderr, str) or "Error" not in stderr:
+        return {}
+    requested = {str(p.resolve()): p.resolve() for p in files}
+    errors: dict[Path, str] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("Error"):
+            continue
+        reason, sep, name = line.rpartition(" - ")
+        if sep and name.strip() in requested:
+            errors[requested[name.strip()]] = reason.strip()
+    return errors
+
+
+def _decode_partial(output: str) -> dict[Path, "MetaRecord"]:
+    """중간에 끊긴 -json 출력에서 완성된 레코드만 MetaRecord로 변환한다."""
+    from msr.core.metadata import extract_and_normalize_metadata
+
+    try:
+        entries = JsonArrayDecoder().feed(output)
+    except json.JSONDecodeError:
+        return {}
+    result = {}
+    for entry in entries:
+        if isinstance(entry, dict) and entry.get("SourceFile"):
+            src_path = Path(entry["SourceFile"]).resolve()
+            result[src_path] = extract_and_normalize_metadata(src_path, entry)
+    return result
+
+
+def _run_session(
+    files: list[Path],
+    session: ExifToolSession,
+    timeout: Optional[float] = None,
+    tag_args: Sequence[str] = EXIFTOOL_TAGS,
+    idle_timeout: Optional[float] = None,
+) -> tuple[str, str]:
+    """stay_open 세션으로 배치 1회를 실행하고 (JSON stdout, stderr)를 반환한다."""
+    args = ["-json", "-s3", *tag_args, *(str(p.resolve()) for p in files)]
+    return session.execute(args, timeout=timeout, idle_timeout=idle_timeout)
+
+
+def _run_subprocess(
+    files: list[Path],
+    exiftool: Path,
+    timeout: Optional[float] = None,
+    tag_args: Sequence[str] = EXIFTOOL_TAGS,
+) -> tuple[str, str]:
+    """
+    ExifTool 프로세스를 1회 실행하여 배치를 처리하고 (JSON stdout, stderr)를 반환한다.
+    timeout(초)을 넘기면 프로세스를 종료하고 subprocess.TimeoutExpired가 발생한다.
+
+    Note:
+    - 출력을 끝에 한 번에 받으므로 무응답 예산은 적용하지 않는다(배치 예산만). 파이프라인은 세션이나
+      스트리밍(_iter_subprocess_lines) 경로를 쓴다.
+    """
     # DTL 성능 정책: 배치 호출 1회 (argfile 사용으로 인코딩/길이 문제 해결)
     with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", delete=False) as f:
         for p in files:
@@ -135,16 +1006,11 @@ def extract_metadata_batch(files: list[Path], _retry_count: int = 0) -> dict[Pat
         str(exiftool),
         "-json",
         "-s3",
-        *EXIFTOOL_TAGS,
+        *tag_args,
         "-@",
         arg_file
     ]
 
-    # Windows에서 콘솔 창이 뜨는 것을 방지하기 위한 플래그
-    creationflags = 0
-    if sys.platform == "win32":
-        creationflags = subprocess.CREATE_NO_WINDOW
-
     try:
         # text=True: stdout/stderr를 str로 받기
         # check=True: 비정상 종료 시 CalledProcessError
@@ -155,29 +1021,10 @@ def extract_metadata_batch(files: list[Path], _retry_count: int = 0) -> dict[Pat
             check=True,
             encoding="utf-8",
             errors="replace",
-            creationflags=creationflags,
+            creationflags=_creationflags(),
+            timeout=timeout,
         )
-        data = json.loads(proc.stdout or "[]")
-    except (subprocess.CalledProcessError, json.JSONDecodeError, FileNotFoundError, OSError) as e:
-        # DTL M2-03: 배치 호출 실패 시 chunk를 반으로 쪼개 재시도
-        if len(files) > 1 and _retry_count < MAX_RETRIES:
-            mid = len(files) // 2
-            results = {}
-            for chunk in [files[:mid], files[mid:]]:
-                try:
-                    results.update(extract_metadata_batch(chunk, _retry_count + 1))
-                except ExifToolError:
-                    pass  # 개별 실패는 결과에서 제외됨 (상위에서 비교하여 스킵 처리)
-            return results
-
-        # 최종 실패 시 예외 발생
-        if isinstance(e, FileNotFoundError):
-            msg = "ExifTool executable not found"
-        elif isinstance(e, subprocess.CalledProcessError):
-            msg = f"ExifTool batch command failed: {e.stderr or ''}"
-        else:
-            msg = f"Failed to parse ExifTool JSON output or OS error: {e}"
-        raise ExifToolError(msg) from e
+        return proc.stdout, proc.stderr
     finally:
         if os.path.exists(arg_file):
             try:
@@ -185,26 +1032,277 @@ def extract_metadata_batch(files: list[Path], _retry_count: int = 0) -> dict[Pat
             except OSError:
                 pass
 
-    result: dict[Path, MetaRecord] = {}
 
-    if not isinstance(data, list):
-        # 방어적 처리(정상이라면 list)
-        raise ExifToolError("Failed to parse ExifTool JSON output")
+class JsonArrayDecoder:
+    """
+    ExifTool `-json` 출력(객체 배열)을 조각 단위로 받아, 완성된 객체를 도착 순서대로 꺼낸다.
+    전체 출력을 버퍼링하지 않으므로 chunk 당 최대 메모리는 레코드 1~2개 수준이다.
+    """
 
-    for entry in data:
-        if not isinstance(entry, dict):
-            continue
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._started = False
+        self._closed = False
 
-        source = entry.get("SourceFile")
-        if not source:
-            continue
+    def feed(self, text: str) -> list:
+        """
+        text를 이어붙이고, 새로 완성된 JSON 값 목록을 반환한다.
 
-        # ExifTool은 슬래시(/)를 반환하거나 경로 형식이 다를 수 있으므로,
-        # 입력 Path와 일치시키기 위해 resolve()로 정규화합니다.
-        src_path = Path(source).resolve()
+        Raises
+        - json.JSONDecodeError: 배열 형식이 아닌 출력
+        """
+        self._buf += text
+        values = []
+        while not self._closed:
+            buf = self._buf.lstrip()
+            if not self._started:
+                if not buf:
+                    break
+                if buf[0] != "[":
+                    raise json.JSONDecodeError("Expecting '['", buf, 0)
+                self._started = True
+                buf = buf[1:].lstrip()
+            if buf.startswith(","):
+                buf = buf[1:].lstrip()
+            if buf.startswith("]"):
+                self._closed = True
+                self._buf = buf[1:]
+                break
+            if "}" not in buf and "]" not in buf:
+                self._buf = buf  # 값이 끝나지 않음
+                break
+            try:
+                value, end = self._decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                self._buf = buf  # 아직 불완전한 값(다음 조각에서 재시도)
+                break
+            values.append(value)
+            self._buf = buf[end:]
+        return values
 
-        # 정규화는 metadata 모듈이 책임
-        meta = extract_and_normalize_metadata(src_path, entry)
-        result[src_path] = meta
+    def close(self) -> None:
+        """
+        출력이 끝났을 때 호출한다. 빈 출력은 빈 배열로 본다.
 
-    return result
+        Raises
+        - json.JSONDecodeError: 배열이 닫히지 않았거나 해석되지 않은 내용이 남은 경우
+        """
+        rest = self._buf.strip()
+        if (self._started and not self._closed) or rest:
+            raise json.JSONDecodeError("Truncated or invalid JSON array", rest, 0)
+
+
+def _iter_subprocess_lines(
+    files: list[Path],
+    exiftool: Path,
+    timeout: Optional[float] = None,
+    tag_args: Sequence[str] = EXIFTOOL_TAGS,
+    idle_timeout: Optional[float] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Iterator[str]:
+    """
+    ExifTool 프로세스를 1회 실행하고 stdout을 도착하는 대로 한 줄씩 내보낸다.
+
+    Raises
+    - ExifToolTimeoutError: timeout(초)을 넘겼거나 idle_timeout(초) 동안 출력이 없어 종료됨
+    - ExifToolCancelledError: cancel_event 설정으로 중단됨
+    - subprocess.CalledProcessError: 0이 아닌 종료 코드
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise ExifToolCancelledError("ExifTool extraction cancelled by user")
+    with tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", delete=False) as f:
+        for p in files:
+            f.write(str(p.resolve()) + "\n")
+        arg_file = f.name
+
+    cmd: list[str] = [str(exiftool), "-json", "-s3", *tag_args, "-@", arg_file]
+
+    # stderr는 파이프가 가득 차 멈추지 않도록 임시 파일로 받는다.
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace") as err:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=err,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            creationflags=_creationflags(),
+        )
+        try:
+            assert proc.stdout is not None
+            with _Watchdog(proc, timeout, cancel_event, idle_timeout) as watchdog:
+                for line in proc.stdout:
+                    watchdog.touch()
+                    yield line
+            watchdog.raise_if_fired()
+            returncode = proc.wait()
+            if returncode != 0:
+                err.seek(0)
+                raise subprocess.CalledProcessError(returncode, cmd, stderr=err.read())
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            if proc.stdout is not None:
+                proc.stdout.close()
+            try:
+                os.unlink(arg_file)
+            except OSError:
+                pass
+
+
+def iter_metadata_batch(
+    files: list[Path],
+    *,
+    session: Optional[ExifToolSession] = None,
+    report: Optional[ExtractionReport] = None,
+    fast: int = 0,
+    file_stats: Optional[Mapping[Path, "FileStat"]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Iterator[tuple[Path, "MetaRecord"]]:
+    """
+    extract_metadata_batch의 스트리밍 버전.
+    ExifTool 출력을 레코드 단위로 해석하여 (resolve()된 경로, MetaRecord)를 도착하는 대로 내보낸다.
+
+    - 실행/해석이 중간에 실패하면, 아직 내보내지 않은 파일만 extract_metadata_batch
+      (분할 재시도 포함)로 다시 추출하여 이어서 내보낸다. 이 재추출은 report에 재시도로 집계된다.
+    - 시간 예산/무응답 예산(extraction_budget)을 넘겨 종료된 경우도 같은 방식으로 나머지 파일만
+      재추출한다.
+    - session 없이 실행할 때는 cancel_event가 설정되면 실행 중인 프로세스를 종료한다(세션은 자신의
+      cancel_event를 쓴다).
+    - 재시도까지 실패하면 ExifToolError 발생(이미 내보낸 레코드는 유효)
+    - 사용자 중단(ExifToolCancelledError)은 재시도 없이 그대로 전파된다.
+
+    - 종류별 배치/fast는 extract_metadata_batch와 같다. fast 조회에서 촬영일이 없는 레코드는 바로
+      내보내지 않고, 모든 배치가 끝난 뒤 전체 태그로 다시 조회해 내보낸다.
+
+    Note:
+    - ExifTool이 출력 버퍼를 비우는 단위에 따라 레코드는 몇 개씩 묶여 도착할 수 있다.
+    """
+    if not files:
+        return
+    if report is None:
+        report = ExtractionReport()
+
+    undated: dict[Path, MetaRecord] = {}
+    for tag_args, group in tag_groups(files, fast):
+        for src_path, meta in _iter_tagged(
+            group, tag_args, session, report, file_stats, cancel_event
+        ):
+            if fast and not meta.datetime_original:
+                undated[src_path] = meta
+            else:
+                yield src_path, meta
+    if undated:
+        requeried = _requery_undated(list(undated), undated, session, report, file_stats)
+        for src_path, meta in undated.items():
+            yield src_path, requeried.get(src_path, meta)
+
+
+def _iter_tagged(
+    files: list[Path],
+    tag_args: Sequence[str],
+    session: Optional[ExifToolSession],
+    report: ExtractionReport,
+    file_stats: Optional[Mapping[Path, "FileStat"]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Iterator[tuple[Path, "MetaRecord"]]:
+    """같은 조회 인자(tag_args)로 files를 스트리밍 추출한다. iter_metadata_batch 참고."""
+    # 지연 import(순환참조 방지)
+    from msr.core.metadata import extract_and_normalize_metadata
+
+    pending = {p.resolve() for p in files}
+    try:
+        timeout, idle_timeout = extraction_budget(files, file_stats)
+        if session is not None:
+            # ExifTool은 인자 순서대로 출력하므로 소스 순서대로 레코드가 도착한다.
+            lines = session.execute_lines(
+                ["-json", "-s3", *tag_args, *(str(p.resolve()) for p in files)],
+                timeout,
+                idle_timeout,
+            )
+        else:
+            lines = _iter_subprocess_lines(
+                files, get_exiftool_path(), timeout, tag_args, idle_timeout, cancel_event
+            )
+
+        decoder = JsonArrayDecoder()
+        for line in lines:
+            for entry in decoder.feed(line):
+                if not isinstance(entry, dict) or not entry.get("SourceFile"):
+                    continue
+                src_path = Path(entry["SourceFile"]).resolve()
+                pending.discard(src_path)
+                if entry.get("Error"):
+                    report.add_failure(src_path, f"Error: {entry['Error']}")
+                    continue
+                yield src_path, extract_and_normalize_metadata(src_path, entry)
+        decoder.close()
+        if session is not None:
+            # 출력에 없는 파일의 사유(예: 'Error: File not found - <파일>')
+            for src_path, reason in _file_errors(session.last_stderr, files).items():
+                if src_path in pending:
+                    report.add_failure(src_path, reason)
+    except ExifToolCancelledError:
+        raise
+    except (
+        subprocess.CalledProcessError,
+        json.JSONDecodeError,
+        FileNotFoundError,
+        OSError,
+        ExifToolError,
+    ):
+        rest = [p for p in files if p.resolve() in pending]
+        if rest:
+            # 남은 파일은 한 종류이므로 같은 태그로 다시 추출된다(fast 없이: 오류 경로라 정확도 우선).
+            yield from extract_metadata_batch(
+                rest, 1, session=session, report=report, file_stats=file_stats
+            ).items()
+
+
+class MetadataStream:
+    """
+    워커 스레드가 chunk의 MetaRecord를 도착하는 대로 채우고,
+    소비자(계획/복사)는 소스 순서대로 파일별 레코드를 기다려 꺼내는 스레드 안전 버퍼.
+    """
+
+    def __init__(self) -> None:
+        self._records: dict[Path, "MetaRecord"] = {}
+        self._cond = threading.Condition()
+        self._done = False
+        self._error: Optional[BaseException] = None
+
+    def put(self, path: Path, meta: "MetaRecord") -> None:
+        with self._cond:
+            self._records[path] = meta
+            self._cond.notify_all()
+
+    def put_many(self, records: dict[Path, "MetaRecord"]) -> None:
+        if not records:
+            return
+        with self._cond:
+            self._records.update(records)
+            self._cond.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """추출 종료(성공/실패)를 알린다. 이후 도착하지 않은 파일은 get에서 None/오류가 된다."""
+        with self._cond:
+            self._done = True
+            self._error = error
+            self._cond.notify_all()
+
+    def get(self, path: Path) -> Optional["MetaRecord"]:
+        """
+        path의 레코드가 도착하거나 추출이 끝날 때까지 기다린다.
+
+        Raises
+        - 추출이 오류로 끝났고 path의 레코드가 없으면 그 오류
+        """
+        with self._cond:
+            while path not in self._records and not self._done:
+                self._cond.wait()
+            meta = self._records.get(path)
+            if meta is None and self._error is not None:
+                raise self._error
+            return meta
@@ -2,20 +2,76 @@
 This module contains the core logic for processing files.
 - DTL M1: 코어 로직
 - DTL M2: ExifTool 배치 추출
+- CRG 6.1: JPEG/DNG/ISOBMFF는 내장 리더로 먼저 처리하고 나머지만 ExifTool로 추출
 """
-import os
+import functools
+import itertools
+import sqlite3
+import threading
 import time
 import traceback
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional
 
 from msr.core.summary import Summary
-from msr.core.exiftool import extract_metadata_batch, ExifToolError
-from msr.core.planner import generate_plan, Action
-from msr.core.collision import resolve_collision
-from msr.core.copier import copy_file
-
-CHUNK_SIZE = 500  # CRG 6.1: 배치 추출 단위
+from msr.core.chunking import (
+    DEFAULT_MAX_CHUNK_SIZE,
+    DEFAULT_MIN_CHUNK_SIZE,
+    DEFAULT_TARGET_SECONDS,
+    AdaptiveChunker,
+    chunk_bytes,
+)
+from msr.core.exiftool import (
+    extract_metadata_batch,
+    iter_metadata_batch,
+    FAST_LEVELS,
+    ExifToolError,
+    ExifToolPool,
+    ExtractionReport,
+    ExifToolSession,
+    MetadataStream,
+)
+from msr.core.camera_rules import UNKNOWN_CAMERA, load_camera_rules
+from msr.core.metadata import MetaRecord, set_camera_rules
+from msr.core.manifest import (
+    MANIFEST_FILENAME,
+    OUTCOME_ALREADY_EXISTS,
+    OUTCOME_CONVERTED,
+    OUTCOME_COPIED,
+    OUTCOME_ERROR,
+    OUTCOME_SKIPPED_NO_DATETIME,
+    OUTCOME_SKIPPED_NOT_IMG_PATTERN,
+    SourceManifest,
+)
+from msr.core.metadata_cache import CACHE_FILENAME, DEFAULT_MAX_ENTRIES, MetadataCache
+from msr.core.native_exif import extract_native_metadata
+from msr.core.scanner import FileStat, iter_media_files
+from msr.core.watcher import (
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_SETTLE_SECONDS,
+    FolderWatcher,
+    SettleTracker,
+    create_watcher,
+)
+from msr.core.pipeline import Channel, Stage
+from msr.core.planner import Action, Plan, generate_plan, generate_plans
+from msr.core.checksums import ChecksumWriter, load_checksum_index
+from msr.core.copier import OUTPUT_COPY, OUTPUT_MODES, CopyResult, copy_file
+from msr.core.copy_executor import DEFAULT_MAX_INFLIGHT_BYTES, CopyExecutor
+from msr.core.copy_engine import (
+    DEFAULT_DURABILITY,
+    DURABILITY_FULL,
+    DURABILITY_LEVELS,
+    CopyReport,
+    remove_partial_files,
+)
+from msr.core.journal import JOURNAL_FILENAME, RunJournal
+from msr.core.dest_index import DestinationIndex
+from msr.core.run_plan import CopyTask, DestinationAssigner, assign_destinations
+from msr.core.plan_io import ACTION_ERROR, PlanFileError, PlanRow, PlanWriter, read_plan
 
 # TODO: M1-01 - 지원 확장자 상수 정의 (CRG 4.1)
 SUPPORTED_EXTENSIONS = {
@@ -23,13 +79,83 @@ SUPPORTED_EXTENSIONS = {
     ".mp4", ".mov" # videos
 }
 
+# 수집 단계와 추출/계획 단계 사이 큐 크기(항목 수). 가득 차면 수집이 기다린다(back-pressure).
+SCAN_QUEUE_SIZE = 10_000
+
+# 복사 워커 1개당 기록을 기다릴 수 있는 항목 수(결과는 소스 순서대로 기록한다)
+COPY_WINDOW_PER_WORKER = 4
+
+# 감시 모드: 쓰기가 끝난 파일을 이 시간(초) 동안 모아 한 번에 추출한다.
+DEFAULT_BATCH_WINDOW = 1.0
+
+# 감시 중 result/ 아래에 두는 표시 파일. 시작할 때 남아 있으면 앞 감시가 강제 종료된 것이다.
+WATCH_MARKER_FILENAME = "watch_running"
+
+
+@dataclass
+class _BatchFailure:
+    """chunk 전체의 추출 실패. 복사 단계가 chunk 파일 수만큼 오류로 집계한다."""
+    batch_no: int
+    message: str
+    traceback_text: str
+    file_count: int
+    src_paths: tuple[Path, ...] = ()  # 계획 파일에 파일별 오류로 쓴다.
+
+
+# 계획 적용: 계획한 뒤 원본 크기/수정시각이 바뀌었거나 원본이 없어진 파일의 오류 메시지
+_SOURCE_CHANGED = "원본이 계획 이후 바뀌었거나 없습니다. 다시 계획하세요"
+
+
+class _PlanningError(Exception):
+    """계획 단계에서 난 오류를 복사 단계에서 다시 기록하기 위한 래퍼."""
+    pass
+
+
 class FileProcessor:
     """
     Handles the main file processing pipeline.
     This class will be instantiated and run within a worker thread.
     """
 
-    def __init__(self, source_dir: str, event_queue, stop_event=None):
+    def __init__(
+        self,
+        source_dir: str,
+        event_queue,
+        stop_event=None,
+        exiftool_workers: Optional[int] = None,
+        use_metadata_cache: bool = True,
+        metadata_cache_max_entries: int = DEFAULT_MAX_ENTRIES,
+        stream_metadata: bool = False,
+        chunk_min_size: int = DEFAULT_MIN_CHUNK_SIZE,
+        chunk_max_size: int = DEFAULT_MAX_CHUNK_SIZE,
+        chunk_target_seconds: float = DEFAULT_TARGET_SECONDS,
+        incremental: bool = False,
+        output_mode: str = OUTPUT_COPY,
+        copy_workers: Optional[int] = None,
+        copy_max_inflight_bytes: int = DEFAULT_MAX_INFLIGHT_BYTES,
+        checksum: bool = False,
+        verify: bool = False,
+        durability: str = DEFAULT_DURABILITY,
+        dry_run: bool = False,
+        plan_path: Optional[str] = None,
+        camera_rules_path: Optional[str] = None,
+        exiftool_fast: int = 0,
+    ):
+        """
+        Raises
+        - ValueError: 알 수 없는 output_mode/durability/exiftool_fast,
+          또는 copy_workers/copy_max_inflight_bytes < 1
+        """
+        if output_mode not in OUTPUT_MODES:
+            raise ValueError(f"알 수 없는 출력 방식: {output_mode}")
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"알 수 없는 durability: {durability}")
+        if copy_workers is not None and copy_workers < 1:
+            raise ValueError(f"copy_workers는 1 이상이어야 합니다: {copy_workers}")
+        if copy_max_inflight_bytes < 1:
+            raise ValueError(f"copy_max_inflight_bytes는 1 이상이어야 합니다: {copy_max_inflight_bytes}")
+        if exiftool_fast not in FAST_LEVELS:
+            raise ValueError(f"알 수 없는 ExifTool fast 수준: {exiftool_fast}")
         self.source_path = Path(source_dir)
         self.result_root_path = self.source_path / "result"
         self.event_queue = event_queue
@@ -38,155 +164,1013 @@ class FileProcessor:
         # DTL M1-07: 처리 요약(Summary) 객체 초기화
         self.summary = Summary()
 
+        # CRG 6.1: 실행 1회 동안 모든 chunk가 공유하는 stay_open ExifTool 워커 풀
+        # exiftool_workers가 None이면 CPU 코어 수만큼 워커를 사용한다.
+        self.exiftool_workers = exiftool_workers
+        self.exiftool_pool: Optional[ExifToolPool] = None
+        # CRG 6.2: 1이면 -fast, 2면 -fast2. 촬영일을 못 찾은 파일은 전체 태그로 다시 조회한다.
+        self.exiftool_fast = exiftool_fast
+
+        # 재실행 시 변경되지 않은 파일은 ExifTool 없이 result/ 아래 캐시에서 메타데이터를 읽는다.
+        self.use_metadata_cache = use_metadata_cache
+        self.metadata_cache_max_entries = metadata_cache_max_entries
+        self.metadata_cache: Optional[MetadataCache] = None
+
+        # 처리한 소스 파일 목록은 매 실행 result/ 아래에 기록한다.
+        # 증분 모드에서는 지난 실행 이후 바뀌지 않은 파일을 수집 단계에서 바로 건너뛴다.
+        self.incremental = incremental
+
+        # 출력 방식: copy(복사), hardlink(하드링크, 다른 장치면 복사), move(같은 장치면 rename)
+        self.output_mode = output_mode
+
+        # CRG 7: 복사 단계는 copy_workers개 스레드로 동시에 복사하되, 진행 중인 파일 크기 합은
+        # copy_max_inflight_bytes 이하로 제한한다. None이면 기본 워커 수를 쓴다.
+        self.copy_workers = copy_workers
+        self.copy_max_inflight_bytes = copy_max_inflight_bytes
+
+        # 복사하면서 BLAKE2b 해시를 계산해 result/checksums-*.b2sum 에 기록한다(verify는 재확인 포함).
+        # 이전 실행의 목록은 충돌 판정에서 크기는 같고 수정시간만 다른 파일을 비교하는 데 쓴다.
+        self.verify = verify
+        self.checksum = checksum or verify
+        self.checksum_writer: Optional[ChecksumWriter] = None
+        self.checksum_index: dict[Path, str] = {}
+        self.manifest: Optional[SourceManifest] = None
+
+        # 복사는 임시 파일에 쓴 뒤 최종 이름으로 옮긴다. durability는 그 전에 fsync하는 수준이다.
+        # 확정된 파일은 체크포인트 저널에 기록하고, 중단된 실행을 다시 시작하면 저널의 파일은
+        # 추출/계획 없이 건너뛴다(남은 임시 파일은 시작 시 지운다). 끝까지 완료되면 저널을 지운다.
+        self.durability = durability
+        self.journal: Optional[RunJournal] = None
+
+        # 드라이런: 수집/추출/계획/충돌 해결까지만 하고 복사 대신 실행 계획을 plan_path에 쓴다
+        # (없으면 result/plan-YYYYMMDD-HHMMSS.jsonl, .csv이면 CSV). 저장한 계획은 apply_plan()으로
+        # ExifTool 없이 실행한다.
+        self.dry_run = dry_run
+        self.plan_path = plan_path
+
+        # CRG 4.4: 카메라 정규화 규칙 파일(JSON, msr.core.camera_rules). None이면 기본 규칙.
+        self.camera_rules_path = camera_rules_path
+
+        # 스트리밍 모드: ExifTool 출력을 레코드 단위로 받아, chunk 추출이 끝나기 전에 계획/복사를 시작한다.
+        self.stream_metadata = stream_metadata
+
+        # CRG 6.1: 배치 추출 단위는 앞선 chunk의 측정 지연 시간에 맞춰 [min, max] 범위에서 조절한다.
+        self.chunk_min_size = chunk_min_size
+        self.chunk_max_size = chunk_max_size
+        self.chunk_target_seconds = chunk_target_seconds
+        self.chunker: Optional[AdaptiveChunker] = None
+
+        # 수집 단계에서 얻은 stat(크기, mtime_ns, inode). 캐시 키/충돌 비교에서 다시 stat하지 않는다.
+        self.file_stats: dict[Path, FileStat] = {}
+        # 실행 전체의 고정된 복사 목록(충돌 해결 완료, msr.core.run_plan). 복사 단계는 이 목록만 실행한다.
+        self.run_plan: tuple[CopyTask | _BatchFailure, ...] = ()
+        # 결과 폴더 색인: 충돌 해결/멱등성 확인에서 파일마다 디스크를 stat하지 않는다.
+        # 실행 1회(감시 모드는 배치 1개) 동안 쓰고, 복사한 파일은 복사 단계가 더한다.
+        self.dest_index: Optional[DestinationIndex] = None
+
+        # DTL M2-03: 배치 재시도(이분 탐색)로 격리된 실패 파일/사유와 재시도 호출 수/시간
+        self.extraction_report = ExtractionReport()
+        # CRG 7: 파일별 복사 방식(reflink/copy_file_range/sendfile/buffered)과 속도
+        self.copy_report = CopyReport()
+
     def process_files(self):
         """
         The main entry point for the file processing pipeline.
         Executes all steps from scanning to copying.
         - PRD 7: 처리 파이프라인
         """
+        # 완료/중단/오류 어느 경우든 ExifTool 세션들을 종료한다.
+        # stop_event가 설정되면 실행 중인 ExifTool 명령도 즉시 중단된다.
+        self.exiftool_pool = ExifToolPool(self.exiftool_workers, cancel_event=self.stop_event)
+        try:
+            self._run_pipeline()
+        finally:
+            self.exiftool_pool.close()
+            self.exiftool_pool = None
+            self._close_metadata_cache()
+            self._close_manifest()
+            self._close_checksums()
+            self._close_journal()
+
+    def _run_pipeline(self):
+        abort = threading.Event()
+        stages: list[Stage] = []
         try:
             if not self.source_path.exists():
                 self._send_event("ERROR", msg=f"소스 폴더가 존재하지 않습니다: {self.source_path}")
                 return
 
+            if not self._apply_camera_rules():
+                return
+
             # DTL M2-04: 전체 처리 시간 측정 시작
             self.summary.start_time = time.perf_counter()
             self._send_log("--- 작업을 시작합니다 ---")
 
-            # 1. (수집 단계) 대상 파일 목록 수집 및 정렬
-            files_to_process = self._scan_files()
-            total_count = len(files_to_process)
-            self.summary.total_files = total_count
-            self._send_progress(0, total_count)
+            # 1. (수집 단계) 수집 스레드가 정렬 순서대로 파일을 흘려보낸다.
+            self._send_log("파일 목록을 수집 중입니다...")
+            self.file_stats = {}
+            # 결과 폴더 색인은 수집 단계(증분 모드의 대상 파일 확인)와 충돌 해결이 함께 쓴다.
+            self.dest_index = DestinationIndex(self.result_root_path)
+            if self.result_root_path.is_dir():
+                # 증분 모드의 변경 없음 판정과 중단된 실행 재개는 수집 단계에서 하므로 수집 전에 연다.
+                self._open_manifest()
+                if not self.dry_run:
+                    self._open_journal()
+            scanned: Channel[Path] = Channel(SCAN_QUEUE_SIZE, abort)
+            scanner = Stage("msr-scanner", lambda: self._scan_stage(scanned), abort)
+            stages.append(scanner)
+            scanner.start()
 
-            if total_count == 0:
+            source = iter(scanned)
+            first = next(source, None)
+            if first is None:
+                scanner.join_and_raise()
+                self._log_scan_totals()
                 self._send_log("처리할 파일이 없습니다.")
                 self._finish_process()
+                self._complete_journal()
+                return
+
+            if not self._prepare_result_root():
                 return
 
-            # NFR-02: 결과 폴더 생성 및 쓰기 권한 체크
+            self._open_metadata_cache()
+            self._open_manifest()
+            self._open_checksums()
+            if not self.dry_run:
+                self._open_journal()
+            self.extraction_report = ExtractionReport()
+            self.copy_report = CopyReport()
+
+            # 2. (추출/계획 단계) 추출은 워커 풀에서 병렬로 진행되고, 계획은 소스 정렬 순서대로
+            # 이 스레드에서 만든다(NFR-03). 실행 전체의 계획을 만든 뒤에 복사를 시작한다.
+            planned = self._plan_stage(itertools.chain([first], source))
+            abort.set()  # 중단 시 아직 수집 중인 스레드를 깨운다.
+            scanner.join_and_raise()
+            self._log_scan_totals()
+
+            # 3. (충돌 해결) 모든 대상 이름을 소스 순서대로 메모리에서 정해 복사 목록을 고정한다.
+            self.run_plan = assign_destinations(
+                planned,
+                DestinationAssigner(self.dest_index, self.checksum_index),
+                self.file_stats,
+            )
+            transfers = sum(
+                1 for item in self.run_plan if isinstance(item, CopyTask) and item.needs_transfer
+            )
+            if self.dry_run:
+                self._write_plan()
+                self._finish_process()
+                return
+            self._send_log(f"계획 완료: {len(self.run_plan)}건 중 {transfers}개 파일을 복사합니다.")
+
+            # 4. (복사 단계) 복사 목록을 실행하고 로그/요약/진행률을 소스 순서대로 기록한다.
+            self._copy_stage(self.run_plan)
+            self._finish_process()
+            self._complete_journal()
+
+        except Exception as e:
+            self._send_event("ERROR", msg=f"치명적 오류 발생: {e}")
+            print(traceback.format_exc())
+        finally:
+            abort.set()
+            for stage in stages:
+                stage.join()
+
+    def _apply_camera_rules(self) -> bool:
+        """카메라 정규화 규칙 파일을 읽어 적용한다(없으면 기본 규칙). 실패하면 ERROR 이벤트를 보내고 False."""
+        try:
+            set_camera_rules(
+                load_camera_rules(Path(self.camera_rules_path)) if self.camera_rules_path else None
+            )
+        except (OSError, ValueError, TypeError) as e:
+            self._send_event("ERROR", msg=f"카메라 규칙 파일을 읽을 수 없습니다: {e}")
+            return False
+        return True
+
+    def _prepare_result_root(self) -> bool:
+        """NFR-02: 결과 폴더 생성 및 쓰기 권한 체크. 실패하면 ERROR 이벤트를 보내고 False."""
+        try:
+            self.result_root_path.mkdir(parents=True, exist_ok=True)
+            # 실제 쓰기 가능 여부 테스트
+            test_file = self.result_root_path / ".write_test"
+            test_file.touch()
+            test_file.unlink()
+        except (OSError, PermissionError) as e:
+            self._send_event("ERROR", msg=f"결과 폴더 생성 또는 쓰기 권한이 없습니다: {e}")
+            return False
+        return True
+
+    def apply_plan(self, plan_path: str):
+        """
+        드라이런이 저장한 실행 계획을 그대로 실행한다(복사 단계만).
+
+        - ExifTool/메타데이터 추출과 재계획, 충돌 재해결을 하지 않는다. 원본은 크기/수정시각만 다시
+          확인하고, 계획 이후 바뀌었거나 없어진 파일은 그 파일의 오류로 기록한다.
+        - 로그/요약/처리 목록/체크섬 기록은 일반 실행의 복사 단계와 같다.
+        - 중간에 멈췄으면 같은 계획을 다시 적용하면 된다. 이미 쓰인 파일은 '이미 존재'로 건너뛴다.
+        """
+        try:
+            if not self.source_path.exists():
+                self._send_event("ERROR", msg=f"소스 폴더가 존재하지 않습니다: {self.source_path}")
+                return
+            if not self._prepare_result_root():
+                return
+
+            self.summary.start_time = time.perf_counter()
+            self._send_log(f"--- 계획을 적용합니다: {plan_path} ---")
+            self._open_manifest()
+            self._open_checksums()
+            self.copy_report = CopyReport()
+            self.dest_index = DestinationIndex(self.result_root_path)
+            self.file_stats = {}
+
             try:
-                self.result_root_path.mkdir(parents=True, exist_ok=True)
-                # 실제 쓰기 가능 여부 테스트
-                test_file = self.result_root_path / ".write_test"
-                test_file.touch()
-                test_file.unlink()
-            except (OSError, PermissionError) as e:
-                self._send_event("ERROR", msg=f"결과 폴더 생성 또는 쓰기 권한이 없습니다: {e}")
+                tasks = [self._task_from_row(row) for row in read_plan(Path(plan_path))]
+            except (OSError, PlanFileError) as e:
+                self._send_event("ERROR", msg=f"계획 파일을 읽을 수 없습니다: {e}")
                 return
+            self.run_plan = tuple(tasks)
+            # 중단된 적용이 남긴 임시 파일은 이 계획이 쓰는 폴더에만 있을 수 있다.
+            removed = remove_partial_files(
+                self.result_root_path,
+                {task.final_dst_path.parent for task in tasks if task.needs_transfer},
+            )
+            if removed:
+                self._send_log(f"중단된 복사의 임시 파일 {removed}개를 지웠습니다.")
+            self.summary.total_files = len(self.run_plan)
+            changed = sum(1 for task in self.run_plan if task.error == _SOURCE_CHANGED)
+            if changed:
+                self._send_log(f"계획 이후 바뀐 원본 {changed}개는 복사하지 않습니다.")
 
-            run_log_path = self.result_root_path / "run.log"
-            error_log_path = self.result_root_path / "error.log"
+            self._copy_stage(self.run_plan)
+            self._finish_process()
+        except Exception as e:
+            self._send_event("ERROR", msg=f"치명적 오류 발생: {e}")
+            print(traceback.format_exc())
+        finally:
+            self._close_manifest()
+            self._close_checksums()
 
-            processed_count = 0
+    def _task_from_row(self, row: PlanRow) -> CopyTask:
+        """
+        계획 파일의 행을 CopyTask로 되돌린다. 복사할 행은 원본 크기/수정시각을 다시 확인해,
+        다르면 오류 항목으로 만든다.
+        """
+        src_path = self.source_path / row.src
+        if row.action == ACTION_ERROR:
+            return CopyTask(src_path, error=f"계획 오류: {row.reason}")
+        try:
+            action = Action(row.action)
+        except ValueError:
+            return CopyTask(src_path, error=f"알 수 없는 계획 동작: {row.action}")
+        if action == Action.SKIP:
+            return CopyTask(src_path, Plan(action, src_path, reason=row.reason or ""))
+        if row.dst is None or row.final_dst is None:
+            return CopyTask(src_path, error="계획에 결과 경로가 없습니다")
 
-            # 2. (추출/계획/저장 단계) Chunk 단위 처리
-            for i in range(0, total_count, CHUNK_SIZE):
-                if self.stop_event and self.stop_event.is_set():
-                    self._send_log("작업이 사용자에 의해 중단되었습니다.")
-                    break
+        dst_path = self.result_root_path / row.dst
+        dst_dir = dst_path.parent.relative_to(self.result_root_path)
+        plan = Plan(action, src_path, dst_dir, dst_path.name)
+        final_dst_path = self.result_root_path / row.final_dst
+        try:
+            st = src_path.stat()
+            unchanged = (st.st_size, st.st_mtime_ns) == (row.size, row.mtime_ns)
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            return CopyTask(
+                src_path, plan, dst_path, final_dst_path, error=_SOURCE_CHANGED
+            )
+        self.file_stats[src_path] = FileStat(st.st_size, st.st_mtime_ns, st.st_ino)
+        return CopyTask(src_path, plan, dst_path, final_dst_path, already_exists=row.already_exists)
+
+    def _write_plan(self):
+        """드라이런: 실행 계획(self.run_plan)을 계획 파일에 쓰고 동작별 건수를 로그로 남긴다."""
+        path = (
+            Path(self.plan_path)
+            if self.plan_path
+            else self.result_root_path / time.strftime("plan-%Y%m%d-%H%M%S.jsonl")
+        )
+        counts: dict[str, int] = {}
+        try:
+            with PlanWriter(path) as writer:
+                for row in self._plan_rows(self.run_plan):
+                    writer.write(row)
+                    key = "이미 존재" if row.already_exists else row.action
+                    counts[key] = counts.get(key, 0) + 1
+        except OSError as e:
+            self._send_event("ERROR", msg=f"계획 파일을 쓸 수 없습니다: {e}")
+            return
+        self.plan_path = str(path)
+        detail = ", ".join(f"{key} {count}" for key, count in sorted(counts.items()))
+        self._send_log(f"드라이런: 계획 {writer.count}건({detail})을 {path}에 기록했습니다.")
+        self._send_log("파일은 복사하지 않았습니다. 계획을 적용하려면 apply 모드로 실행하세요.")
+
+    def _plan_rows(self, items: "Iterable[CopyTask | _BatchFailure]") -> Iterator[PlanRow]:
+        def stat_of(src_path: Path) -> tuple[Optional[int], Optional[int]]:
+            stat = self.file_stats.get(src_path)
+            return (stat.size, stat.mtime_ns) if stat is not None else (None, None)
+
+        def rel(path: Path, root: Path) -> str:
+            return path.relative_to(root).as_posix()
+
+        for item in items:
+            if isinstance(item, _BatchFailure):
+                for src_path in item.src_paths:
+                    yield PlanRow(
+                        rel(src_path, self.source_path), *stat_of(src_path), ACTION_ERROR,
+                        reason=item.message,
+                    )
+                continue
+            src = rel(item.src_path, self.source_path)
+            size, mtime_ns = stat_of(item.src_path)
+            plan = item.plan
+            if item.error is not None or plan is None:
+                yield PlanRow(src, size, mtime_ns, ACTION_ERROR, reason=item.error)
+            elif plan.action == Action.SKIP:
+                yield PlanRow(src, size, mtime_ns, plan.action.value, reason=plan.reason)
+            else:
+                assert item.dst_path is not None and item.final_dst_path is not None
+                yield PlanRow(
+                    src, size, mtime_ns, plan.action.value,
+                    dst=rel(item.dst_path, self.result_root_path),
+                    final_dst=rel(item.final_dst_path, self.result_root_path),
+                    already_exists=item.already_exists,
+                )
+
+    def watch_folder(
+        self,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        watcher: Optional[FolderWatcher] = None,
+    ):
+        """
+        감시 모드(드롭 폴더): stop_event가 설정될 때까지 소스 루트 아래 새 파일을 처리한다.
+
+        - 시작 시 기존 파일 중 처리 목록(manifest)상 처리되지 않았거나 바뀐 파일을 먼저 처리한다.
+        - 감지된 파일은 쓰기가 끝날 때까지(settle_seconds) 기다린 뒤, batch_window 동안 모아서
+          (최대 chunk_max_size개) 일괄 처리 경로(추출 → generate_plans → assign_destinations → copy_file)로
+          보낸다.
+        - ExifTool stay_open 세션 1개를 감시 내내 재사용한다.
+        - 중단 시 COMPLETE 이벤트로 감시 기간 전체의 요약을 보낸다.
+        """
+        if not self.source_path.exists():
+            self._send_event("ERROR", msg=f"소스 폴더가 존재하지 않습니다: {self.source_path}")
+            return
+        if not self._prepare_result_root() or not self._apply_camera_rules():
+            return
+
+        self.summary.start_time = time.perf_counter()
+        # 강제 종료된 앞 감시가 남긴 임시 파일(감시 모드는 처리 목록으로 재개하므로 저널을 쓰지 않음).
+        # 표시 파일이 남아 있을 때만 result/ 전체를 훑는다.
+        marker = self.result_root_path / WATCH_MARKER_FILENAME
+        if marker.exists():
+            removed = remove_partial_files(self.result_root_path)
+            if removed:
+                self._send_log(f"중단된 복사의 임시 파일 {removed}개를 지웠습니다.")
+        try:
+            marker.touch()
+        except OSError:
+            pass
+        self._open_metadata_cache()
+        self._open_manifest()
+        self._open_checksums()
+        if self.manifest is not None and not self.incremental:
+            self.manifest.load()  # 감시 모드는 항상 처리 목록으로 중복 처리를 막는다.
+        self.extraction_report = ExtractionReport()
+        self.copy_report = CopyReport()
+        self.file_stats = {}
+
+        session = ExifToolSession(cancel_event=self.stop_event)
+        if watcher is None:
+            watcher = create_watcher(
+                self.source_path,
+                SUPPORTED_EXTENSIONS,
+                exclude_dir_name=self.result_root_path.name,
+                poll_interval=poll_interval,
+            )
+        tracker = SettleTracker(settle_seconds)
+        self._send_log(f"--- 감시를 시작합니다 ({type(watcher).__name__}) ---")
+        try:
+            # 감시 시작 전에 있던 파일(감지기는 새 변경만 알려준다) 중 처리되지 않은 파일
+            existing = iter_media_files(
+                self.source_path, SUPPORTED_EXTENSIONS, exclude_dir_name=self.result_root_path.name
+            )
+            manifest = self.manifest
+            dest_index = DestinationIndex(self.result_root_path)
+            tracker.add(
+                path for path, stat in existing
+                if not (
+                    manifest is not None
+                    and stat is not None
+                    and manifest.is_unchanged(path, stat.size, stat.mtime_ns, dest_index)
+                )
+            )
+            batch: list[Path] = []
+            batch_started = 0.0
+            while not (self.stop_event and self.stop_event.is_set()):
+                # 추적 중인 파일이 있으면 쓰기 완료 여부를 자주 확인한다.
+                timeout = min(batch_window, settle_seconds) / 2 if (tracker or batch) else 0.5
+                tracker.add(watcher.poll(timeout))
+                now = time.monotonic()
+                for path in tracker.ready(now):
+                    if not batch:
+                        batch_started = now
+                    if path not in batch:
+                        batch.append(path)
+                if batch and (
+                    len(batch) >= self.chunk_max_size or now - batch_started >= batch_window
+                ):
+                    self._process_watch_batch(batch[: self.chunk_max_size], session)
+                    del batch[: self.chunk_max_size]
+                    batch_started = now
+        except Exception as e:
+            self._send_event("ERROR", msg=f"치명적 오류 발생: {e}")
+            print(traceback.format_exc())
+        finally:
+            watcher.close()
+            session.close()
+            self._close_metadata_cache()
+            self._close_manifest()
+            self._close_checksums()
+            try:
+                marker.unlink()
+            except OSError:
+                pass
+        self._send_log("감시를 종료합니다.")
+        self._finish_process()
+
+    def _process_watch_batch(self, files: List[Path], session: ExifToolSession):
+        """감시 모드의 micro-batch 1개를 일괄 처리 경로로 처리한다(로그/요약/목록 기록 포함)."""
+        # 감시 중 result/가 바뀔 수 있으므로 배치마다 색인을 새로 읽는다.
+        self.dest_index = DestinationIndex(self.result_root_path)
+        todo: list[Path] = []
+        for path in files:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            stat = FileStat(st.st_size, st.st_mtime_ns, st.st_ino)
+            if self.manifest is not None and self.manifest.is_unchanged(
+                path, stat.size, stat.mtime_ns, self.dest_index
+            ):
+                continue
+            self.file_stats[path] = stat
+            todo.append(path)
+        if not todo:
+            return
 
-                chunk = files_to_process[i : i + CHUNK_SIZE]
-                
+        self._send_log(f"새 파일 {len(todo)}개를 처리합니다.")
+        error_log_path = self.result_root_path / "error.log"
+        self.summary.total_files += len(todo)
+        try:
+            try:
+                metadata_map = self._extract_chunk(todo, session)
+            except ExifToolError as e:
+                self._send_log(f"ExifTool 오류: {e}")
+                self._record_error(error_log_path, "Watch batch", str(e), include_traceback=True)
+                self.summary.errors += len(todo)
+                return
+            tasks = assign_destinations(
+                self._plan_chunk(todo, metadata_map.get),
+                DestinationAssigner(self.dest_index, self.checksum_index),
+                self.file_stats,
+            )
+            for task in tasks:
+                self._copy_planned(task, error_log_path)
+            if self.manifest is not None:
+                try:
+                    self.manifest.flush()  # 감시는 오래 실행되므로 배치마다 기록을 남긴다.
+                except sqlite3.Error as e:
+                    self._send_log(f"처리 목록(manifest) 기록 실패: {e}")
+        finally:
+            for src_path in todo:
+                self.file_stats.pop(src_path, None)
+
+    def _scan_stage(self, out: "Channel[Path]"):
+        """
+        수집 단계: 대상 파일을 찾는 대로 out에 넣고, stat은 file_stats에 보관한다.
+        증분 모드에서는 목록(manifest)상 변경 없는 파일을, 재개 시에는 저널상 확정된 파일을 넣지 않는다.
+        """
+        manifest = self.manifest if self.incremental else None
+        journal = self.journal if self.journal is not None and self.journal.interrupted else None
+        scanned = iter_media_files(
+            self.source_path, SUPPORTED_EXTENSIONS, exclude_dir_name=self.result_root_path.name
+        )
+        for path, stat in scanned:
+            if self.stop_event and self.stop_event.is_set():
+                break
+            if stat is not None:
+                if journal is not None and journal.is_committed(path, stat.size, stat.mtime_ns):
+                    self.summary.increment_skipped_resumed()
+                    continue
+                if manifest is not None and manifest.is_unchanged(
+                    path, stat.size, stat.mtime_ns, self.dest_index
+                ):
+                    self.summary.increment_skipped_unchanged()
+                    continue
+                self.file_stats[path] = stat
+            self.summary.increment_total_files()
+            out.put(path)
+        out.close()
+
+    def _plan_stage(self, files: Iterator[Path]) -> "list[CopyTask | _BatchFailure]":
+        """추출/계획 단계: chunk 단위로 메타데이터를 추출하고 파일별 계획을 소스 순서대로 모은다."""
+        assert self.exiftool_pool is not None
+        planned: list[CopyTask | _BatchFailure] = []
+        self.chunker = AdaptiveChunker(
+            files,
+            min_size=self.chunk_min_size,
+            max_size=self.chunk_max_size,
+            target_seconds=self.chunk_target_seconds,
+            file_stats=self.file_stats,
+        )
+        # chunk는 워커 풀이 요청할 때 만들어지므로, 완료된 chunk의 측정값이 다음 크기에 반영된다.
+        jobs = (
+            (chunk, MetadataStream() if self.stream_metadata else None) for chunk in self.chunker
+        )
+        extracted = self.exiftool_pool.imap(self._extract_job, jobs)
+        for batch_no, ((chunk, stream), future) in enumerate(extracted, start=1):
+            if self.stop_event and self.stop_event.is_set():
+                break
+
+            if stream is not None:
+                # 스트리밍: 파일별로 레코드가 도착하는 즉시 처리(오류는 파일 단위로 기록)
+                get_meta = stream.get
+            else:
                 try:
-                    # ExifTool 배치 추출
-                    metadata_map = extract_metadata_batch(chunk)
+                    # ExifTool 배치 추출 결과 대기
+                    metadata_map = future.result()
                 except ExifToolError as e:
-                    self._send_log(f"ExifTool 오류: {e}")
-                    self._record_error(error_log_path, f"Batch {i//CHUNK_SIZE + 1}", str(e), include_traceback=True)
-                    processed_count += len(chunk)
-                    self.summary.errors += len(chunk)
+                    planned.append(
+                        _BatchFailure(
+                            batch_no, str(e), traceback.format_exc(), len(chunk), tuple(chunk)
+                        )
+                    )
                     continue
+                get_meta = metadata_map.get
 
-                for src_path in chunk:
-                    if self.stop_event and self.stop_event.is_set():
-                        break
-
-                    processed_count += 1
-                    try:
-                        # ExifTool 결과와 매칭하기 위해 경로를 정규화(resolve)하여 조회합니다.
-                        # Windows에서 슬래시/역슬래시 및 대소문자 차이로 인한 누락 방지.
-                        resolved_path = src_path.resolve()
-                        meta = metadata_map.get(resolved_path)
-                        if not meta:
-                            raise ValueError("메타데이터 추출 실패")
-
-                        # 계획 생성
-                        plan = generate_plan(src_path, meta)
-                        
-                        if plan.action == Action.SKIP:
-                            self._send_log(f"스킵: {src_path.name} ({plan.reason})")
-                            if "촬영일" in plan.reason:
-                                self.summary.increment_skipped_no_datetime()
-                            else:
-                                self.summary.increment_skipped_not_img_pattern()
-                            continue
-
-                        # 최종 경로 결정 및 충돌 해결
-                        dst_path = self.result_root_path / plan.dst_dir / plan.dst_name
-                        final_dst_path = resolve_collision(src_path, dst_path)
-                        
-                        if final_dst_path != dst_path:
-                            self.summary.increment_collisions_resolved()
-                            self._send_log(f"충돌 해결: {dst_path.name} -> {final_dst_path.name}")
-
-                        # 복사 실행
-                        success, msg, _, _ = copy_file(src_path, final_dst_path)
-                        
-                        if success:
-                            if plan.action == Action.COPY_RENAME:
-                                self.summary.increment_converted_success()
-                            else:
-                                self.summary.increment_pass_copied()
-                            self._send_log(f"성공: {src_path.name} -> {final_dst_path.name}")
-                        else:
-                            if "already exists" in msg:
-                                self.summary.increment_skipped_already_exists()
-                                self._send_log(f"스킵: 이미 존재함 ({final_dst_path.name})")
-                            else:
-                                raise RuntimeError(msg)
-
-                    except Exception as e:
-                        self.summary.increment_errors()
-                        self._send_log(f"오류: {src_path.name} - {e}")
-                        self._record_error(error_log_path, str(src_path), str(e), include_traceback=True)
-                    
-                    # 진행률 업데이트
-                    self._send_progress(processed_count, total_count)
+            planned.extend(self._plan_chunk(chunk, get_meta))
+        return planned
 
-            self._finish_process()
+    def _plan_chunk(self, chunk: List[Path], get_meta) -> List[CopyTask]:
+        """
+        chunk의 계획(계획된 대상 경로)을 generate_plans로 한 번에 만든다. 충돌 해결은
+        assign_destinations가 실행 전체에 대해 한 번에 한다. 메타데이터가 없거나 계획할 수 없는 파일은
+        그 파일의 오류로 담아 복사 단계가 기록한다.
+        """
+        tasks: list[Optional[CopyTask]] = []
+        records: list[tuple[Path, MetaRecord]] = []
+        for src_path in chunk:
+            if self.stop_event and self.stop_event.is_set():
+                break
+            try:
+                meta = self._lookup_meta(src_path, get_meta)
+                records.append((src_path, meta))
+                tasks.append(None)  # 아래에서 계획으로 채운다.
+                if meta.normalized_camera == UNKNOWN_CAMERA and (
+                    meta.camera_make or meta.camera_model
+                ):
+                    # CRG 4.4: UNKNOWN은 파일별 로그 없이 요약에만 집계한다.
+                    self.summary.record_unknown_camera(meta.camera_make, meta.camera_model)
+            except Exception as e:
+                tasks.append(CopyTask(src_path, error=str(e), error_traceback=traceback.format_exc()))
+
+        results: list[Plan | CopyTask]
+        try:
+            results = list(generate_plans(records))
+        except Exception:
+            # 한 파일의 오류가 chunk 전체를 막지 않도록 파일마다 다시 계획한다.
+            results = []
+            for src_path, meta in records:
+                try:
+                    results.append(generate_plan(src_path, meta))
+                except Exception as e:
+                    results.append(
+                        CopyTask(src_path, error=str(e), error_traceback=traceback.format_exc())
+                    )
+
+        pending = iter(results)
+        return [task if task is not None else self._task_for(next(pending)) for task in tasks]
+
+    def _lookup_meta(self, src_path: Path, get_meta) -> MetaRecord:
+        """
+        Raises
+        - ValueError: 메타데이터가 없는 경우(추출 실패 사유가 있으면 포함)
+        """
+        # ExifTool 결과와 매칭하기 위해 경로를 정규화(resolve)하여 조회합니다.
+        # Windows에서 슬래시/역슬래시 및 대소문자 차이로 인한 누락 방지.
+        resolved_path = src_path.resolve()
+        meta = get_meta(resolved_path)
+        if not meta:
+            reason = self.extraction_report.failure_reason(resolved_path)
+            if reason:
+                raise ValueError(f"메타데이터 추출 실패: {reason}")
+            raise ValueError("메타데이터 추출 실패")
+        return meta
+
+    def _task_for(self, plan: "Plan | CopyTask") -> CopyTask:
+        if isinstance(plan, CopyTask):
+            return plan  # 계획 오류
+        if plan.action == Action.SKIP:
+            return CopyTask(plan.src_path, plan)
+        assert plan.dst_dir is not None and plan.dst_name is not None
+        return CopyTask(plan.src_path, plan, self.result_root_path / plan.dst_dir / plan.dst_name)
+
+    def _copy_stage(self, tasks: "Iterable[CopyTask | _BatchFailure]"):
+        """
+        복사 단계: 고정된 복사 목록을 복사 워커 풀에서 동시에 실행하고, 결과는 소스 순서대로 기록한다.
+        대상 이름은 이미 모두 달라 워커끼리 조율할 것이 없다.
+        로그/error.log/요약/진행률은 모두 이 스레드에서만 기록하므로 순서가 결정적이다.
+        """
+        error_log_path = self.result_root_path / "error.log"
+        processed_count = 0
+        executor = CopyExecutor(self.copy_workers, self.copy_max_inflight_bytes)
+        # 기록을 기다리는 항목 수 상한. 앞 항목의 복사가 끝나지 않으면 여기서 기다린다.
+        max_window = executor.workers * COPY_WINDOW_PER_WORKER
+        window: deque[tuple[CopyTask | _BatchFailure, Optional[Future]]] = deque()
+
+        def finalize(item: "CopyTask | _BatchFailure", future: Optional[Future]):
+            nonlocal processed_count
+            if isinstance(item, _BatchFailure):
+                self._send_log(f"ExifTool 오류: {item.message}")
+                self._record_error(
+                    error_log_path, f"Batch {item.batch_no}", item.message,
+                    include_traceback=True, traceback_text=item.traceback_text,
+                )
+                processed_count += item.file_count
+                self.summary.errors += item.file_count
+                return
+
+            processed_count += 1
+            if self._report_planned(item, error_log_path, future.result if future else None):
+                # 진행률 업데이트 (스킵은 진행률 이벤트를 보내지 않음)
+                self._send_progress(processed_count, self.summary.total_files)
+
+        def is_ready(future: Optional[Future]) -> bool:
+            return future is None or future.done()
+
+        try:
+            for item in tasks:
+                if self.stop_event and self.stop_event.is_set():
+                    break
+                future = None
+                if isinstance(item, CopyTask) and item.needs_transfer:
+                    future = executor.submit(
+                        functools.partial(self._transfer, item), self._transfer_size(item)
+                    )
+                window.append((item, future))
+                while window and (len(window) > max_window or is_ready(window[0][1])):
+                    finalize(*window.popleft())
+
+            if self.stop_event and self.stop_event.is_set():
+                # 아직 시작하지 않은 복사는 취소하고, 시작한 복사만 기록한다.
+                for _, future in window:
+                    if future is not None:
+                        future.cancel()
+                window = deque(e for e in window if e[1] is None or not e[1].cancelled())
+            while window:
+                finalize(*window.popleft())
+        finally:
+            executor.close(cancel_pending=True)
+            if self.stop_event and self.stop_event.is_set():
+                self._send_log("작업이 사용자에 의해 중단되었습니다.")
+
+    def _transfer_size(self, item: CopyTask) -> int:
+        """
+        복사 예산에 차지할 바이트(원본 크기). 하드링크/이동도 다른 장치이거나 링크를 지원하지 않으면
+        복사로 대신하므로(copy_engine 참고) 출력 방식과 관계없이 원본 크기를 예약한다.
+        """
+        stat = self.file_stats.get(item.src_path)
+        return stat.size if stat is not None else 0
+
+    def _transfer(self, item: CopyTask) -> CopyResult:
+        """계획 1건의 파일을 결과 경로로 복사한다(복사 워커 스레드에서 실행)."""
+        assert item.final_dst_path is not None
+        return copy_file(
+            item.src_path,
+            item.final_dst_path,
+            self.copy_report,
+            mode=self.output_mode,
+            checksum=self.checksum,
+            verify=self.verify,
+            durability=self.durability,
+            index=self.dest_index,
+        )
+
+    def _copy_planned(self, item: CopyTask, error_log_path: Path) -> bool:
+        """계획 1건을 바로 실행하고 기록한다. 계획 단계에서 스킵된 파일이면 False."""
+        transfer = (lambda: self._transfer(item)) if item.needs_transfer else None
+        return self._report_planned(item, error_log_path, transfer)
+
+    def _report_planned(
+        self,
+        item: CopyTask,
+        error_log_path: Path,
+        transfer_result: Optional[Callable[[], CopyResult]],
+    ) -> bool:
+        """
+        계획 1건의 결과를 로그/요약/목록에 기록한다. 계획 단계에서 스킵된 파일이면 False.
+        transfer_result: 복사 결과를 돌려주는(필요하면 끝날 때까지 기다리는) 함수.
+          같은 파일이 이미 있어 복사하지 않는 항목(already_exists)이면 None.
+        """
+        src_path = item.src_path
+        plan = item.plan
+        try:
+            if item.error is not None:
+                raise _PlanningError(item.error)
+
+            assert plan is not None
+            if plan.action == Action.SKIP:
+                self._send_log(f"스킵: {src_path.name} ({plan.reason})")
+                if "촬영일" in plan.reason:
+                    self.summary.increment_skipped_no_datetime()
+                    self._record_outcome(src_path, None, OUTCOME_SKIPPED_NO_DATETIME)
+                else:
+                    self.summary.increment_skipped_not_img_pattern()
+                    self._record_outcome(src_path, None, OUTCOME_SKIPPED_NOT_IMG_PATTERN)
+                return False
+
+            dst_path, final_dst_path = item.dst_path, item.final_dst_path
+            assert dst_path is not None and final_dst_path is not None
+            if final_dst_path != dst_path:
+                self.summary.increment_collisions_resolved()
+                self._send_log(f"충돌 해결: {dst_path.name} -> {final_dst_path.name}")
+
+            if item.already_exists:
+                # DTL M1-06: 같은 파일이 이미 있음을 계획 단계에서 확인했으므로 복사하지 않는다.
+                success, msg = False, f"Skipped: File already exists at {final_dst_path}"
+            else:
+                # 복사 실행(결과 대기)
+                assert transfer_result is not None
+                success, msg, _, _ = transfer_result()
+
+            if success:
+                if plan.action == Action.COPY_RENAME:
+                    self.summary.increment_converted_success()
+                    self._record_outcome(src_path, final_dst_path, OUTCOME_CONVERTED)
+                else:
+                    self.summary.increment_pass_copied()
+                    self._record_outcome(src_path, final_dst_path, OUTCOME_COPIED)
+                self._record_checksum(final_dst_path)
+                self._send_log(f"성공: {src_path.name} -> {final_dst_path.name}")
+            else:
+                if "already exists" in msg:
+                    self.summary.increment_skipped_already_exists()
+                    self._record_outcome(src_path, final_dst_path, OUTCOME_ALREADY_EXISTS)
+                    self._send_log(f"스킵: 이미 존재함 ({final_dst_path.name})")
+                else:
+                    raise RuntimeError(msg)
 
         except Exception as e:
-            self._send_event("ERROR", msg=f"치명적 오류 발생: {e}")
-            print(traceback.format_exc())
+            self.summary.increment_errors()
+            self._record_outcome(src_path, None, OUTCOME_ERROR)
+            self._send_log(f"오류: {src_path.name} - {e}")
+            self._record_error(
+                error_log_path, str(src_path), str(e), include_traceback=True,
+                traceback_text=item.error_traceback if isinstance(e, _PlanningError) else None,
+            )
+        return True
+
+    def _extract_job(
+        self,
+        job: tuple[List[Path], Optional[MetadataStream]],
+        session: Optional[ExifToolSession] = None,
+    ) -> dict[Path, MetaRecord]:
+        """워커 풀 작업 단위. 스트리밍 모드이면 끝날 때 소비자에게 종료(또는 오류)를 알린다."""
+        chunk, stream = job
+        started = time.perf_counter()
+        try:
+            metadata_map = self._extract_chunk(chunk, session, stream)
+        except BaseException as e:
+            if stream is not None:
+                stream.finish(e)
+            raise
+        if stream is not None:
+            stream.finish()
+        if self.chunker is not None:
+            self.chunker.record(
+                len(chunk), chunk_bytes(chunk, self.file_stats), time.perf_counter() - started
+            )
+        return metadata_map
+
+    def _extract_chunk(
+        self,
+        chunk: List[Path],
+        session: Optional[ExifToolSession] = None,
+        stream: Optional[MetadataStream] = None,
+    ) -> dict[Path, MetaRecord]:
+        """
+        chunk 1개의 메타데이터를 추출한다(워커 풀 스레드에서 실행).
+        캐시 미적중 파일 중 내장 리더로 처리되지 않은 파일만 ExifTool 배치로 보낸다.
+        stream이 주어지면 레코드를 얻는 즉시 stream에도 전달한다.
+        """
+        cache = self.metadata_cache
+        metadata_map: dict[Path, MetaRecord] = {}
+        misses = chunk
+        if cache is not None:
+            try:
+                metadata_map, misses = cache.lookup(chunk, self.file_stats)
+            except sqlite3.Error:
+                pass  # 캐시 오류는 추출 실패가 아니므로 전체를 미적중으로 처리한다.
+        if stream is not None:
+            stream.put_many(metadata_map)
+        if not misses:
+            return metadata_map
+
+        extracted, remaining = extract_native_metadata(misses)
+        if stream is not None:
+            stream.put_many(extracted)
+        if remaining:
+            # 크기는 수집 단계의 stat 결과에서 읽는다(시간 예산 계산에 파일마다 stat하지 않음).
+            # fast는 켰을 때만 넘긴다.
+            options: dict = {"file_stats": self.file_stats}
+            if self.exiftool_fast:
+                options["fast"] = self.exiftool_fast
+            try:
+                if stream is not None:
+                    for src_path, meta in iter_metadata_batch(
+                        remaining, session=session, report=self.extraction_report, **options
+                    ):
+                        extracted[src_path] = meta
+                        stream.put(src_path, meta)
+                else:
+                    extracted.update(
+                        extract_metadata_batch(
+                            remaining, session=session, report=self.extraction_report, **options
+                        )
+                    )
+            except ExifToolError:
+                # 캐시/내장 리더 결과가 있으면 살리고, 누락된 파일은 파일 단위 오류로 처리된다.
+                if not metadata_map and not extracted:
+                    raise
+
+        if cache is not None and extracted:
+            try:
+                cache.store(extracted)
+            except sqlite3.Error:
+                pass
+        metadata_map.update(extracted)
+        return metadata_map
+
+    def _open_metadata_cache(self):
+        if not self.use_metadata_cache or self.metadata_cache is not None:
+            return
+        try:
+            self.metadata_cache = MetadataCache(
+                self.result_root_path / CACHE_FILENAME, self.metadata_cache_max_entries
+            )
+        except sqlite3.Error as e:
+            self._send_log(f"메타데이터 캐시를 사용할 수 없어 캐시 없이 진행합니다: {e}")
+
+    def _close_metadata_cache(self):
+        if self.metadata_cache is None:
+            return
+        try:
+            self.metadata_cache.close()
+        except sqlite3.Error:
+            pass
+        self.metadata_cache = None
+
+    def _open_manifest(self):
+        if self.manifest is not None:
+            return
+        try:
+            self.manifest = SourceManifest(
+                self.result_root_path / MANIFEST_FILENAME, self.source_path, self.result_root_path
+            )
+            if self.incremental:
+                self.manifest.load()
+        except sqlite3.Error as e:
+            self._send_log(f"처리 목록(manifest)을 사용할 수 없어 목록 없이 진행합니다: {e}")
+            self.manifest = None
+
+    def _close_manifest(self):
+        if self.manifest is None:
+            return
+        try:
+            self.manifest.close()
+        except sqlite3.Error:
+            pass
+        self.manifest = None
+
+    def _record_outcome(self, src_path: Path, destination: Optional[Path], outcome: str):
+        """
+        처리 결과를 목록(manifest)과 체크포인트 저널(오류 제외)에 기록한다.
+        수집 시 stat이 없는 파일은 기록하지 않는다.
+        """
+        stat = self.file_stats.get(src_path)
+        if stat is None:
+            return
+        if self.journal is not None and outcome != OUTCOME_ERROR:
+            try:
+                self.journal.commit(src_path, stat.size, stat.mtime_ns, destination, outcome)
+            except OSError as e:
+                self._send_log(f"체크포인트 저널 기록 실패, 이후 기록을 중단합니다: {e}")
+                self._close_journal()
+        if self.manifest is None:
+            return
+        try:
+            self.manifest.record(src_path, stat.size, stat.mtime_ns, destination, outcome)
+        except sqlite3.Error as e:
+            self._send_log(f"처리 목록(manifest) 기록 실패, 이후 기록을 중단합니다: {e}")
+            self._close_manifest()
+
+    def _open_journal(self):
+        """체크포인트 저널을 연다. 앞 실행이 중단되었으면 남은 임시 파일을 지우고 이어서 처리한다."""
+        if self.journal is not None:
+            return
+        try:
+            self.journal = RunJournal(
+                self.result_root_path / JOURNAL_FILENAME,
+                self.source_path,
+                self.result_root_path,
+                sync=self.durability == DURABILITY_FULL,
+            )
+        except OSError as e:
+            self._send_log(f"체크포인트 저널을 사용할 수 없어 저널 없이 진행합니다: {e}")
+            return
+        if self.journal.interrupted:
+            removed = remove_partial_files(self.result_root_path)
+            self._send_log(
+                f"이전 실행이 중단되었습니다. 완료된 파일 {len(self.journal)}개를 건너뛰고 이어서 처리합니다"
+                f" (남은 임시 파일 {removed}개 삭제)."
+            )
+
+    def _close_journal(self):
+        if self.journal is None:
+            return
+        try:
+            self.journal.close()
+        except OSError:
+            pass
+        self.journal = None
+
+    def _complete_journal(self):
+        """끝까지 완료된 실행의 저널을 지운다. 사용자가 중단했으면 다음 실행이 이어서 처리하도록 남긴다."""
+        if self.journal is None or (self.stop_event and self.stop_event.is_set()):
+            return
+        try:
+            self.journal.complete()
+        except OSError as e:
+            self._send_log(f"체크포인트 저널을 지우지 못했습니다: {e}")
+        self.journal = None
+
+    def _open_checksums(self):
+        self.checksum_index = load_checksum_index(self.result_root_path)
+        if self.checksum and not self.dry_run and self.checksum_writer is None:
+            self.checksum_writer = ChecksumWriter(self.result_root_path)
+            self.summary.checksum_verified = self.verify
+
+    def _close_checksums(self):
+        if self.checksum_writer is not None:
+            self.checksum_writer.close()
+            self.checksum_writer = None
+
+    def _record_checksum(self, dst_path: Path):
+        """복사 중 계산한 해시를 이번 실행의 체크섬 목록에 기록한다(링크/이동은 해시 없음)."""
+        stats = self.copy_report.files.get(dst_path)
+        if self.checksum_writer is None or stats is None or stats.checksum is None:
+            return
+        try:
+            self.checksum_writer.add(dst_path, stats.checksum)
+            self.summary.checksum_files += 1
+        except OSError as e:
+            self._send_log(f"체크섬 목록 기록 실패, 이후 기록을 중단합니다: {e}")
+            self.checksum_writer.close()
+            self.checksum_writer = None
+
+    def _log_scan_totals(self):
+        self._send_log(f"총 {self.summary.total_files}개의 대상 파일을 찾았습니다.")
+        if self.summary.skipped_unchanged:
+            self._send_log(
+                f"증분 모드: 변경 없는 파일 {self.summary.skipped_unchanged}개를 건너뛰었습니다."
+            )
+        if self.summary.skipped_resumed:
+            self._send_log(
+                f"재개: 이전 실행에서 완료된 파일 {self.summary.skipped_resumed}개를 건너뛰었습니다."
+            )
 
     def _finish_process(self):
+        if self.metadata_cache is not None:
+            self.summary.metadata_cache_hits = self.metadata_cache.hits
+            self.summary.metadata_cache_misses = self.metadata_cache.misses
+        self.summary.exiftool_retry_calls = self.extraction_report.retry_calls
+        self.summary.exiftool_retry_seconds = self.extraction_report.retry_seconds
+        self.summary.exiftool_quarantined = len(self.extraction_report.quarantined)
+        self.summary.exiftool_fast_requeried = self.extraction_report.fast_requeried
+        self.summary.copy_methods = self.copy_report.method_counts()
+        self.summary.copy_bytes = self.copy_report.total_bytes
+        self.summary.copy_seconds = self.copy_report.total_seconds
+        if self.chunker is not None:
+            self.summary.chunk_sizes = list(self.chunker.chunk_sizes)
         self.summary.end_time = time.perf_counter()
         self._send_log("--- 모든 작업이 완료되었습니다 ---")
         self._send_event("COMPLETE", summary=self.summary)
 
-    def _scan_files(self) -> List[Path]:
-        """
-        Scans the source directory recursively for supported file types.
-        - FR-01: 재귀 탐색, 'result' 폴더 제외, 정렬
-        - DTL M1-01: 확장자 필터, 정렬
-        """
-        self._send_log("파일 목록을 수집 중입니다...")
-        
-        all_files = []
-        for root, _, files in os.walk(self.source_path):
-            if Path(root).is_relative_to(self.result_root_path):
-                continue
-            
-            for file in files:
-                path = Path(root) / file
-                if path.suffix.lower() in SUPPORTED_EXTENSIONS:
-                    all_files.append(path)
-        
-        all_files.sort()
-        self._send_log(f"총 {len(all_files)}개의 대상 파일을 찾았습니다.")
-        return all_files
-
     def _send_event(self, etype: str, **kwargs):
         self.event_queue.put({"type": etype, **kwargs})
 
@@ -200,11 +1184,19 @@ class FileProcessor:
     def _send_progress(self, current: int, total: int):
         self._send_event("PROGRESS", current=current, total=total)
 
-    def _record_error(self, log_path: Path, file_info: str, error_msg: str, include_traceback: bool = False):
+    def _record_error(
+        self,
+        log_path: Path,
+        file_info: str,
+        error_msg: str,
+        include_traceback: bool = False,
+        traceback_text: Optional[str] = None,
+    ):
+        """traceback_text가 주어지면 현재 예외 대신 그 내용(다른 단계에서 캡처)을 기록한다."""
         with open(log_path, "a", encoding="utf-8") as f:
             # PRD FR-08-2: 시간(ISO) 형식 사용
             timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
             f.write(f"[{timestamp}] {file_info}: {error_msg}\n")
             if include_traceback:
-                f.write(traceback.format_exc())
+                f.write(traceback_text or traceback.format_exc())
                 f.write("-" * 40 + "\n")
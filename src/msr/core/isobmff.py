@@ -0,0 +1,363 @@
+"""
+msr.core.isobmff
+
+ISO base media(QuickTime/MP4/HEIC/CR3) 박스 구조에서 촬영일/카메라 태그를 읽는 순수 Python 리더.
+
+- CRG 6.1: ExifTool 호출 최소화 - msr.core.native_exif의 내장 리더 경로에서 사용된다.
+- 박스 헤더만 따라가며 seek 하므로 mdat(수 GB 영상 데이터)는 읽지 않는다.
+  moov가 파일 끝에 있는 영상도 헤더 몇 개만 읽고 처리한다.
+
+읽는 위치와 ExifTool 태그명(-s3) 대응
+- moov/mvhd                  -> CreateDate
+- moov/trak/tkhd (첫 트랙)    -> TrackCreateDate
+- moov/trak/mdia/mdhd (첫 트랙) -> MediaCreateDate
+- moov/udta/©mak, ©mod        -> Make, Model
+- moov/meta keys+ilst (com.apple.quicktime.make/model) -> Make, Model
+- meta/iinf+iloc 의 Exif 아이템(HEIC) -> EXIF 태그(native_exif.parse_tiff_tags)
+- moov/uuid(Canon) CMT1/CMT2 (CR3)     -> EXIF 태그
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from msr.core.native_exif import EXIF_IFD_TAGS, parse_tiff_tags
+
+ISOBMFF_EXTENSIONS = {".mp4", ".mov", ".heic", ".cr3"}
+
+# 작은 메타데이터 박스(keys/ilst/iloc/CMT 등)를 통째로 읽을 때의 상한
+MAX_SMALL_BOX_BYTES = 64 * 1024
+# HEIC Exif 아이템을 읽을 때의 상한
+MAX_EXIF_ITEM_BYTES = 256 * 1024
+
+# QuickTime 시간은 1904-01-01 기준 초. ExifTool과 동일하게 1970 이전 값은 Unix 시간으로 간주한다.
+_QT_TO_UNIX_OFFSET = (66 * 365 + 17) * 24 * 3600
+_UNIX_EPOCH = datetime(1970, 1, 1)
+_ZERO_DATETIME = "0000:00:00 00:00:00"
+
+_CANON_CR3_UUID = bytes.fromhex("85c0b687820f11e08111f4ce462b6a48")
+
+_UDTA_TAGS = {b"\xa9mak": "Make", b"\xa9mod": "Model"}
+_QT_KEY_TAGS = {"com.apple.quicktime.make": "Make", "com.apple.quicktime.model": "Model"}
+
+
+def _iter_boxes(f: BinaryIO, start: int, end: int) -> Iterator[tuple[bytes, int, int]]:
+    """
+    [start, end) 구간의 박스를 (type, payload 시작, 박스 끝) 으로 순회한다.
+    payload는 읽지 않고 헤더만 읽은 뒤 다음 박스로 seek 한다.
+    """
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        header_size = 8
+        if size == 1:
+            ext = f.read(8)
+            if len(ext) < 8:
+                raise ValueError("Truncated box header")
+            (size,) = struct.unpack(">Q", ext)
+            header_size = 16
+        elif size == 0:
+            size = end - pos  # 마지막 박스(파일 끝까지)
+        if size < header_size or pos + size > end:
+            raise ValueError("Invalid box size")
+        yield box_type, pos + header_size, pos + size
+        pos += size
+
+
+def _read_payload(f: BinaryIO, start: int, end: int) -> Optional[bytes]:
+    """작은 박스 payload를 읽는다. 상한을 넘으면 None."""
+    if end - start > MAX_SMALL_BOX_BYTES:
+        return None
+    f.seek(start)
+    data = f.read(end - start)
+    if len(data) != end - start:
+        raise ValueError("Truncated box payload")
+    return data
+
+
+def format_quicktime_time(value: int) -> str:
+    """QuickTime 시간값을 ExifTool과 같은 `YYYY:MM:DD HH:MM:SS`(UTC 원문) 문자열로 변환한다."""
+    if value >= _QT_TO_UNIX_OFFSET:
+        value -= _QT_TO_UNIX_OFFSET
+    if value == 0:
+        return _ZERO_DATETIME
+    return (_UNIX_EPOCH + timedelta(seconds=value)).strftime("%Y:%m:%d %H:%M:%S")
+
+
+def _read_header_time(f: BinaryIO, start: int, end: int) -> Optional[str]:
+    """mvhd/tkhd/mdhd 공통 레이아웃(version, flags, creation_time)에서 생성 시각을 읽는다."""
+    f.seek(start)
+    head = f.read(12)
+    if len(head) < 8:
+        return None
+    if head[0] == 1:
+        if len(head) < 12:
+            return None
+        (created,) = struct.unpack(">Q", head[4:12])
+    else:
+        (created,) = struct.unpack(">I", head[4:8])
+    return format_quicktime_time(created)
+
+
+def _parse_trak(f: BinaryIO, start: int, end: int, tags: dict[str, str]) -> None:
+    for box_type, p_start, p_end in _iter_boxes(f, start, end):
+        if box_type == b"tkhd":
+            value = _read_header_time(f, p_start, p_end)
+            if value is not None:
+                tags.setdefault("TrackCreateDate", value)
+        elif box_type == b"mdia":
+            for sub_type, s_start, s_end in _iter_boxes(f, p_start, p_end):
+                if sub_type == b"mdhd":
+                    value = _read_header_time(f, s_start, s_end)
+                    if value is not None:
+                        tags.setdefault("MediaCreateDate", value)
+
+
+def _decode_text(raw: bytes) -> str:
+    return raw.split(b"\x00", 1)[0].rstrip().decode("utf-8", errors="replace")
+
+
+def _parse_data_box(payload: bytes) -> Optional[str]:
+    """ilst/udta 항목 안의 'data' 박스(type, locale, value)에서 문자열 값을 꺼낸다."""
+    if len(payload) < 16 or payload[4:8] != b"data":
+        return None
+    (size,) = struct.unpack(">I", payload[:4])
+    return _decode_text(payload[16:size]) or None
+
+
+def _parse_udta(f: BinaryIO, start: int, end: int, tags: dict[str, str]) -> None:
+    for box_type, p_start, p_end in _iter_boxes(f, start, end):
+        name = _UDTA_TAGS.get(box_type)
+        if name is None or name in tags:
+            continue
+        payload = _read_payload(f, p_start, p_end)
+        if not payload:
+            continue
+        value = _parse_data_box(payload)
+        if value is None and len(payload) >= 4:
+            # QuickTime 형식: uint16 길이 + uint16 언어 코드 + 텍스트
+            (length,) = struct.unpack(">H", payload[:2])
+            value = _decode_text(payload[4 : 4 + length]) or None
+        if value:
+            tags[name] = value
+
+
+def _meta_children_start(f: BinaryIO, start: int) -> int:
+    """ISO meta 는 FullBox(4바이트 version/flags), QuickTime meta 는 일반 박스이다."""
+    f.seek(start)
+    head = f.read(8)
+    if head[4:8] in (b"hdlr", b"keys", b"ilst"):
+        return start
+    return start + 4
+
+
+def _parse_qt_keys(payload: bytes) -> list[str]:
+    (count,) = struct.unpack(">I", payload[4:8])
+    keys = []
+    pos = 8
+    for _ in range(count):
+        (size,) = struct.unpack(">I", payload[pos : pos + 4])
+        if size < 8:
+            raise ValueError("Invalid keys entry")
+        keys.append(payload[pos + 8 : pos + size].decode("utf-8", errors="replace"))
+        pos += size
+    return keys
+
+
+def _parse_qt_meta(f: BinaryIO, start: int, end: int, tags: dict[str, str]) -> None:
+    """moov/meta 의 keys + ilst(Apple 'mdta' 키)에서 Make/Model을 읽는다."""
+    keys: list[str] = []
+    ilst: Optional[tuple[int, int]] = None
+    for box_type, p_start, p_end in _iter_boxes(f, _meta_children_start(f, start), end):
+        if box_type == b"keys":
+            payload = _read_payload(f, p_start, p_end)
+            if payload:
+                keys = _parse_qt_keys(payload)
+        elif box_type == b"ilst":
+            ilst = (p_start, p_end)
+
+    if not keys or ilst is None:
+        return
+
+    for box_type, p_start, p_end in _iter_boxes(f, *ilst):
+        (index,) = struct.unpack(">I", box_type)
+        if not 1 <= index <= len(keys):
+            continue
+        name = _QT_KEY_TAGS.get(keys[index - 1])
+        if name is None or name in tags:
+            continue
+        payload = _read_payload(f, p_start, p_end)
+        value = _parse_data_box(payload) if payload else None
+        if value:
+            tags[name] = value
+
+
+def _parse_canon_uuid(f: BinaryIO, start: int, end: int, tags: dict[str, str]) -> None:
+    """CR3 moov/uuid 의 CMT1(IFD0), CMT2(Exif IFD) TIFF 블록에서 EXIF 태그를 읽는다."""
+    for box_type, p_start, p_end in _iter_boxes(f, start, end):
+        if box_type not in (b"CMT1", b"CMT2"):
+            continue
+        payload = _read_payload(f, p_start, p_end)
+        if not payload:
+            continue
+        if box_type == b"CMT1":
+            exif_tags = parse_tiff_tags(payload)
+        else:
+            exif_tags = parse_tiff_tags(payload, ifd0_tags=EXIF_IFD_TAGS)
+        for name, value in exif_tags.items():
+            tags.setdefault(name, value)
+
+
+def _parse_moov(f: BinaryIO, start: int, end: int, tags: dict[str, str]) -> None:
+    for box_type, p_start, p_end in _iter_boxes(f, start, end):
+        if box_type == b"mvhd":
+            value = _read_header_time(f, p_start, p_end)
+            if value is not None:
+                tags.setdefault("CreateDate", value)
+        elif box_type == b"trak":
+            _parse_trak(f, p_start, p_end, tags)
+        elif box_type == b"udta":
+            _parse_udta(f, p_start, p_end, tags)
+        elif box_type == b"meta":
+            _parse_qt_meta(f, p_start, p_end, tags)
+        elif box_type == b"uuid":
+            f.seek(p_start)
+            if f.read(16) == _CANON_CR3_UUID:
+                _parse_canon_uuid(f, p_start + 16, p_end, tags)
+
+
+def _read_uint(data: bytes, pos: int, size: int) -> int:
+    if size == 0:
+        return 0
+    if size not in (4, 8) or pos + size > len(data):
+        raise ValueError("Unsupported iloc field size")
+    return int.from_bytes(data[pos : pos + size], "big")
+
+
+def _find_exif_item_id(payload: bytes) -> Optional[int]:
+    """iinf 에서 item_type 'Exif' 인 아이템 ID를 찾는다."""
+    version = payload[0]
+    pos = 4 + (2 if version == 0 else 4)
+    while pos + 8 <= len(payload):
+        size, box_type = struct.unpack(">I4s", payload[pos : pos + 8])
+        if size < 8:
+            raise ValueError("Invalid infe box")
+        if box_type == b"infe":
+            infe_version = payload[pos + 8]
+            if infe_version == 2:
+                (item_id,) = struct.unpack(">H", payload[pos + 12 : pos + 14])
+                item_type = payload[pos + 16 : pos + 20]
+            elif infe_version == 3:
+                (item_id,) = struct.unpack(">I", payload[pos + 12 : pos + 16])
+                item_type = payload[pos + 18 : pos + 22]
+            else:
+                item_type = b""
+            if item_type == b"Exif":
+                return item_id
+        pos += size
+    return None
+
+
+def _parse_iloc(payload: bytes) -> dict[int, tuple[int, int]]:
+    """iloc 에서 단일 extent(파일 오프셋 기준) 아이템의 {item_id: (offset, length)}를 읽는다."""
+    version = payload[0]
+    offset_size = payload[4] >> 4
+    length_size = payload[4] & 0x0F
+    base_offset_size = payload[5] >> 4
+    index_size = payload[5] & 0x0F if version in (1, 2) else 0
+    pos = 6
+    if version < 2:
+        (count,) = struct.unpack(">H", payload[pos : pos + 2])
+        pos += 2
+    else:
+        (count,) = struct.unpack(">I", payload[pos : pos + 4])
+        pos += 4
+
+    locations: dict[int, tuple[int, int]] = {}
+    for _ in range(count):
+        if version < 2:
+            (item_id,) = struct.unpack(">H", payload[pos : pos + 2])
+            pos += 2
+        else:
+            (item_id,) = struct.unpack(">I", payload[pos : pos + 4])
+            pos += 4
+        construction_method = 0
+        if version in (1, 2):
+            (method,) = struct.unpack(">H", payload[pos : pos + 2])
+            construction_method = method & 0x0F
+            pos += 2
+        pos += 2  # data_reference_index
+        base_offset = _read_uint(payload, pos, base_offset_size)
+        pos += base_offset_size
+        (extent_count,) = struct.unpack(">H", payload[pos : pos + 2])
+        pos += 2
+        extents = []
+        for _ in range(extent_count):
+            pos += index_size
+            extent_offset = _read_uint(payload, pos, offset_size)
+            pos += offset_size
+            extent_length = _read_uint(payload, pos, length_size)
+            pos += length_size
+            extents.append((base_offset + extent_offset, extent_length))
+        if construction_method == 0 and len(extents) == 1:
+            locations[item_id] = extents[0]
+    return locations
+
+
+def _parse_heif_meta(f: BinaryIO, start: int, end: int, tags: dict[str, str]) -> None:
+    """HEIC 최상위 meta 의 Exif 아이템을 찾아 EXIF 태그를 읽는다."""
+    exif_item_id: Optional[int] = None
+    locations: dict[int, tuple[int, int]] = {}
+    for box_type, p_start, p_end in _iter_boxes(f, _meta_children_start(f, start), end):
+        if box_type == b"iinf":
+            payload = _read_payload(f, p_start, p_end)
+            if payload:
+                exif_item_id = _find_exif_item_id(payload)
+        elif box_type == b"iloc":
+            payload = _read_payload(f, p_start, p_end)
+            if payload:
+                locations = _parse_iloc(payload)
+
+    if exif_item_id is None or exif_item_id not in locations:
+        return
+    offset, length = locations[exif_item_id]
+    if length > MAX_EXIF_ITEM_BYTES or length < 4:
+        return
+    f.seek(offset)
+    item = f.read(length)
+    # Exif 아이템은 4바이트 TIFF 헤더 오프셋 뒤에 TIFF 데이터가 온다.
+    (tiff_offset,) = struct.unpack(">I", item[:4])
+    for name, value in parse_tiff_tags(item[4 + tiff_offset :]).items():
+        tags.setdefault(name, value)
+
+
+def read_isobmff_tags(path: Path) -> Optional[dict[str, str]]:
+    """
+    ISOBMFF 계열 파일에서 촬영일/카메라 태그를 읽어 ExifTool `-s3` 형식의 dict로 반환한다.
+
+    - 지원하지 않는 확장자/구조이거나 읽기에 실패하면 None
+    """
+    if path.suffix.lower() not in ISOBMFF_EXTENSIONS:
+        return None
+
+    tags: dict[str, str] = {}
+    try:
+        with open(path, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            for box_type, p_start, p_end in _iter_boxes(f, 0, file_size):
+                if box_type == b"moov":
+                    _parse_moov(f, p_start, p_end, tags)
+                elif box_type == b"meta":
+                    _parse_heif_meta(f, p_start, p_end, tags)
+                # mdat/free 등은 헤더만 보고 건너뛴다.
+    except (OSError, ValueError, struct.error):
+        return None
+    return tags
@@ -0,0 +1,108 @@
+"""
+msr.core.journal
+
+실행 1회의 체크포인트 저널. 중단된 실행을 다시 시작하면 이미 끝난 파일은 추출/계획 없이 건너뛴다.
+
+- 위치: [SourceRoot]/result/run_journal.jsonl (CRG 11: 결과/로그는 result/ 아래)
+- 복사 단계가 파일 1개의 결과를 확정할 때마다(소스 순서, NFR-03) 한 줄씩 덧붙인다.
+  {"src": 소스 상대 경로, "size": 크기, "mtime_ns": 수정 시각, "dst": result/ 기준 상대 경로|null,
+   "outcome": msr.core.manifest.OUTCOME_*}
+- 오류로 끝난 파일은 기록하지 않는다(재시작 시 다시 처리).
+- 실행이 끝까지 완료되면 파일을 지운다. 시작할 때 파일이 남아 있으면 앞 실행이 중단된 것이다.
+- 줄은 쓸 때마다 OS로 내보내므로(flush) 프로세스가 죽어도 확정된 줄은 남는다.
+  sync=True이면 줄마다 fsync한다(전원 차단 대비). 마지막 줄이 잘렸으면 읽을 때 무시한다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Optional, TextIO
+
+JOURNAL_FILENAME = "run_journal.jsonl"
+
+
+class RunJournal:
+    """확정된 파일을 한 줄씩 덧붙이는 저널. 앞 실행의 기록을 읽어 이어서 처리하는 데 쓴다."""
+
+    def __init__(self, path: Path, source_root: Path, result_root: Path, sync: bool = False):
+        """
+        Raises
+        - OSError: 저널 파일을 읽거나 열 수 없는 경우
+        """
+        self.path = path
+        self.source_root = source_root
+        self.result_root = result_root
+        self.sync = sync
+        # 앞 실행에서 확정된 파일: 소스 상대 경로 -> (크기, mtime_ns)
+        self._committed: dict[str, tuple[int, int]] = {}
+        self.interrupted = path.exists()
+        if self.interrupted:
+            self._load()
+        self._file: Optional[TextIO] = open(path, "a", encoding="utf-8", newline="\n")
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._committed)
+
+    def _key(self, src_path: Path) -> str:
+        return src_path.relative_to(self.source_root).as_posix()
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self._committed[entry["src"]] = (int(entry["size"]), int(entry["mtime_ns"]))
+                except (ValueError, KeyError, TypeError):
+                    continue  # 기록 도중 중단되어 잘린 줄
+
+    def is_committed(self, src_path: Path, size: int, mtime_ns: int) -> bool:
+        """앞 실행에서 확정되었고 그 뒤로 바뀌지 않은 파일인지 확인한다."""
+        return self._committed.get(self._key(src_path)) == (size, mtime_ns)
+
+    def commit(
+        self,
+        src_path: Path,
+        size: int,
+        mtime_ns: int,
+        destination: Optional[Path],
+        outcome: str,
+    ) -> None:
+        """
+        Raises
+        - OSError: 저널 쓰기 실패
+        """
+        if self._file is None:
+            return
+        entry = {
+            "src": self._key(src_path),
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "dst": destination.relative_to(self.result_root).as_posix() if destination else None,
+            "outcome": outcome,
+        }
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """저널을 닫는다(파일은 남겨 다음 실행이 이어서 처리하게 한다). 여러 번 호출해도 안전하다."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def complete(self) -> None:
+        """실행이 끝까지 완료되었으므로 저널을 닫고 지운다."""
+        self.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
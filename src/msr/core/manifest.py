@@ -0,0 +1,189 @@
+"""
+msr.core.manifest
+
+처리한 소스 파일의 영구 목록(SQLite). 증분 모드에서 변경되지 않은 파일을 건너뛰는 데 쓴다.
+
+- 위치: [SourceRoot]/result/source_manifest.sqlite3 (CRG 11: 결과/로그는 result/ 아래)
+- 키: 소스 루트 기준 상대 경로(POSIX 형식). 결과 폴더가 소스 아래에 있으므로 소스 폴더를
+  옮겨도 목록이 유효하다.
+- 값: 크기, mtime_ns, 계획된 대상 경로(result/ 기준 상대 경로), 처리 결과(outcome).
+- 매 실행마다 처리 결과를 기록하고, 증분 모드일 때만 조회한다.
+- 변경 없음 판정: 크기와 mtime_ns가 같고, 결과가 오류가 아니며, 기록된 대상 파일이 아직 있다.
+  오류였던 파일과 결과 파일이 지워진 파일은 다시 처리한다. 대상 파일은 파일마다 stat하지 않고
+  DestinationIndex로 확인한다(날짜 폴더마다 목록을 한 번만 읽는다).
+- 기록은 모아서 쓰고(flush_every), close 시 남은 기록을 쓴다.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from msr.core.dest_index import DestinationIndex
+
+MANIFEST_FILENAME = "source_manifest.sqlite3"
+SCHEMA_VERSION = 1
+DEFAULT_FLUSH_EVERY = 500
+
+# 처리 결과(outcome)
+OUTCOME_CONVERTED = "converted"
+OUTCOME_COPIED = "copied"
+OUTCOME_ALREADY_EXISTS = "already_exists"
+OUTCOME_SKIPPED_NO_DATETIME = "skipped_no_datetime"
+OUTCOME_SKIPPED_NOT_IMG_PATTERN = "skipped_not_img_pattern"
+OUTCOME_ERROR = "error"
+
+
+class ManifestEntry(NamedTuple):
+    """소스 파일 1개의 마지막 처리 기록."""
+
+    size: int
+    mtime_ns: int
+    destination: Optional[str]
+    outcome: str
+
+
+class SourceManifest:
+    """소스 상대 경로를 키로 처리 기록을 저장하는 SQLite 목록."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        source_root: Path,
+        result_root: Path,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+    ):
+        """
+        Raises
+        - sqlite3.Error: DB 파일을 열거나 스키마를 만들 수 없는 경우
+        """
+        self.db_path = db_path
+        self.source_root = source_root
+        self.result_root = result_root
+        self.flush_every = flush_every
+        self._entries: Optional[dict[str, ManifestEntry]] = None
+        self._rows: list[tuple] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._init_schema()
+        # is_unchanged에 색인을 주지 않았을 때 쓰는 결과 폴더 색인
+        self.dest_index = DestinationIndex(result_root)
+
+    def __enter__(self) -> "SourceManifest":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _init_schema(self) -> None:
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS sources")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                destination TEXT,
+                outcome TEXT NOT NULL,
+                updated INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def _key(self, src_path: Path) -> str:
+        return src_path.relative_to(self.source_root).as_posix()
+
+    def load(self) -> None:
+        """저장된 기록을 메모리로 읽는다(증분 모드에서 파일마다 DB를 조회하지 않도록)."""
+        with self._lock:
+            self._entries = {
+                row[0]: ManifestEntry(*row[1:])
+                for row in self._conn.execute(
+                    "SELECT path, size, mtime_ns, destination, outcome FROM sources"
+                )
+            }
+
+    def get(self, src_path: Path) -> Optional[ManifestEntry]:
+        """load()한 기록 중 src_path의 기록. load() 전이면 None."""
+        if self._entries is None:
+            return None
+        return self._entries.get(self._key(src_path))
+
+    def is_unchanged(
+        self,
+        src_path: Path,
+        size: int,
+        mtime_ns: int,
+        dest_index: Optional[DestinationIndex] = None,
+    ) -> bool:
+        """
+        마지막 처리 이후 바뀌지 않아 다시 처리할 필요가 없는 파일인지 확인한다.
+        dest_index: 대상 파일 확인에 쓸 결과 폴더 색인(없으면 self.dest_index). 복사 단계와 같은
+        색인을 주면 수집 단계에서 읽은 폴더 목록을 충돌 판정에서 다시 쓴다.
+        """
+        entry = self.get(src_path)
+        if entry is None or entry.outcome == OUTCOME_ERROR:
+            return False
+        if entry.size != size or entry.mtime_ns != mtime_ns:
+            return False
+        if entry.destination is not None:
+            index = self.dest_index if dest_index is None else dest_index
+            if not index.exists(self.result_root / entry.destination):
+                return False
+        return True
+
+    def record(
+        self,
+        src_path: Path,
+        size: int,
+        mtime_ns: int,
+        destination: Optional[Path],
+        outcome: str,
+    ) -> None:
+        """
+        처리 결과를 기록한다. flush_every개가 모이면 DB에 쓴다.
+        load()한 상태면 메모리의 기록도 바꾼다(감시 모드에서 같은 파일을 다시 처리하지 않도록).
+        """
+        dst = destination.relative_to(self.result_root).as_posix() if destination else None
+        key = self._key(src_path)
+        with self._lock:
+            if self._entries is not None:
+                self._entries[key] = ManifestEntry(size, mtime_ns, dst, outcome)
+            self._rows.append((key, size, mtime_ns, dst, outcome, int(time.time())))
+            if len(self._rows) >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._rows:
+            return
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO sources (path, size, mtime_ns, destination, outcome, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            self._rows,
+        )
+        self._conn.commit()
+        self._rows.clear()
+
+    def close(self) -> None:
+        """남은 기록을 쓰고 연결을 닫는다. 여러 번 호출해도 안전하다."""
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._entries = None
+                self._conn.close()
+                self._closed = True
@@ -2,16 +2,20 @@
 This module defines the metadata model and normalization logic.
 - DTL M1-03: 메타데이터 모델/정규화(Metadata)
 - CRG 4.3: 촬영일 태그 우선순위
-- CRG 4.4: 카메라 정규화
+- CRG 4.4: 카메라 정규화(규칙 표는 msr.core.camera_rules)
 """ 
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
-@dataclass
+from msr.core.camera_rules import DEFAULT_RULES, CameraNormalizer, CameraRule
+
+@dataclass(slots=True)
 class MetaRecord:
     """
     Represents normalized metadata extracted from a media file.
+    파일 수만큼 만들어지므로 __slots__를 쓰고, 제조사/모델 문자열은 intern해 같은 기종끼리 공유한다.
     """
     datetime_original: Optional[str] = None  # 촬영일 (ExifTool 원본 문자열, offset 포함 가능)
     camera_make: Optional[str] = None       # 카메라 제조사 (정규화 전)
@@ -19,30 +23,34 @@ class MetaRecord:
     normalized_camera: str = "UNKNOWN"      # 정규화된 카메라 토큰 (CRG 4.4)
     # TODO: M2-02 - 원본 태그값 (optional) 필드 추가 고려
 
-def normalize_camera_model(make: Optional[str], model: Optional[str]) -> str:
+    def __post_init__(self):
+        if type(self.camera_make) is str:
+            self.camera_make = sys.intern(self.camera_make)
+        if type(self.camera_model) is str:
+            self.camera_model = sys.intern(self.camera_model)
+
+# CRG 4.4: 현재 카메라 정규화 규칙 표(set_camera_rules로 바꾼다)
+_camera_normalizer = CameraNormalizer(DEFAULT_RULES)
+
+
+def set_camera_rules(rules: Optional[Iterable[CameraRule]] = None) -> None:
     """
-    Normalizes camera make and model into a standardized token.
-    CRG 4.4: 카메라 정규화 규칙 적용.
-    - 출력 토큰: `EOSR7`, `EOS200D2`, `iPhone`, `UNKNOWN`
-    - EOS 200D II 표기 다양성은 모두 `EOS200D2`로 매핑.
+    카메라 정규화 규칙 표를 바꾼다(None이면 기본 규칙). 기억해 둔 판별 결과도 버린다.
+
+    Raises
+    - ValueError: 잘못된 규칙
     """
-    if not make and not model:
-        return "UNKNOWN"
+    global _camera_normalizer
+    _camera_normalizer = CameraNormalizer(DEFAULT_RULES if rules is None else rules)
 
-    make_lower = make.lower() if make else ""
-    model_lower = model.lower() if model else ""
 
-    # Canon EOS R7
-    if "canon" in make_lower and "eos r7" in model_lower:
-        return "EOSR7"
-    # Canon EOS 200D II (various spellings)
-    if "canon" in make_lower and ("eos 200d ii" in model_lower or "eos 200d2" in model_lower or "eos kiss x10i" in model_lower):
-        return "EOS200D2"
-    # iPhone
-    if "apple" in make_lower and "iphone" in model_lower:
-        return "iPhone"
-    
-    return "UNKNOWN"
+def normalize_camera_model(make: Optional[str], model: Optional[str]) -> str:
+    """
+    Normalizes camera make and model into a standardized token.
+    CRG 4.4: 카메라 정규화 규칙 적용(msr.core.camera_rules, 기본: `EOSR7`, `EOS200D2`, `iPhone`).
+    - 어느 규칙에도 맞지 않으면 `UNKNOWN`.
+    """
+    return _camera_normalizer.normalize(make, model)
 
 
 # CRG 4.3: 촬영일 태그 우선순위
@@ -0,0 +1,195 @@
+"""
+msr.core.metadata_cache
+
+재실행 시 ExifTool 재추출을 피하기 위한 영구 메타데이터 캐시(SQLite).
+
+- 위치: [SourceRoot]/result/metadata_cache.sqlite3 (CRG 11: 결과/로그는 result/ 아래)
+- 키: resolve()된 경로 + 파일 크기 + mtime_ns + inode. 하나라도 다르면 미적중(무효화)으로 본다.
+- 값: ExifTool 원본 태그 기반 필드(촬영일 원문, Make, Model).
+  카메라 토큰은 로드 시 normalize_camera_model로 다시 계산하여 정규화 규칙 변경에도 안전하다.
+- 크기 상한(max_entries)을 넘으면 가장 오래 사용되지 않은 항목부터 삭제한다(close 시점).
+- 워커 풀 스레드에서 동시에 호출되므로 연결 1개를 잠금으로 보호한다.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Mapping, Optional
+
+from msr.core.metadata import MetaRecord, normalize_camera_model
+
+CACHE_FILENAME = "metadata_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 500_000
+SCHEMA_VERSION = 1
+
+# SQLite 바인딩 변수 개수 제한(구버전 999)을 넘지 않도록 IN 조회를 나눈다.
+_QUERY_BATCH = 500
+
+FileKey = tuple[int, int, int]  # (size, mtime_ns, inode)
+
+
+class MetadataCache:
+    """경로/크기/mtime/inode 키로 MetaRecord를 저장하는 SQLite 캐시."""
+
+    def __init__(self, db_path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Raises
+        - sqlite3.Error: DB 파일을 열거나 스키마를 만들 수 없는 경우
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # lookup 시점의 stat 결과. 추출 도중 파일이 바뀌어도 추출 전 키로 저장한다.
+        self._pending_keys: dict[str, FileKey] = {}
+        self._closed = False
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._init_schema()
+
+    def __enter__(self) -> "MetadataCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _init_schema(self) -> None:
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS metadata")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS metadata (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                datetime_original TEXT,
+                camera_make TEXT,
+                camera_model TEXT,
+                last_used INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_metadata_last_used ON metadata(last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def file_key(path: Path) -> Optional[FileKey]:
+        """파일의 캐시 키(size, mtime_ns, inode). stat 실패 시 None."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns, st.st_ino
+
+    def lookup(
+        self, files: list[Path], file_stats: Optional[Mapping[Path, FileKey]] = None
+    ) -> tuple[dict[Path, MetaRecord], list[Path]]:
+        """
+        캐시에서 MetaRecord를 찾는다.
+        file_stats(입력 경로 -> (size, mtime_ns, inode))가 주어지면 해당 파일은 다시 stat하지 않는다.
+
+        Returns
+        - (resolve()된 경로 -> MetaRecord, 미적중 파일 목록(입력 순서 유지))
+        """
+        keys: dict[str, tuple[Path, Optional[FileKey]]] = {}
+        for path in files:
+            resolved = path.resolve()
+            key = file_stats.get(path) if file_stats is not None else None
+            keys[str(resolved)] = (path, key if key is not None else self.file_key(resolved))
+
+        rows: dict[str, tuple] = {}
+        with self._lock:
+            names = list(keys)
+            for i in range(0, len(names), _QUERY_BATCH):
+                batch = names[i : i + _QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                for row in self._conn.execute(
+                    "SELECT path, size, mtime_ns, inode, datetime_original, camera_make, camera_model "
+                    f"FROM metadata WHERE path IN ({placeholders})",
+                    batch,
+                ):
+                    rows[row[0]] = row
+
+            hits: dict[Path, MetaRecord] = {}
+            misses: list[Path] = []
+            for name, (path, key) in keys.items():
+                row = rows.get(name)
+                if key is not None and row is not None and tuple(row[1:4]) == key:
+                    _, _, _, _, dt, make, model = row
+                    hits[Path(name)] = MetaRecord(
+                        datetime_original=dt,
+                        camera_make=make,
+                        camera_model=model,
+                        normalized_camera=normalize_camera_model(make, model),
+                    )
+                else:
+                    misses.append(path)
+                    if key is not None:
+                        self._pending_keys[name] = key
+
+            if hits:
+                now = int(time.time())
+                self._conn.executemany(
+                    "UPDATE metadata SET last_used = ? WHERE path = ?",
+                    [(now, str(p)) for p in hits],
+                )
+                self._conn.commit()
+
+            self.hits += len(hits)
+            self.misses += len(misses)
+        return hits, misses
+
+    def store(self, records: dict[Path, MetaRecord]) -> None:
+        """추출 결과(resolve()된 경로 -> MetaRecord)를 캐시에 저장(교체)한다."""
+        now = int(time.time())
+        rows = []
+        with self._lock:
+            for path, meta in records.items():
+                name = str(path)
+                key = self._pending_keys.pop(name, None) or self.file_key(path)
+                if key is None:
+                    continue
+                rows.append((name, *key, meta.datetime_original, meta.camera_make, meta.camera_model, now))
+            if not rows:
+                return
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO metadata "
+                "(path, size, mtime_ns, inode, datetime_original, camera_make, camera_model, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """max_entries를 넘는 만큼 가장 오래 사용되지 않은 항목을 삭제하고 삭제 개수를 반환한다."""
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM metadata").fetchone()
+            excess = count - self.max_entries
+            if excess <= 0:
+                return 0
+            self._conn.execute(
+                "DELETE FROM metadata WHERE path IN "
+                "(SELECT path FROM metadata ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+            self._conn.commit()
+            return excess
+
+    def close(self) -> None:
+        """상한 초과분을 정리하고 연결을 닫는다. 여러 번 호출해도 안전하다."""
+        if self._closed:
+            return
+        try:
+            self.evict()
+        finally:
+            with self._lock:
+                self._pending_keys.clear()
+                self._conn.close()
+                self._closed = True
@@ -0,0 +1,213 @@
+"""
+msr.core.native_exif
+
+ExifTool 없이 JPEG/DNG의 EXIF(TIFF IFD)에서 촬영일/카메라 태그만 읽는 순수 Python 리더.
+MP4/MOV/HEIC/CR3(ISOBMFF)는 msr.core.isobmff 리더로 위임한다.
+
+- CRG 6.1: ExifTool 호출 최소화 - 대부분의 JPEG/DNG는 여기서 처리하고, 나머지만 ExifTool로 보낸다.
+- CRG 4.3/4.4: 태그 우선순위/카메라 정규화는 msr.core.metadata.extract_and_normalize_metadata를 그대로 사용한다.
+
+정책(중요)
+- 파일 앞부분만 제한적으로 읽는다(MAX_HEADER_BYTES).
+- 최우선 촬영일 태그(이미지: DateTimeOriginal, 동영상: MediaCreateDate)를 찾은 경우에만 "처리 완료"로 본다.
+  동영상은 제조사별 박스에 카메라 정보가 있을 수 있으므로 Make/Model 중 하나도 찾아야 한다.
+  그 외(태그 없음/구조 이상/범위 초과)는 ExifTool이 XMP 등 다른 위치까지 확인하도록 넘긴다.
+- 반환 태그 이름은 ExifTool `-s3` 출력과 같다(DateTimeOriginal, CreateDate, Make, Model).
+"""
+
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from msr.core.metadata import (
+    DATETIME_TAG_PRIORITY_IMAGE,
+    DATETIME_TAG_PRIORITY_VIDEO,
+    SUPPORTED_VIDEO_EXTENSIONS,
+    MetaRecord,
+    extract_and_normalize_metadata,
+)
+
+NATIVE_EXIF_EXTENSIONS = {".jpg", ".jpeg", ".dng"}
+
+# JPEG에서 APP1(Exif) 세그먼트를 찾을 최대 탐색 범위, TIFF/DNG에서 읽을 헤더 크기
+MAX_HEADER_BYTES = 256 * 1024
+TIFF_HEADER_BYTES = 64 * 1024
+
+# IFD0 / Exif IFD 에서 읽을 태그 (tag id -> ExifTool 태그명)
+IFD0_TAGS = {0x010F: "Make", 0x0110: "Model"}
+EXIF_IFD_TAGS = {0x9003: "DateTimeOriginal", 0x9004: "CreateDate"}
+EXIF_IFD_POINTER = 0x8769
+
+_TIFF_ASCII = 2
+_TIFF_LONG = 4
+
+_JPEG_SOI = b"\xff\xd8"
+_JPEG_APP1 = 0xE1
+_JPEG_SOS = 0xDA
+_JPEG_EOI = 0xD9
+_EXIF_HEADER = b"Exif\x00\x00"
+
+
+def parse_tiff_tags(data: bytes, ifd0_tags: dict[int, str] = IFD0_TAGS) -> dict[str, str]:
+    """
+    TIFF 구조(II*/MM*)에서 IFD0의 Make/Model, Exif IFD의 DateTimeOriginal/CreateDate를 읽는다.
+    - ifd0_tags: IFD0에서 읽을 태그(CR3 CMT2처럼 Exif IFD가 단독 TIFF인 경우 EXIF_IFD_TAGS)
+
+    Raises
+    - ValueError / struct.error: TIFF 헤더가 아니거나 오프셋이 데이터 범위를 벗어난 경우
+    """
+    if data[:4] == b"II*\x00":
+        endian = "<"
+    elif data[:4] == b"MM\x00*":
+        endian = ">"
+    else:
+        raise ValueError("Not a TIFF header")
+
+    (ifd0_offset,) = struct.unpack_from(endian + "I", data, 4)
+    ifd0 = _read_ifd(data, endian, ifd0_offset)
+
+    tags: dict[str, str] = {}
+    _collect_ascii(data, endian, ifd0, ifd0_tags, tags)
+
+    exif_entry = ifd0.get(EXIF_IFD_POINTER)
+    if exif_entry is not None:
+        typ, _count, value_field = exif_entry
+        if typ == _TIFF_LONG:
+            (exif_offset,) = struct.unpack_from(endian + "I", value_field)
+            exif_ifd = _read_ifd(data, endian, exif_offset)
+            _collect_ascii(data, endian, exif_ifd, EXIF_IFD_TAGS, tags)
+
+    return tags
+
+
+def _read_ifd(data: bytes, endian: str, offset: int) -> dict[int, tuple[int, int, bytes]]:
+    """IFD 엔트리를 {tag: (type, count, 4바이트 value field)}로 읽는다."""
+    (count,) = struct.unpack_from(endian + "H", data, offset)
+    end = offset + 2 + count * 12
+    if end > len(data):
+        raise ValueError("IFD out of range")
+
+    entries: dict[int, tuple[int, int, bytes]] = {}
+    for i in range(count):
+        base = offset + 2 + i * 12
+        tag, typ, n = struct.unpack_from(endian + "HHI", data, base)
+        entries[tag] = (typ, n, data[base + 8 : base + 12])
+    return entries
+
+
+def _collect_ascii(
+    data: bytes,
+    endian: str,
+    ifd: dict[int, tuple[int, int, bytes]],
+    wanted: dict[int, str],
+    out: dict[str, str],
+) -> None:
+    for tag_id, name in wanted.items():
+        entry = ifd.get(tag_id)
+        if entry is None:
+            continue
+        typ, count, value_field = entry
+        if typ != _TIFF_ASCII or count == 0:
+            continue
+        if count <= 4:
+            raw = value_field[:count]
+        else:
+            (value_offset,) = struct.unpack_from(endian + "I", value_field)
+            raw = data[value_offset : value_offset + count]
+            if len(raw) != count:
+                raise ValueError("Tag value out of range")
+        # ExifTool과 동일하게 NUL 이후와 끝 공백은 버린다.
+        value = raw.split(b"\x00", 1)[0].rstrip().decode("utf-8", errors="replace")
+        if value:
+            out[name] = value
+
+
+def _read_jpeg_exif(f: BinaryIO) -> Optional[bytes]:
+    """JPEG 마커를 따라가며 APP1(Exif) 세그먼트의 TIFF 데이터를 반환한다. 없으면 None."""
+    if f.read(2) != _JPEG_SOI:
+        return None
+
+    pos = 2
+    while pos < MAX_HEADER_BYTES:
+        header = f.read(4)
+        if len(header) < 4 or header[0] != 0xFF:
+            return None
+        marker = header[1]
+        if marker in (_JPEG_SOS, _JPEG_EOI):
+            return None
+        (length,) = struct.unpack(">H", header[2:4])
+        if length < 2:
+            return None
+
+        if marker == _JPEG_APP1:
+            payload = f.read(length - 2)
+            if payload.startswith(_EXIF_HEADER):
+                return payload[len(_EXIF_HEADER) :]
+        else:
+            f.seek(length - 2, 1)
+        pos += 2 + length
+    return None
+
+
+def read_exif_tags(path: Path) -> Optional[dict[str, str]]:
+    """
+    JPEG/DNG 파일에서 EXIF 태그를 읽어 ExifTool `-s3` 형식의 dict로 반환한다.
+
+    - 지원하지 않는 확장자/구조이거나 읽기에 실패하면 None
+    """
+    suffix = path.suffix.lower()
+    if suffix not in NATIVE_EXIF_EXTENSIONS:
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            if suffix == ".dng":
+                data: Optional[bytes] = f.read(TIFF_HEADER_BYTES)
+            else:
+                data = _read_jpeg_exif(f)
+        if not data:
+            return None
+        return parse_tiff_tags(data)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def read_native_tags(path: Path) -> Optional[dict[str, str]]:
+    """확장자에 맞는 내장 리더(EXIF 또는 ISOBMFF)로 태그를 읽는다. 지원하지 않으면 None."""
+    if path.suffix.lower() in NATIVE_EXIF_EXTENSIONS:
+        return read_exif_tags(path)
+
+    # 지연 import(순환참조 방지: isobmff가 parse_tiff_tags를 사용)
+    from msr.core.isobmff import read_isobmff_tags
+
+    return read_isobmff_tags(path)
+
+
+def _is_complete(path: Path, tags: dict[str, str]) -> bool:
+    """ExifTool을 생략해도 같은 MetaRecord가 나오는지(최우선 태그 확보 여부) 판단한다."""
+    if path.suffix.lower() in SUPPORTED_VIDEO_EXTENSIONS:
+        return DATETIME_TAG_PRIORITY_VIDEO[0] in tags and ("Make" in tags or "Model" in tags)
+    return DATETIME_TAG_PRIORITY_IMAGE[0] in tags
+
+
+def extract_native_metadata(files: list[Path]) -> tuple[dict[Path, MetaRecord], list[Path]]:
+    """
+    ExifTool 없이 처리 가능한 파일의 MetaRecord를 만들고, 나머지 파일 목록을 함께 반환한다.
+
+    Returns
+    - (resolve()된 경로 -> MetaRecord, ExifTool로 넘겨야 할 파일 목록(입력 순서 유지))
+    """
+    handled: dict[Path, MetaRecord] = {}
+    remaining: list[Path] = []
+
+    for path in files:
+        tags = read_native_tags(path)
+        if not tags or not _is_complete(path, tags):
+            remaining.append(path)
+            continue
+        src_path = path.resolve()
+        handled[src_path] = extract_and_normalize_metadata(src_path, tags)
+
+    return handled, remaining
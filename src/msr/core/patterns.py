@@ -21,6 +21,15 @@ IMG_PATTERN = re.compile(r"^IMG_(?P<id>[a-z0-9]{1,15})$", re.IGNORECASE)
 PASS_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}_(?P<id>[^_]+)_(?P<camera>[A-Za-z0-9]+)$")
 
 
+# PASS/IMG 패턴을 한 번의 매칭으로 판별한다(msr.core.planner.generate_plans).
+# 각 분기는 위 두 정규식과 같다(PASS는 대소문자 구분, IMG만 (?i:...)로 대소문자 무시).
+# 두 패턴은 겹치지 않으므로(IMG는 "IMG_"로 시작) 어느 분기가 맞았는지는 lastgroup으로 안다.
+NAME_PATTERN = re.compile(
+    r"^(?:(?P<pass>\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}_[^_]+_[A-Za-z0-9]+)"
+    r"|(?i:IMG_(?P<img_id>[a-z0-9]{1,15})))$"
+)
+
+
 def is_img_pattern(filename_stem: str) -> bool:
     """Checks if the filename stem matches the IMG pattern."""
     return bool(IMG_PATTERN.match(filename_stem))
@@ -0,0 +1,103 @@
+"""
+msr.core.pipeline
+
+단계(스레드) 사이를 잇는 크기 제한 큐와 단계 스레드.
+
+- PRD 7: 처리 파이프라인. 수집 → 추출/계획 단계를 겹쳐 실행한다.
+  (복사는 실행 전체의 계획과 충돌 해결이 끝난 뒤 시작한다, msr.core.run_plan)
+- Channel은 크기가 제한된 큐다. 가득 차면 put이 대기하여 앞 단계를 늦춘다(back-pressure).
+- 한 단계가 실패하거나 더 진행할 수 없으면 abort 이벤트를 설정하여, 대기 중인 다른 단계의
+  put/get을 PipelineAborted로 깨운다.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Callable, Generic, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# abort 이벤트 확인 주기(초)
+POLL_INTERVAL = 0.1
+
+_END = object()
+
+
+class PipelineAborted(Exception):
+    """abort 이벤트로 인해 Channel 대기가 중단된 경우."""
+    pass
+
+
+class Channel(Generic[T]):
+    """크기 제한 큐. close() 이후 반복이 끝난다. 생산자/소비자는 각각 1개를 가정한다."""
+
+    def __init__(self, maxsize: int, abort: threading.Event):
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize)
+        self._abort = abort
+
+    def put(self, item: T) -> None:
+        """
+        Raises
+        - PipelineAborted: 공간이 나기 전에 abort가 설정된 경우
+        """
+        self._put(item)
+
+    def close(self) -> None:
+        """더 보낼 항목이 없음을 알린다."""
+        self._put(_END)
+
+    def _put(self, item: object) -> None:
+        while True:
+            if self._abort.is_set():
+                raise PipelineAborted()
+            try:
+                self._queue.put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        close()될 때까지 항목을 넣은 순서대로 내보낸다.
+
+        Raises
+        - PipelineAborted: 다음 항목이 오기 전에 abort가 설정된 경우
+        """
+        while True:
+            if self._abort.is_set():
+                raise PipelineAborted()
+            try:
+                item = self._queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if item is _END:
+                return
+            yield item  # type: ignore[misc]
+
+
+class Stage(threading.Thread):
+    """
+    파이프라인 단계 1개를 실행하는 스레드.
+    예외가 나면 저장하고 abort를 설정하며, join_and_raise()에서 다시 발생시킨다.
+    """
+
+    def __init__(self, name: str, target: Callable[[], None], abort: threading.Event):
+        super().__init__(name=name, daemon=True)
+        self._target_fn = target
+        self._abort = abort
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            self._target_fn()
+        except PipelineAborted:
+            pass
+        except BaseException as e:
+            self.error = e
+            self._abort.set()
+
+    def join_and_raise(self) -> None:
+        self.join()
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,155 @@
+"""
+msr.core.plan_io
+
+실행 계획 파일(JSON Lines 또는 CSV) 쓰기/읽기. 드라이런이 쓰고, 적용(apply) 단계가 읽는다.
+
+- 한 줄(행)에 소스 파일 1개. 열은 PLAN_FIELDS 순서다.
+  - src: 소스 루트 기준 상대 경로(POSIX 형식). 소스 폴더를 옮겨도 계획이 유효하다.
+  - size, mtime_ns: 계획할 때의 원본 크기/수정 시각. 적용할 때 이것만 다시 확인한다.
+  - action: COPY_RENAME | COPY_PASS | SKIP | ERROR (ERROR는 추출/계획 실패)
+  - dst, final_dst: result/ 기준 상대 경로(계획된 이름, 충돌 해결 후 이름). 복사하지 않으면 비어 있다.
+  - already_exists: 같은 파일이 이미 결과에 있어 복사하지 않음
+  - reason: 스킵/오류 사유
+- 형식은 확장자로 정한다(.csv는 CSV, 그 밖은 JSON Lines). CSV의 빈 칸은 값 없음이다.
+- 운영자가 계획을 검토/편집할 수 있으므로, 읽을 때 결과/소스 루트 밖을 가리키는 경로는 거부한다.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path, PurePosixPath
+from typing import Iterator, NamedTuple, Optional, TextIO
+
+PLAN_FIELDS = ("src", "size", "mtime_ns", "action", "dst", "final_dst", "already_exists", "reason")
+FORMAT_JSONL = "jsonl"
+FORMAT_CSV = "csv"
+ACTION_ERROR = "ERROR"
+
+
+class PlanFileError(Exception):
+    """계획 파일의 행을 읽을 수 없는 경우(줄 번호 포함)."""
+    pass
+
+
+class PlanRow(NamedTuple):
+    """계획 파일의 행 1개."""
+
+    src: str
+    size: Optional[int]
+    mtime_ns: Optional[int]
+    action: str
+    dst: Optional[str] = None
+    final_dst: Optional[str] = None
+    already_exists: bool = False
+    reason: Optional[str] = None
+
+
+def plan_format(path: Path) -> str:
+    return FORMAT_CSV if path.suffix.lower() == ".csv" else FORMAT_JSONL
+
+
+class PlanWriter:
+    """계획 행을 파일에 쓴다."""
+
+    def __init__(self, path: Path):
+        """
+        Raises
+        - OSError: 파일을 만들 수 없는 경우
+        """
+        self.path = path
+        self.format = plan_format(path)
+        self.count = 0
+        self._file: Optional[TextIO] = open(path, "w", encoding="utf-8", newline="")
+        self._csv = None
+        if self.format == FORMAT_CSV:
+            self._csv = csv.writer(self._file, lineterminator="\n")
+            self._csv.writerow(PLAN_FIELDS)
+
+    def __enter__(self) -> "PlanWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, row: PlanRow) -> None:
+        assert self._file is not None
+        if self._csv is not None:
+            self._csv.writerow(
+                "" if value is None else str(value).lower() if isinstance(value, bool) else value
+                for value in row
+            )
+        else:
+            self._file.write(json.dumps(row._asdict(), ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_plan(path: Path) -> Iterator[PlanRow]:
+    """
+    계획 파일의 행을 순서대로 읽는다.
+
+    Raises
+    - OSError: 파일을 읽을 수 없는 경우
+    - PlanFileError: 형식이 맞지 않는 행(줄 번호 포함)
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if plan_format(path) == FORMAT_CSV:
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield _to_row(record, reader.line_num, blank_is_none=True)
+        else:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    raise PlanFileError(f"{path}:{line_no}: JSON 형식 오류: {e}") from e
+                yield _to_row(record, line_no, blank_is_none=False)
+
+
+def _to_row(record: dict, line_no: int, blank_is_none: bool) -> PlanRow:
+    def value(name: str):
+        v = record.get(name)
+        return None if blank_is_none and v == "" else v
+
+    def integer(name: str) -> Optional[int]:
+        v = value(name)
+        return None if v is None else int(v)
+
+    try:
+        src = value("src")
+        action = value("action")
+        if not src or not action:
+            raise ValueError("src/action이 없습니다")
+        already = value("already_exists")
+        if isinstance(already, str):
+            already = already.strip().lower() in ("true", "1", "yes")
+        return PlanRow(
+            src=_relative(src),
+            size=integer("size"),
+            mtime_ns=integer("mtime_ns"),
+            action=str(action),
+            dst=_relative(value("dst")) if value("dst") else None,
+            final_dst=_relative(value("final_dst")) if value("final_dst") else None,
+            already_exists=bool(already),
+            reason=value("reason"),
+        )
+    except (ValueError, TypeError, AttributeError) as e:
+        raise PlanFileError(f"{line_no}번째 행을 읽을 수 없습니다: {e}") from e
+
+
+def _relative(path: str) -> str:
+    """
+    Raises
+    - ValueError: 절대 경로이거나 '..'로 루트 밖을 가리키는 경우
+    """
+    pure = PurePosixPath(path.replace("\\", "/"))
+    if pure.is_absolute() or ".." in pure.parts or (pure.parts and ":" in pure.parts[0]):
+        raise ValueError(f"루트 기준 상대 경로가 아닙니다: {path}")
+    return pure.as_posix()
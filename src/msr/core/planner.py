@@ -7,11 +7,14 @@ for each file based on its metadata and filename patterns.
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 from datetime import datetime
 
 from msr.core.metadata import MetaRecord
-from msr.core.patterns import is_img_pattern, is_pass_pattern, get_img_id
+from msr.core.patterns import NAME_PATTERN, is_img_pattern, is_pass_pattern, get_img_id
+
+# 평년 기준 월별 일수(2월 29일은 윤년만, generate_plans의 날짜 검증)
+_DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
 
 
 class Action(Enum):
@@ -21,10 +24,11 @@ class Action(Enum):
     SKIP = "SKIP"                # Skip processing
 
 
-@dataclass
+@dataclass(slots=True)
 class Plan:
     """
     Represents the processing plan for a single media file.
+    실행 전체의 계획을 메모리에 두므로 __slots__를 쓴다(같은 날짜의 dst_dir는 generate_plans가 공유).
     """
     action: Action
     src_path: Path
@@ -80,3 +84,128 @@ def generate_plan(src_path: Path, meta_record: MetaRecord) -> Plan:
     dst_name = f"{datetime_str_for_filename}_{img_id}_{normalized_camera}{suffix}"
     dst_dir = Path(date_str_for_folder)  # date_str_for_folder는 이 시점에서 항상 존재
     return Plan(Action.COPY_RENAME, src_path, dst_dir, dst_name)
+
+
+def _parse_datetime(value: str) -> tuple[Optional[str], Optional[str]]:
+    """
+    generate_plan과 같은 규칙으로 (폴더용 'YYYY-MM-DD', 파일명용 'YYYY-MM-DD_HH-MM-SS')를 만든다.
+    파싱할 수 없으면 (None, None).
+    """
+    try:
+        dt_str_clean = value.split('.')[0].split('+')[0].strip()
+        dt_obj = datetime.strptime(dt_str_clean, "%Y:%m:%d %H:%M:%S")
+    except ValueError:
+        return None, None
+    return dt_obj.strftime("%Y-%m-%d"), dt_obj.strftime("%Y-%m-%d_%H-%M-%S")
+
+
+_FALLBACK = object()
+
+
+def _parse_date_key(key: str) -> "Optional[str] | object":
+    """'YYYY:MM:DD' -> 'YYYY-MM-DD'. 없는 날짜면 None, 고정 형식이 아니면 _FALLBACK."""
+    y, mo, d = key[0:4], key[5:7], key[8:10]
+    digits = y + mo + d
+    if key[4] != ":" or key[7] != ":" or not (digits.isascii() and digits.isdigit()) or y[0] == "0":
+        return _FALLBACK  # 1000년 이전(strftime의 %Y 자릿수가 플랫폼마다 다름) 등은 strptime으로
+    year, month, day = int(y), int(mo), int(d)
+    # strptime/datetime이 거부하는 날짜는 촬영일 없음으로 본다(PRD FR-03-3).
+    if not 1 <= month <= 12 or not 1 <= day <= _DAYS_IN_MONTH[month]:
+        return None
+    if month == 2 and day == 29 and not (year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)):
+        return None
+    return f"{y}-{mo}-{d}"
+
+
+def _parse_datetime_fast(
+    value: str, dates: dict[str, "Optional[str] | object"]
+) -> tuple[Optional[str], Optional[str]]:
+    """
+    ExifTool의 고정 형식 'YYYY:MM:DD HH:MM:SS'(뒤에 .ms 또는 +TZ 가능)을 잘라서 읽는다(strptime 없음).
+    그 밖의 형식(한 자리 숫자, 앞뒤 공백 등)은 _parse_datetime으로 넘겨 결과를 같게 한다.
+    dates: 날짜 부분('YYYY:MM:DD')의 검증 결과 캐시(같은 날 찍은 파일이 많다)
+    """
+    n = len(value)
+    if n != 19 and (n < 19 or value[19] not in ".+"):
+        return _parse_datetime(value)
+    key = value[:10]
+    date_str = dates.get(key, _FALLBACK)
+    if date_str is _FALLBACK:
+        date_str = dates[key] = _parse_date_key(key)
+        if date_str is _FALLBACK:
+            return _parse_datetime(value)
+    h, mi, se = value[11:13], value[14:16], value[17:19]
+    digits = h + mi + se
+    if (
+        value[10] != " " or value[13] != ":" or value[16] != ":"
+        or not (digits.isascii() and digits.isdigit())
+    ):
+        return _parse_datetime(value)
+    if date_str is None or h > "23" or mi > "59" or se > "59":
+        return None, None
+    return date_str, f"{date_str}_{h}-{mi}-{se}"  # type: ignore[return-value]
+
+
+def generate_plans(records: Iterable[tuple[Path, MetaRecord]]) -> list[Plan]:
+    """
+    (원본 경로, 메타데이터) 여러 건의 계획을 한 번에 만든다. 결과는 건마다 generate_plan과 같다.
+    - 촬영일은 고정 형식을 잘라서 읽는다(strptime/strftime 없음). 날짜 검증은 날짜별로 한 번만 한다.
+    - 파일명은 PASS/IMG 패턴을 한 번의 정규식 매칭으로 판별하고 IMG 식별번호도 그 결과에서 얻는다.
+    - 같은 날짜 폴더 Path는 한 번만 만든다.
+    """
+    plans: list[Plan] = []
+    append = plans.append
+    match_name = NAME_PATTERN.match
+    dates: dict[str, Optional[str] | object] = {}
+    dirs: dict[str, Path] = {}
+    for src_path, meta_record in records:
+        name = src_path.name
+        dot = name.rfind(".")
+        if 0 < dot < len(name) - 1:
+            filename_stem, suffix = name[:dot], name[dot:].lower()
+        else:
+            # 확장자가 없거나 점으로 끝나는 이름은 Path 규칙(파이썬 버전마다 다름)을 그대로 쓴다.
+            filename_stem, suffix = src_path.stem, src_path.suffix.lower()
+
+        date_str_for_folder: Optional[str] = None
+        datetime_str_for_filename: Optional[str] = None
+        if meta_record.datetime_original:
+            date_str_for_folder, datetime_str_for_filename = _parse_datetime_fast(
+                meta_record.datetime_original, dates
+            )
+
+        match = match_name(filename_stem)
+        kind = match.lastgroup if match else None
+
+        # Policy 1: PASS 패턴 파일 (CRG 4.5)
+        if kind == "pass":
+            if date_str_for_folder:
+                dst_dir = dirs.get(date_str_for_folder)
+                if dst_dir is None:
+                    dst_dir = dirs[date_str_for_folder] = Path(date_str_for_folder)
+                append(Plan(Action.COPY_PASS, src_path, dst_dir, f"{filename_stem}{suffix}"))
+            else:
+                append(Plan(Action.SKIP, src_path, reason="촬영일 없음 (PASS 패턴 파일)"))
+            continue
+
+        # Policy 2: 촬영일 없음 (CRG 4.5)
+        if not datetime_str_for_filename:
+            append(Plan(Action.SKIP, src_path, reason="촬영일 없음"))
+            continue
+
+        # Policy 3: IMG 패턴 아님 (CRG 4.5)
+        if kind != "img_id":
+            append(Plan(Action.SKIP, src_path, reason="IMG 패턴 아님"))
+            continue
+
+        # Policy 4: 촬영일 있음 + IMG 패턴 (COPY_RENAME) (CRG 4.5)
+        assert match is not None and date_str_for_folder is not None
+        dst_dir = dirs.get(date_str_for_folder)
+        if dst_dir is None:
+            dst_dir = dirs[date_str_for_folder] = Path(date_str_for_folder)
+        dst_name = (
+            f"{datetime_str_for_filename}_{match.group('img_id')}_"
+            f"{meta_record.normalized_camera}{suffix}"
+        )
+        append(Plan(Action.COPY_RENAME, src_path, dst_dir, dst_name))
+    return plans
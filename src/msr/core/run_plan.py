@@ -0,0 +1,106 @@
+"""
+msr.core.run_plan
+
+실행 전체의 복사 목록. 모든 계획(Plan)을 먼저 만든 뒤 대상 이름 충돌을 메모리에서 한 번에 정한다.
+
+- CRG 4.7: 충돌 및 재실행 정책. 충돌 번호(96721, 96722, ...)는 소스 정렬 순서대로, 실행 시작 시점의
+  결과 폴더 색인(msr.core.dest_index)과 앞서 배정한 이름만 보고 정한다. 복사 진행 상황(어느 파일이
+  먼저 디스크에 쓰였는지)과 무관하다(NFR-03 결정성).
+- 결과는 바뀌지 않는 CopyTask 목록이다. 대상 이름이 모두 다르고, 같은 파일이 이미 있거나 이 실행에서
+  중복된 원본은 복사하지 않으므로, 복사 워커는 서로 조율 없이 아무 순서로나 실행할 수 있다.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Mapping, Optional, TypeVar
+
+from msr.core.collision import resolve_collision
+from msr.core.dest_index import DestinationIndex
+from msr.core.planner import Action, Plan
+from msr.core.scanner import FileStat
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class CopyTask:
+    """파일 1개의 계획과 확정된 결과 경로. 오류가 있으면 error에 담는다."""
+    src_path: Path
+    plan: Optional[Plan] = None
+    dst_path: Optional[Path] = None  # 계획된 결과 경로
+    final_dst_path: Optional[Path] = None  # 충돌 해결 후 결과 경로
+    already_exists: bool = False  # 같은 파일이 결과 폴더(또는 이 실행의 앞 항목)에 있음
+    error: Optional[str] = None
+    error_traceback: Optional[str] = None
+
+    @property
+    def needs_destination(self) -> bool:
+        return self.error is None and self.plan is not None and self.plan.action != Action.SKIP
+
+    @property
+    def needs_transfer(self) -> bool:
+        return (
+            self.needs_destination and self.final_dst_path is not None and not self.already_exists
+        )
+
+
+class DestinationAssigner:
+    """대상 이름을 호출 순서대로 배정한다. 배정한 이름은 실행이 끝날 때까지 해제하지 않는다."""
+
+    def __init__(self, index: DestinationIndex, checksums: Optional[Mapping[Path, str]] = None):
+        self.index = index
+        self.checksums = checksums
+        # 배정한 결과 경로 -> 그 원본의 stat (같은 실행 안의 중복 원본 판정용)
+        self._claimed: dict[Path, Optional[FileStat]] = {}
+
+    def __len__(self) -> int:
+        return len(self._claimed)
+
+    def assign(
+        self, src_path: Path, dst_path: Path, src_stat: Optional[FileStat] = None
+    ) -> tuple[Path, bool]:
+        """
+        (최종 결과 경로, 같은 파일이 이미 있는지)를 돌려준다.
+
+        Raises
+        - OSError: 결과 폴더를 읽을 수 없는 경우
+        """
+        final = resolve_collision(
+            src_path, dst_path, src_stat=src_stat, pending=self._claimed,
+            checksums=self.checksums, index=self.index,
+        )
+        if final in self._claimed:
+            return final, True  # 이 실행의 앞 항목과 같은 파일
+        self._claimed[final] = src_stat
+        # resolve_collision은 같은 파일일 때만 이미 있는 경로를 돌려준다.
+        return final, self.index.exists(final)
+
+
+def assign_destinations(
+    items: Iterable[T],
+    assigner: DestinationAssigner,
+    file_stats: Optional[Mapping[Path, FileStat]] = None,
+) -> tuple[T, ...]:
+    """
+    CopyTask마다 최종 결과 경로를 정해 고정된 목록으로 돌려준다. CopyTask가 아닌 항목(배치 실패 등)과
+    대상이 필요 없는 항목(스킵, 오류)은 그대로 둔다. 배정 중 오류는 그 항목의 오류로 담는다.
+    """
+    resolved: list[T] = []
+    for item in items:
+        if isinstance(item, CopyTask) and item.needs_destination:
+            assert item.dst_path is not None
+            try:
+                final, exists = assigner.assign(
+                    item.src_path, item.dst_path, (file_stats or {}).get(item.src_path)
+                )
+                item = dataclasses.replace(item, final_dst_path=final, already_exists=exists)
+            except Exception as e:
+                item = dataclasses.replace(
+                    item, error=str(e), error_traceback=traceback.format_exc()
+                )
+        resolved.append(item)
+    return tuple(resolved)
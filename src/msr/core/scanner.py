@@ -0,0 +1,96 @@
+"""
+msr.core.scanner
+
+os.scandir 기반 스트리밍 파일 수집기.
+
+- FR-01: 재귀 탐색, 'result' 폴더 제외, 정렬
+- DTL M1-01: 확장자 필터, 정렬
+- result/ 는 소스 루트 바로 아래에서 통째로 제외한다(하위 디렉터리를 열지 않음).
+- 확장자는 원시 파일명 문자열로 먼저 거르고, 대상 파일에 대해서만 Path를 만든다.
+- DirEntry의 stat 정보(크기, mtime_ns, inode)를 함께 내보내 이후 단계(캐시 키, 충돌 비교)에서
+  다시 stat하지 않게 한다.
+- 각 디렉터리의 항목을 이름순으로 정렬하여 깊이 우선으로 내보내므로,
+  전체 목록을 모으지 않아도 sorted(Path 목록)과 같은 순서가 된다(NFR-03 결정성).
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+
+class FileStat(NamedTuple):
+    """수집 시점의 파일 stat 요약. 메타데이터 캐시 키(size, mtime_ns, inode)와 같은 모양이다."""
+
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+def _sort_key(name: str) -> str:
+    # Path 비교 규칙과 맞춘다(Windows는 대소문자 무시).
+    return name.lower() if os.name == "nt" else name
+
+
+def has_media_extension(name: str, extensions: frozenset[str]) -> bool:
+    """
+    파일명이 대상 확장자(소문자, 점 포함)인지 확인한다.
+    Path.suffix와 같은 규칙: ".jpg" 같은 점 파일은 확장자가 없는 것으로 본다.
+    """
+    stem, _, ext = name.rpartition(".")
+    return bool(stem) and "." + ext.lower() in extensions
+
+
+def _entry_stat(entry: os.DirEntry) -> Optional[FileStat]:
+    try:
+        st = entry.stat()
+        return FileStat(st.st_size, st.st_mtime_ns, entry.inode())
+    except OSError:
+        return None
+
+
+def iter_media_files(
+    root: Path,
+    extensions: Iterable[str],
+    exclude_dir_name: Optional[str] = "result",
+) -> Iterator[tuple[Path, Optional[FileStat]]]:
+    """
+    root 아래의 대상 파일을 (경로, FileStat) 로 정렬 순서대로 내보낸다.
+
+    - extensions: 소문자, 점 포함 확장자 집합(예: ".jpg")
+    - exclude_dir_name: root 바로 아래에서 제외할 디렉터리 이름
+    - 디렉터리 심볼릭 링크는 따라가지 않는다(os.walk 기본 동작과 동일).
+    - 읽을 수 없는 디렉터리는 건너뛰고, stat 실패 파일은 FileStat None으로 내보낸다.
+    """
+    exts = frozenset(e.lower() for e in extensions)
+    stack: list[Iterator[os.DirEntry]] = []
+
+    def open_dir(path: str, is_root: bool) -> None:
+        try:
+            with os.scandir(path) as it:
+                entries = [
+                    e for e in it if not (is_root and e.name == exclude_dir_name and e.is_dir())
+                ]
+        except OSError:
+            return
+        entries.sort(key=lambda e: _sort_key(e.name))
+        stack.append(iter(entries))
+
+    open_dir(os.fspath(root), True)
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            continue
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            continue
+        if is_dir:
+            if not entry.is_symlink():
+                open_dir(entry.path, False)
+            continue
+        if not has_media_extension(entry.name, exts):
+            continue
+        yield Path(entry.path), _entry_stat(entry)
@@ -4,8 +4,12 @@ This module defines the Summary functionality for aggregating processing results
 - PRD FR-08-3: 처리 요약(종료 시)
 - DTL M2-04: 성능 계측
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import time
+from typing import Optional
+
+# 요약에 이름을 보여 줄 미등록 카메라 수(파일 수가 많은 순)
+UNKNOWN_CAMERAS_LISTED = 5
 
 @dataclass
 class Summary:
@@ -21,6 +25,37 @@ class Summary:
     skipped_already_exists: int = 0
     errors: int = 0
 
+    # 증분 모드에서 처리 목록(manifest)상 변경 없어 건너뛴 파일 수 (msr.core.manifest)
+    skipped_unchanged: int = 0
+    # 중단된 실행을 재개할 때 체크포인트 저널상 이미 완료되어 건너뛴 파일 수 (msr.core.journal)
+    skipped_resumed: int = 0
+
+    # CRG 4.4: 규칙 표에 없어 UNKNOWN이 된 카메라의 "Make Model" -> 파일 수 (msr.core.camera_rules)
+    unknown_cameras: dict[str, int] = field(default_factory=dict)
+
+    # 메타데이터 캐시 적중/미적중 (msr.core.metadata_cache)
+    metadata_cache_hits: int = 0
+    metadata_cache_misses: int = 0
+
+    # CRG 6.1: 적응형 chunker가 고른 배치 크기(제출 순서) (msr.core.chunking)
+    chunk_sizes: list[int] = field(default_factory=list)
+
+    # DTL M2-03: 실패 배치 분할(이분 탐색) 재시도에 쓴 ExifTool 호출 수/시간(초)
+    exiftool_retry_calls: int = 0
+    exiftool_retry_seconds: float = 0.0
+    # 시간 예산을 넘겨 ExifTool을 멈추게 한 것으로 격리된 파일 수
+    exiftool_quarantined: int = 0
+    # CRG 6.2: fast 조회에서 촬영일을 못 찾아 전체 태그로 다시 조회한 파일 수
+    exiftool_fast_requeried: int = 0
+
+    # CRG 7: 복사 방식별 파일 수와 복사한 총 바이트/소요 초 (msr.core.copy_engine)
+    copy_methods: dict[str, int] = field(default_factory=dict)
+    copy_bytes: int = 0
+    copy_seconds: float = 0.0
+    # 복사 중 해시를 계산해 체크섬 목록에 기록한 파일 수, 복사본 재확인 여부 (msr.core.checksums)
+    checksum_files: int = 0
+    checksum_verified: bool = False
+
     # DTL M2-04: 성능 계측용 필드
     start_time: float = 0.0
     end_time: float = 0.0
@@ -54,13 +89,69 @@ class Summary:
     def increment_skipped_already_exists(self):
         self.skipped_already_exists += 1
 
+    def increment_skipped_unchanged(self):
+        self.skipped_unchanged += 1
+
+    def increment_skipped_resumed(self):
+        self.skipped_resumed += 1
+
     def increment_errors(self):
         self.errors += 1
 
+    def record_unknown_camera(self, make: Optional[str], model: Optional[str]):
+        key = f"{(make or '').strip()} {(model or '').strip()}".strip()
+        self.unknown_cameras[key] = self.unknown_cameras.get(key, 0) + 1
+
     def __str__(self):
         """
         Generates a formatted summary string for display.
         """
+        unchanged_line = ""
+        if self.skipped_unchanged:
+            unchanged_line = f"스킵 (변경 없음): {self.skipped_unchanged}\n"
+        if self.skipped_resumed:
+            unchanged_line += f"스킵 (이전 실행 완료): {self.skipped_resumed}\n"
+        camera_line = ""
+        if self.unknown_cameras:
+            top = sorted(self.unknown_cameras.items(), key=lambda kv: (-kv[1], kv[0]))
+            listed = ", ".join(f"{name} {count}" for name, count in top[:UNKNOWN_CAMERAS_LISTED])
+            if len(top) > UNKNOWN_CAMERAS_LISTED:
+                listed += f", 외 {len(top) - UNKNOWN_CAMERAS_LISTED}종"
+            camera_line = (
+                f"미등록 카메라: {sum(self.unknown_cameras.values())}개 파일 "
+                f"({len(top)}종: {listed})\n"
+            )
+        cache_line = ""
+        if self.metadata_cache_hits or self.metadata_cache_misses:
+            cache_line = (
+                f"메타데이터 캐시: 적중 {self.metadata_cache_hits} / "
+                f"미적중 {self.metadata_cache_misses}\n"
+            )
+        chunk_line = ""
+        if self.chunk_sizes:
+            chunk_line = (
+                f"배치 크기: {len(self.chunk_sizes)}개 배치 "
+                f"(최소 {min(self.chunk_sizes)} / 최대 {max(self.chunk_sizes)} / "
+                f"평균 {sum(self.chunk_sizes) / len(self.chunk_sizes):.1f})\n"
+            )
+        retry_line = ""
+        if self.exiftool_retry_calls:
+            retry_line = (
+                f"ExifTool 재시도: {self.exiftool_retry_calls}회 호출 / "
+                f"{self.exiftool_retry_seconds:.2f}초\n"
+            )
+        if self.exiftool_quarantined:
+            retry_line += f"ExifTool 시간 초과 격리: {self.exiftool_quarantined}개\n"
+        if self.exiftool_fast_requeried:
+            retry_line += f"ExifTool fast 재조회: {self.exiftool_fast_requeried}개\n"
+        copy_line = ""
+        if self.copy_methods:
+            methods = " / ".join(f"{m} {n}" for m, n in sorted(self.copy_methods.items()))
+            speed = self.copy_bytes / self.copy_seconds / 1e6 if self.copy_seconds > 0 else 0.0
+            copy_line = f"복사 방식: {methods} (평균 {speed:.1f} MB/s)\n"
+        if self.checksum_files:
+            verified = "복사본 재확인" if self.checksum_verified else "재확인 안 함"
+            copy_line += f"체크섬 기록: {self.checksum_files}개 ({verified})\n"
         return (
             f"--- 처리 요약 ---\n"
             f"총 파일 수: {self.total_files}\n"
@@ -70,7 +161,13 @@ class Summary:
             f"스킵 (IMG 패턴 아님): {self.skipped_not_img_pattern}\n"
             f"충돌 해결: {self.collisions_resolved}\n"
             f"스킵 (이미 존재): {self.skipped_already_exists}\n"
+            f"{unchanged_line}"
             f"오류 발생: {self.errors}\n"
+            f"{camera_line}"
+            f"{cache_line}"
+            f"{chunk_line}"
+            f"{retry_line}"
+            f"{copy_line}"
             f"소요 시간: {self.duration:.2f}초\n"
             f"처리 속도: {self.throughput:.2f} 파일/초\n"
             f"-----------------"
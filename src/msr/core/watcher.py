@@ -0,0 +1,269 @@
+"""
+msr.core.watcher
+
+감시 모드(드롭 폴더)용 파일 변경 감지기와 "쓰기 완료" 판정.
+
+- Linux에서는 inotify(ctypes, 외부 의존성 없음)로 소스 루트 아래 새/변경 파일을 감지한다.
+  inotify를 쓸 수 없으면(다른 OS, 감시 개수 한도 초과 등) 주기적 재수집(polling)으로 대신한다.
+- 두 감지기 모두 poll(timeout)으로 "바뀌었을 수 있는" 대상 파일 경로를 돌려준다.
+  실제로 처리할지는 SettleTracker와 처리 목록(manifest)이 정한다.
+- result/ 는 소스 루트 바로 아래에서 제외한다(결과 복사본을 다시 감지하지 않도록).
+- SettleTracker: 크기/mtime이 settle_seconds 동안 바뀌지 않은 파일만 "준비됨"으로 내보낸다.
+  휴대폰/카드 리더가 아직 쓰는 중인 파일을 읽지 않기 위함이다.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Optional, Protocol
+
+from msr.core.scanner import has_media_extension, iter_media_files
+
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_SETTLE_SECONDS = 2.0
+
+# inotify 상수 (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_CREATE | IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+_READ_SIZE = 64 * 1024
+
+
+class FolderWatcher(Protocol):
+    """새로 생기거나 바뀐 대상 파일을 알려주는 감지기."""
+
+    def poll(self, timeout: float) -> set[Path]:
+        """최대 timeout초 기다렸다가, 그동안 바뀌었을 수 있는 대상 파일 경로를 돌려준다."""
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class PollingWatcher:
+    """주기적으로 소스를 다시 수집하여 (크기, mtime) 스냅샷을 비교하는 감지기."""
+
+    def __init__(
+        self,
+        root: Path,
+        extensions: Iterable[str],
+        exclude_dir_name: Optional[str] = "result",
+        interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        self.root = root
+        self.extensions = frozenset(e.lower() for e in extensions)
+        self.exclude_dir_name = exclude_dir_name
+        self.interval = interval
+        # 시작 시점의 파일은 감시 전 처리(초기 수집)의 몫이므로 스냅샷에만 넣는다.
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        return {
+            path: (stat.size, stat.mtime_ns) if stat is not None else (-1, -1)
+            for path, stat in iter_media_files(self.root, self.extensions, self.exclude_dir_name)
+        }
+
+    def poll(self, timeout: float) -> set[Path]:
+        wait = self._next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(max(0.0, timeout))
+            return set()
+        if wait > 0:
+            time.sleep(wait)
+        self._next_scan = time.monotonic() + self.interval
+        current = self._scan()
+        changed = {p for p, key in current.items() if self._snapshot.get(p) != key}
+        self._snapshot = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """
+    inotify 기반 감지기(Linux 전용). 하위 디렉터리마다 감시를 추가한다.
+
+    Raises
+    - OSError: inotify를 쓸 수 없는 경우(생성 시점)
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        extensions: Iterable[str],
+        exclude_dir_name: Optional[str] = "result",
+    ):
+        self.root = root
+        self.extensions = frozenset(e.lower() for e in extensions)
+        self.exclude_dir_name = exclude_dir_name
+        self._libc = _load_libc()
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 실패: {os.strerror(err)}")
+        self._fd = fd
+        self._dirs: dict[int, Path] = {}
+        try:
+            self._add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, path: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_add_watch 실패: {path}: {os.strerror(err)}")
+        self._dirs[wd] = path
+
+    def _is_excluded(self, path: Path) -> bool:
+        return path.parent == self.root and path.name == self.exclude_dir_name
+
+    def _add_tree(self, top: Path) -> set[Path]:
+        """top과 하위 디렉터리에 감시를 추가하고, 이미 들어 있는 대상 파일을 돌려준다."""
+        found: set[Path] = set()
+        for dirpath, dirnames, filenames in os.walk(top):
+            current = Path(dirpath)
+            dirnames[:] = sorted(d for d in dirnames if not self._is_excluded(current / d))
+            self._add_watch(current)
+            found.update(
+                current / name for name in filenames if has_media_extension(name, self.extensions)
+            )
+        return found
+
+    def poll(self, timeout: float) -> set[Path]:
+        readable, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        if not readable:
+            return set()
+        changed: set[Path] = set()
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            changed |= self._parse(data)
+        return changed
+
+    def _parse(self, data: bytes) -> set[Path]:
+        changed: set[Path] = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset : offset + length].split(b"\0", 1)[0]
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # 이벤트가 유실되었으므로 전체를 다시 본다(처리 목록이 중복 처리를 막는다).
+                changed.update(
+                    p for p, _ in iter_media_files(self.root, self.extensions, self.exclude_dir_name)
+                )
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            parent = self._dirs.get(wd)
+            if parent is None or not raw_name:
+                continue
+            path = parent / os.fsdecode(raw_name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and not self._is_excluded(path):
+                    # 감시를 붙이기 전에 생긴 파일도 놓치지 않도록 내용을 함께 돌려준다.
+                    try:
+                        changed |= self._add_tree(path)
+                    except OSError:
+                        pass
+                continue
+            if has_media_extension(path.name, self.extensions):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._dirs.clear()
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        raise OSError("inotify는 Linux에서만 사용할 수 있습니다.")
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError("libc에 inotify가 없습니다.")
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+def create_watcher(
+    root: Path,
+    extensions: Iterable[str],
+    exclude_dir_name: Optional[str] = "result",
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    use_inotify: bool = True,
+) -> FolderWatcher:
+    """가능하면 InotifyWatcher를, 아니면 PollingWatcher를 만든다."""
+    if use_inotify:
+        try:
+            return InotifyWatcher(root, extensions, exclude_dir_name)
+        except OSError:
+            pass
+    return PollingWatcher(root, extensions, exclude_dir_name, poll_interval)
+
+
+class SettleTracker:
+    """쓰기가 끝난(크기/mtime이 settle_seconds 동안 그대로인) 파일을 골라낸다."""
+
+    def __init__(self, settle_seconds: float = DEFAULT_SETTLE_SECONDS):
+        self.settle_seconds = settle_seconds
+        # 경로 -> ((크기, mtime_ns), 마지막으로 바뀐 것을 본 시각)
+        self._pending: dict[Path, tuple[tuple[int, int], float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, paths: Iterable[Path], now: Optional[float] = None) -> None:
+        """감지된 경로를 추적한다. 이미 추적 중이면 다음 ready()에서 stat으로 변화를 본다."""
+        now = time.monotonic() if now is None else now
+        for path in paths:
+            if path not in self._pending:
+                self._pending[path] = ((-1, -1), now)
+
+    def ready(self, now: Optional[float] = None) -> list[Path]:
+        """쓰기가 끝난 파일을 정렬 순서로 돌려주고 추적에서 뺀다. 사라진 파일은 버린다."""
+        now = time.monotonic() if now is None else now
+        done: list[Path] = []
+        for path, (key, changed_at) in list(self._pending.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            current = (st.st_size, st.st_mtime_ns)
+            if current != key:
+                self._pending[path] = (current, now)
+            elif now - changed_at >= self.settle_seconds:
+                del self._pending[path]
+                done.append(path)
+        done.sort()
+        return done
@@ -3,6 +3,14 @@ from tkinter import ttk, filedialog
 import os
 from pathlib import Path
 
+from msr.core.copier import OUTPUT_COPY, OUTPUT_HARDLINK, OUTPUT_MOVE
+
+OUTPUT_MODE_LABELS = {
+    OUTPUT_COPY: "복사",
+    OUTPUT_HARDLINK: "하드링크",
+    OUTPUT_MOVE: "이동 (원본 옮김)",
+}
+
 class MainWindow(ttk.Frame):
     """
     Main UI Frame containing all widgets.
@@ -12,6 +20,9 @@ class MainWindow(ttk.Frame):
         super().__init__(master, padding="10")
         self.master = master
         self.source_dir = tk.StringVar()
+        self.incremental = tk.BooleanVar(value=False)
+        self.verify = tk.BooleanVar(value=False)
+        self.output_mode = tk.StringVar(value=OUTPUT_MODE_LABELS[OUTPUT_COPY])
         
         self._create_widgets()
 
@@ -33,6 +44,23 @@ class MainWindow(ttk.Frame):
         self.open_result_btn = ttk.Button(control_frame, text="결과 폴더 열기", command=self._open_result_folder, state="disabled")
         self.open_result_btn.pack(side="left", padx=5)
 
+        ttk.Checkbutton(
+            control_frame, text="증분 모드 (변경된 파일만 처리)", variable=self.incremental
+        ).pack(side="left", padx=5)
+
+        ttk.Checkbutton(
+            control_frame, text="체크섬 기록/검증", variable=self.verify
+        ).pack(side="left", padx=5)
+
+        ttk.Label(control_frame, text="출력 방식:").pack(side="left", padx=(10, 2))
+        ttk.Combobox(
+            control_frame,
+            textvariable=self.output_mode,
+            values=list(OUTPUT_MODE_LABELS.values()),
+            state="readonly",
+            width=14,
+        ).pack(side="left")
+
         # 3. Progress Area
         progress_frame = ttk.LabelFrame(self, text="진행률", padding="5")
         progress_frame.pack(fill="x", pady=10)
@@ -66,7 +94,13 @@ class MainWindow(ttk.Frame):
             self.set_start_button_state(False)
             self.open_result_btn.configure(state="disabled")
             self.clear_logs()
-            self.master.start_processing(path)
+            labels = {label: mode for mode, label in OUTPUT_MODE_LABELS.items()}
+            self.master.start_processing(
+                path,
+                incremental=self.incremental.get(),
+                output_mode=labels[self.output_mode.get()],
+                verify=self.verify.get(),
+            )
 
     def _open_result_folder(self):
         """Opens the [SourceRoot]/result folder in Windows Explorer."""
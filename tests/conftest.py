@@ -0,0 +1,91 @@
+import pytest
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from queue import Queue
+from typing import Iterator, Mapping, Optional
+from unittest.mock import patch
+
+from msr.core.file_processor import FileProcessor
+from msr.core.metadata import MetaRecord
+
+
+@dataclass
+class FakeExtraction:
+    """
+    extract_metadata_batch 대역. metadata(원본 경로 -> MetaRecord)에 있는 파일만 레코드를 돌려주고,
+    default가 있으면 나머지 파일에도 그 레코드를 돌려준다. metadata는 복사하지 않으므로 실행 사이에
+    바꿔도 된다. 받은 chunk는 chunks에 차례로 기록한다.
+    """
+
+    metadata: Mapping[Path, MetaRecord] = field(default_factory=dict)
+    default: Optional[MetaRecord] = None
+    chunks: list[list[Path]] = field(default_factory=list)
+
+    def __call__(self, chunk, session=None, report=None, **options):
+        self.chunks.append(list(chunk))
+        result = {}
+        for p in chunk:
+            meta = self.metadata.get(p, self.default)
+            if meta is not None:
+                result[p.resolve()] = meta
+        return result
+
+    @property
+    def extracted(self) -> list[Path]:
+        return [p for chunk in self.chunks for p in chunk]
+
+
+@dataclass
+class ProcessorRun:
+    processor: FileProcessor
+    events: list[dict]
+    extraction: FakeExtraction
+
+    @property
+    def summary(self):
+        return self.processor.summary
+
+
+@contextmanager
+def _patched_extraction(
+    metadata: Optional[Mapping[Path, MetaRecord]] = None,
+    default: Optional[MetaRecord] = None,
+) -> Iterator[FakeExtraction]:
+    fake = FakeExtraction({} if metadata is None else metadata, default)
+    with patch("msr.core.file_processor.extract_metadata_batch", side_effect=fake):
+        yield fake
+
+
+def _run_processor(
+    src_dir: Path,
+    metadata: Optional[Mapping[Path, MetaRecord]] = None,
+    *,
+    default: Optional[MetaRecord] = None,
+    **kwargs,
+) -> ProcessorRun:
+    event_queue: Queue = Queue()
+    kwargs.setdefault("use_metadata_cache", False)
+    processor = FileProcessor(str(src_dir), event_queue, **kwargs)
+    with _patched_extraction(metadata, default) as fake:
+        processor.process_files()
+    events = []
+    while not event_queue.empty():
+        events.append(event_queue.get())
+    return ProcessorRun(processor, events, fake)
+
+
+@pytest.fixture
+def patch_extraction():
+    """with patch_extraction(metadata, default) as fake: ExifTool 추출을 FakeExtraction으로 바꾼다."""
+    return _patched_extraction
+
+
+@pytest.fixture
+def run_processor():
+    """
+    run_processor(src_dir, metadata, default=None, **FileProcessor 인자): 추출을 FakeExtraction으로
+    바꿔 process_files를 실행하고, 처리기/이벤트/추출 기록을 ProcessorRun으로 돌려준다.
+    메타데이터 캐시는 따로 주지 않으면 끈다.
+    """
+    return _run_processor
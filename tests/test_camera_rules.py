@@ -0,0 +1,97 @@
+import json
+import pytest
+from queue import Queue
+from unittest.mock import patch
+
+from msr.core.camera_rules import CameraNormalizer, CameraRule, load_camera_rules
+from msr.core.file_processor import FileProcessor
+from msr.core.metadata import MetaRecord, normalize_camera_model, set_camera_rules
+
+
+@pytest.fixture(autouse=True)
+def default_rules():
+    yield
+    set_camera_rules(None)
+
+
+def test_first_matching_rule_wins():
+    normalizer = CameraNormalizer([
+        CameraRule("R7", "canon", ("eos r7",)),
+        CameraRule("CANON", "canon", ("eos",)),
+    ])
+    assert normalizer.normalize("Canon", "Canon EOS R7") == "R7"
+    assert normalizer.normalize("CANON INC.", "EOS R5") == "CANON"
+    assert normalizer.normalize("Nikon", "EOS R7") == "UNKNOWN"
+    assert normalizer.normalize("Canon\x00", "EOS R7\x00") == "R7"  # EXIF 끝의 NUL
+
+
+def test_results_are_memoized_per_pair():
+    normalizer = CameraNormalizer()
+    with patch.object(normalizer, "_match", wraps=normalizer._match) as match:
+        for _ in range(3):
+            assert normalizer.normalize("Canon", "EOS R7") == "EOSR7"
+            assert normalizer.normalize("Sony", "ILCE-7M3") == "UNKNOWN"
+    assert match.call_count == 2
+
+
+def test_load_camera_rules_from_file(tmp_path):
+    path = tmp_path / "cameras.json"
+    path.write_text(json.dumps({"rules": [
+        {"token": "A7M3", "make": "sony", "models": ["ilce-7m3"]},
+        {"token": "Z6", "make": "nikon", "models": "z 6"},
+    ]}), encoding="utf-8")
+    set_camera_rules(load_camera_rules(path))
+    assert normalize_camera_model("SONY", "ILCE-7M3") == "A7M3"
+    assert normalize_camera_model("NIKON CORPORATION", "NIKON Z 6") == "Z6"
+    assert normalize_camera_model("Canon", "EOS R7") == "UNKNOWN"
+
+
+@pytest.mark.parametrize("content, error", [
+    ('{"rules": [{"token": "X", "make": "sony"}]}', ValueError),
+    ('{"rules": [{"token": "X", "make": "", "models": ["a"]}]}', ValueError),
+    ("not json", ValueError),
+    ('{"cameras": []}', TypeError),
+    ('{"rules": ["EOSR7"]}', TypeError),
+    ('{"rules": [{"token": 7, "make": "canon", "models": ["eos r7"]}]}', TypeError),
+    ('{"rules": [{"token": "X", "make": "canon", "models": [1]}]}', TypeError),
+])
+def test_load_camera_rules_rejects_invalid_file(tmp_path, content, error):
+    path = tmp_path / "cameras.json"
+    path.write_text(content, encoding="utf-8")
+    with pytest.raises(error):
+        load_camera_rules(path)
+
+
+def test_unknown_cameras_are_counted_in_summary(tmp_path, run_processor):
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    metas = {
+        "IMG_0001.jpg": MetaRecord("2023:01:01 10:00:00", "Sony", "ILCE-7M3", "UNKNOWN"),
+        "IMG_0002.jpg": MetaRecord("2023:01:01 10:00:01", "Sony", "ILCE-7M3", "UNKNOWN"),
+        "IMG_0003.jpg": MetaRecord("2023:01:01 10:00:02", "Canon", "EOS R7", "EOSR7"),
+        "IMG_0004.jpg": MetaRecord("2023:01:01 10:00:03"),  # Make/Model 없음
+    }
+    for name in metas:
+        (src_dir / name).write_bytes(name.encode())
+
+    processor = run_processor(
+        src_dir, {src_dir / name: meta for name, meta in metas.items()}
+    ).processor
+
+    assert processor.summary.unknown_cameras == {"Sony ILCE-7M3": 2}
+    assert "미등록 카메라: 2개 파일 (1종: Sony ILCE-7M3 2)" in str(processor.summary)
+
+
+@pytest.mark.parametrize("content", [None, '{"rules": ["EOSR7"]}'])
+def test_invalid_rules_file_stops_run(tmp_path, content):
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    rules_path = tmp_path / "cameras.json"
+    if content is not None:
+        rules_path.write_text(content, encoding="utf-8")
+    events: Queue = Queue()
+    processor = FileProcessor(
+        str(src_dir), events, use_metadata_cache=False, camera_rules_path=str(rules_path),
+    )
+    processor.process_files()
+    assert events.get_nowait()["type"] == "ERROR"
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import pytest
+from unittest.mock import patch
+
+from msr.core.checksums import ChecksumWriter, load_checksum_index
+from msr.core.collision import is_same_file, resolve_collision
+from msr.core.copy_engine import ChecksumMismatchError, copy_with_engine
+from msr.core.metadata import MetaRecord
+
+
+def test_copy_computes_blake2b_while_copying(tmp_path):
+    src = tmp_path / "clip.mov"
+    data = os.urandom(9 * 1024 * 1024 + 3)  # 버퍼(8 MiB)보다 크게
+    src.write_bytes(data)
+    dst = tmp_path / "out.mov"
+
+    stats = copy_with_engine(src, dst, checksum=True)
+
+    assert stats.checksum == hashlib.blake2b(data).hexdigest()
+    assert stats.bytes_copied == len(data)
+    assert dst.read_bytes() == data
+
+
+def test_verify_removes_mismatching_copy(tmp_path):
+    src = tmp_path / "a.jpg"
+    src.write_bytes(b"abc")
+    dst = tmp_path / "b.jpg"
+
+    with patch("msr.core.copy_engine.file_checksum", return_value="0" * 128):
+        with pytest.raises(ChecksumMismatchError):
+            copy_with_engine(src, dst, verify=True)
+    assert not dst.exists()
+
+
+def test_checksum_manifest_round_trip(tmp_path):
+    result = tmp_path / "result"
+    (result / "2023-01-01").mkdir(parents=True)
+    dst = result / "2023-01-01" / "a b.jpg"
+    with ChecksumWriter(result, started=0) as writer:
+        writer.add(dst, "ab" * 64)
+    assert writer.path.name.startswith("checksums-") and writer.path.suffix == ".b2sum"
+    assert writer.path.read_text(encoding="utf-8") == f"{'ab' * 64}  2023-01-01/a b.jpg\n"
+
+    later = result / "checksums-99991231-000000.b2sum"
+    later.write_text(f"{'cd' * 64}  2023-01-01/a b.jpg\nbroken line\n", encoding="utf-8")
+    assert load_checksum_index(result) == {dst: "cd" * 64}  # 나중 실행이 우선
+
+
+def test_is_same_file_compares_hash_when_only_mtime_differs(tmp_path):
+    src = tmp_path / "IMG_0001.jpg"
+    src.write_bytes(b"same content")
+    dst = tmp_path / "result" / "2023-01-01_10-00-00_0001_EOSR7.jpg"
+    dst.parent.mkdir()
+    dst.write_bytes(b"same content")
+    os.utime(dst, (1_000_000, 1_000_000))
+
+    assert not is_same_file(src, dst)
+    index = {dst: hashlib.blake2b(b"same content").hexdigest()}
+    assert is_same_file(src, dst, checksums=index)
+    assert resolve_collision(src, dst, checksums=index) == dst
+
+    # 크기가 같아도 내용이 다르면 다른 파일이다.
+    index[dst] = hashlib.blake2b(b"other conten").hexdigest()
+    assert not is_same_file(src, dst, checksums=index)
+
+
+def test_processor_writes_checksum_manifest_in_source_order(tmp_path, run_processor):
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    meta = MetaRecord(datetime_original="2023:01:01 10:00:00", normalized_camera="EOSR7")
+    files = []
+    for i in range(5):
+        f = src_dir / f"IMG_{i:04d}.jpg"
+        f.write_bytes(os.urandom(1000 + i))
+        files.append(f)
+
+    processor = run_processor(src_dir, default=meta, verify=True, copy_workers=3).processor
+
+    result = src_dir / "result"
+    manifests = list(result.glob("checksums-*.b2sum"))
+    assert len(manifests) == 1
+    expected = [
+        f"{hashlib.blake2b(f.read_bytes()).hexdigest()}  2023-01-01/2023-01-01_10-00-00_{i:04d}_EOSR7.jpg"
+        for i, f in enumerate(files)
+    ]
+    assert manifests[0].read_text(encoding="utf-8").splitlines() == expected
+    assert processor.summary.checksum_files == 5
+    assert "체크섬 기록: 5개 (복사본 재확인)" in str(processor.summary)
@@ -0,0 +1,95 @@
+import pytest
+from pathlib import Path
+
+from msr.core.chunking import AdaptiveChunker
+from msr.core.metadata import MetaRecord
+
+
+def make_files(tmp_path: Path, count: int, size: int = 10, prefix: str = "IMG_") -> list[Path]:
+    files = []
+    for i in range(count):
+        path = tmp_path / f"{prefix}{i:04d}.jpg"
+        path.write_bytes(b"\0" * size)
+        files.append(path)
+    return files
+
+
+def test_chunker_covers_all_files_in_order(tmp_path):
+    files = make_files(tmp_path, 25)
+    chunker = AdaptiveChunker(files, min_size=1, max_size=10, initial_size=7)
+
+    chunks = list(chunker)
+
+    assert [p for c in chunks for p in c] == files
+    assert chunker.chunk_sizes == [7, 7, 7, 4]
+
+
+def test_chunker_grows_for_fast_small_files(tmp_path):
+    files = make_files(tmp_path, 500)
+    chunker = AdaptiveChunker(files, min_size=5, max_size=200, target_seconds=1.0, initial_size=10)
+    it = iter(chunker)
+
+    first = next(it)
+    chunker.record(len(first), 100, 0.01)  # 1ms/파일
+    second = next(it)
+
+    assert len(first) == 10
+    assert len(second) == 200  # max_size로 제한
+
+
+def test_chunker_shrinks_for_slow_files(tmp_path):
+    files = make_files(tmp_path, 100)
+    chunker = AdaptiveChunker(files, min_size=2, max_size=50, target_seconds=1.0, initial_size=20)
+    it = iter(chunker)
+
+    first = next(it)
+    chunker.record(len(first), 0, 10.0)  # 0.5초/파일
+    assert len(next(it)) == 2
+
+    chunker.record(2, 0, 100.0)  # 매우 느려져도 min_size 이하로는 줄지 않음
+    assert len(next(it)) == 2
+
+
+def test_chunker_limits_by_bytes_when_files_get_larger(tmp_path):
+    """
+    작은 파일로 측정한 뒤 큰 파일 구간에 들어서면 초당 바이트 기준으로 chunk를 줄여야 합니다.
+    """
+    small = make_files(tmp_path, 10, size=10, prefix="A_")
+    large = make_files(tmp_path, 50, size=10_000, prefix="B_")
+    chunker = AdaptiveChunker(small + large, min_size=1, max_size=100, target_seconds=1.0, initial_size=10)
+    it = iter(chunker)
+
+    first = next(it)
+    chunker.record(len(first), 100, 0.001)  # 10 파일/0.001초, 100 KB/s
+
+    second = next(it)
+    assert len(second) == 10  # 10 KB x 10 = 100 KB 예산 (파일당 초 기준이면 100개)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"min_size": 0},
+    {"min_size": 10, "max_size": 5},
+    {"target_seconds": 0},
+])
+def test_chunker_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        AdaptiveChunker([], **kwargs)
+
+
+def test_file_processor_records_chunk_sizes(tmp_path, run_processor):
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    files = [src_dir / f"IMG_{i:04d}.mov" for i in range(7)]
+    for f in files:
+        f.write_text(f.name)
+
+    run = run_processor(
+        src_dir, default=MetaRecord(datetime_original=None), exiftool_workers=1,
+        chunk_min_size=3, chunk_max_size=3,
+    )
+    processor = run.processor
+
+    assert processor.summary.chunk_sizes == [3, 3, 1]
+    assert len(run.extraction.chunks) == 3
+    assert processor.summary.skipped_no_datetime == 7
+    assert "배치 크기: 3개 배치 (최소 1 / 최대 3 / 평균 2.3)" in str(processor.summary)
@@ -1,6 +1,7 @@
 import pytest
 from pathlib import Path
 from msr.core.collision import resolve_collision
+from msr.core.scanner import FileStat
 
 @pytest.fixture
 def setup_temp_dir(tmp_path):
@@ -132,3 +133,23 @@ def test_resolve_collision_complex_scenario(setup_temp_dir):
     resolved_path = resolve_collision(setup_temp_dir / "file_name1.txt")
     assert resolved_path == setup_temp_dir / "file_name4.txt"
     assert not resolved_path.exists()
+
+def test_resolve_collision_counts_pending_destinations(tmp_path):
+    """이번 계획에서 이미 배정된 대상도 이미 존재하는 것으로 보고 다음 번호를 고른다."""
+    src = tmp_path / "src" / "IMG_1.jpg"
+    src.parent.mkdir()
+    src.write_text("other")
+    dst = tmp_path / "result" / "2023-01-01_10-00-00_1234_EOSR7.jpg"
+    pending = {dst: FileStat(99, 0, 0)}
+
+    final = resolve_collision(src, dst, pending=pending)
+    assert final.name == "2023-01-01_10-00-00_12341_EOSR7.jpg"
+
+    pending[final] = FileStat(98, 0, 0)
+    final = resolve_collision(src, dst, pending=pending)
+    assert final.name == "2023-01-01_10-00-00_12342_EOSR7.jpg"
+
+    # 같은 원본(크기/수정시간 일치)이 이미 계획되어 있으면 같은 경로를 돌려준다(복사 스킵 유도).
+    st = src.stat()
+    same = {dst: FileStat(st.st_size, st.st_mtime_ns, st.st_ino)}
+    assert resolve_collision(src, dst, pending=same) == dst
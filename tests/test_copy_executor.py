@@ -0,0 +1,208 @@
+import threading
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from msr.core.copy_executor import ByteBudget, CopyExecutor
+from msr.core.metadata import MetaRecord
+
+
+def test_byte_budget_lets_oversized_item_run_alone():
+    budget = ByteBudget(100)
+    budget.acquire(500)  # 진행 중인 것이 없으면 예산보다 커도 시작한다
+    assert budget.in_flight == 500
+
+    started = threading.Event()
+
+    def small():
+        budget.acquire(10)
+        started.set()
+
+    t = threading.Thread(target=small)
+    t.start()
+    assert not started.wait(0.2)  # 큰 항목이 끝날 때까지 기다림
+    budget.release(500)
+    assert started.wait(2)
+    t.join()
+
+
+def test_executor_keeps_small_files_moving_while_large_ones_wait():
+    """대용량 작업이 예산을 기다리는 동안에도 작은 작업은 다른 워커에서 끝난다."""
+    executor = CopyExecutor(workers=4, max_inflight_bytes=100)
+    release_big = threading.Event()
+    order: list[str] = []
+    lock = threading.Lock()
+
+    def job(name, wait=None):
+        def run():
+            if wait is not None:
+                wait.wait(5)
+            with lock:
+                order.append(name)
+            return name
+        return run
+
+    big1 = executor.submit(job("big1", release_big), 90)
+    big2 = executor.submit(job("big2"), 90)
+    smalls = [executor.submit(job(f"small{i}"), 5) for i in range(5)]
+    for f in smalls:
+        assert f.result(timeout=2).startswith("small")
+    assert not big2.done()
+
+    release_big.set()
+    assert big1.result(timeout=2) == "big1"
+    assert big2.result(timeout=2) == "big2"
+    assert executor.budget.peak <= 100
+    executor.close()
+
+
+def test_small_files_run_while_large_one_waits_for_budget():
+    """예산을 기다리는 대용량 파일이 워커를 붙잡지 않아, 뒤에 제출된 작은 파일이 먼저 시작된다."""
+    executor = CopyExecutor(workers=4, max_inflight_bytes=512)
+    release_mov0 = threading.Event()
+
+    def job(name, wait=None):
+        def run():
+            if wait is not None:
+                assert wait.wait(5)
+            return name
+        return run
+
+    movs = [executor.submit(job("MOV0", release_mov0), 400)]
+    movs += [executor.submit(job(f"MOV{i}"), 400) for i in range(1, 4)]
+    jpgs = [executor.submit(job(f"IMG{i}"), 1) for i in range(3)]
+
+    # MOV0이 끝나기 전에 작은 파일이 모두 끝난다.
+    assert [f.result(timeout=2) for f in jpgs] == ["IMG0", "IMG1", "IMG2"]
+    assert not any(f.done() for f in movs)
+
+    release_mov0.set()
+    assert [f.result(timeout=2) for f in movs] == ["MOV0", "MOV1", "MOV2", "MOV3"]
+    assert executor.budget.peak <= 512
+    executor.close()
+
+
+def test_waiting_job_is_not_bypassed_forever():
+    executor = CopyExecutor(workers=3, max_inflight_bytes=100, max_bypass=2)
+    release_first = threading.Event()
+    started: list[str] = []
+    lock = threading.Lock()
+
+    def job(name, wait=None):
+        def run():
+            with lock:
+                started.append(name)
+            if wait is not None:
+                assert wait.wait(5)
+            return name
+        return run
+
+    first = executor.submit(job("first", release_first), 60)
+    big = executor.submit(job("big"), 60)
+    smalls = [executor.submit(job(f"small{i}"), 10) for i in range(4)]
+
+    # 작은 작업 2개는 big을 앞지르지만, 그 뒤로는 워커와 예산이 남아도 big을 기다린다.
+    assert [f.result(timeout=2) for f in smalls[:2]] == ["small0", "small1"]
+    time.sleep(0.1)
+    assert not any(f.done() for f in smalls[2:])
+
+    release_first.set()
+    for f in [first, big, *smalls]:
+        f.result(timeout=2)
+    assert started.index("big") < started.index("small2")
+    executor.close()
+
+
+def test_executor_propagates_job_errors():
+    executor = CopyExecutor(workers=1, max_inflight_bytes=10)
+
+    def fail():
+        raise OSError("disk full")
+
+    future = executor.submit(fail, 5)
+    with pytest.raises(OSError):
+        future.result(timeout=2)
+    assert executor.budget.in_flight == 0
+    executor.close()
+
+
+def test_executor_rejects_invalid_arguments():
+    with pytest.raises(ValueError):
+        CopyExecutor(workers=0)
+    with pytest.raises(ValueError):
+        CopyExecutor(workers=1, max_inflight_bytes=0)
+    with pytest.raises(ValueError):
+        CopyExecutor(workers=1, max_bypass=-1)
+
+
+def build_source(src_dir: Path) -> dict[Path, MetaRecord]:
+    meta = MetaRecord(datetime_original="2023:01:01 10:00:00", normalized_camera="EOSR7")
+    metadata: dict[Path, MetaRecord] = {}
+    for i in range(40):
+        sub = src_dir / f"d{i:02d}"
+        sub.mkdir(parents=True)
+        f = sub / f"IMG_{i % 7:04d}.jpg"  # 같은 결과명이 여러 번 나온다
+        f.write_bytes(b"x" * (1000 + i * 997))
+        if i % 11 == 5:
+            metadata[f] = MetaRecord(datetime_original=None)  # 스킵
+        elif i % 13 != 7:  # 나머지는 메타데이터 없음(오류)
+            metadata[f] = meta
+    return metadata
+
+
+def summary_counts(summary):
+    return (
+        summary.total_files, summary.converted_success, summary.pass_copied,
+        summary.skipped_no_datetime, summary.skipped_not_img_pattern,
+        summary.collisions_resolved, summary.skipped_already_exists, summary.errors,
+    )
+
+
+def test_concurrent_copy_matches_serial_counts_and_log_order(tmp_path, run_processor):
+    serial_dir = tmp_path / "serial" / "source"
+    parallel_dir = tmp_path / "parallel" / "source"
+    serial_meta = build_source(serial_dir)
+    parallel_meta = build_source(parallel_dir)
+
+    serial_run = run_processor(serial_dir, serial_meta, copy_workers=1)
+    parallel_run = run_processor(
+        parallel_dir, parallel_meta, copy_workers=4, copy_max_inflight_bytes=20_000
+    )
+    serial, serial_events = serial_run.summary, serial_run.events
+    parallel, parallel_events = parallel_run.summary, parallel_run.events
+
+    assert summary_counts(parallel) == summary_counts(serial)
+    assert serial.errors > 0 and serial.collisions_resolved > 0 and serial.skipped_no_datetime > 0
+
+    def logs(events, root):
+        return [
+            e["msg"].replace(str(root), "<root>")
+            for e in events
+            if e["type"] == "LOG" and not e["msg"].startswith("---")
+        ]
+
+    assert logs(parallel_events, parallel_dir) == logs(serial_events, serial_dir)
+    assert sorted(p.name for p in (parallel_dir / "result" / "2023-01-01").iterdir()) == sorted(
+        p.name for p in (serial_dir / "result" / "2023-01-01").iterdir()
+    )
+
+
+@pytest.mark.parametrize("mode", ["hardlink", "move"])
+def test_link_and_move_modes_reserve_source_size(tmp_path, run_processor, mode):
+    """
+    하드링크/이동도 다른 장치면 복사로 대신하므로 복사 예산에 원본 크기를 예약해야 합니다.
+    """
+    src_dir = tmp_path / "source"
+    metadata = build_source(src_dir)
+    sizes = []
+    original = CopyExecutor.submit
+
+    def submit(self, fn, size):
+        sizes.append(size)
+        return original(self, fn, size)
+
+    with patch.object(CopyExecutor, "submit", submit):
+        run_processor(src_dir, metadata, output_mode=mode)
+
+    assert sizes and all(size >= 1000 for size in sizes)
@@ -0,0 +1,67 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from msr.core.collision import resolve_collision
+from msr.core.copier import copy_file
+from msr.core.dest_index import DestinationIndex
+
+
+def make_src(tmp_path, name="IMG_0001.jpg", data=b"source"):
+    src = tmp_path / "source" / name
+    src.parent.mkdir(exist_ok=True)
+    src.write_bytes(data)
+    return src
+
+
+def test_index_resolves_collisions_without_touching_disk_per_name(tmp_path):
+    src = make_src(tmp_path)
+    out = tmp_path / "result" / "2023-01-01"
+    out.mkdir(parents=True)
+    for name in ("2023-01-01_10-00-00_0001_EOSR7.jpg", "2023-01-01_10-00-00_00011_EOSR7.jpg"):
+        (out / name).write_bytes(b"other content")
+    dst = out / "2023-01-01_10-00-00_0001_EOSR7.jpg"
+    expected = resolve_collision(src, dst)
+
+    index = DestinationIndex(tmp_path / "result")
+    with patch.object(Path, "exists", side_effect=AssertionError("디스크 조회")):
+        assert resolve_collision(src, dst, index=index) == expected
+        assert expected.name == "2023-01-01_10-00-00_00012_EOSR7.jpg"
+        # 없는 날짜 폴더도 한 번만 읽고, 그 뒤로는 없는 것으로 기억한다.
+        missing = tmp_path / "result" / "2024-01-01" / "a.jpg"
+        assert resolve_collision(src, missing, index=index) == missing
+        assert resolve_collision(src, missing, index=index) == missing
+    assert index.dir_loads == 2
+
+
+def test_index_detects_same_file_from_listing(tmp_path):
+    src = make_src(tmp_path)
+    out = tmp_path / "result" / "2023-01-01"
+    out.mkdir(parents=True)
+    dst = out / "2023-01-01_10-00-00_0001_EOSR7.jpg"
+    dst.write_bytes(src.read_bytes())
+    st = src.stat()
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    index = DestinationIndex(tmp_path / "result")
+    assert resolve_collision(src, dst, index=index) == dst  # 멱등성: 같은 파일이면 그 경로
+    assert index.get(dst).size == st.st_size
+
+
+def test_copy_file_updates_index(tmp_path):
+    src = make_src(tmp_path)
+    index = DestinationIndex(tmp_path / "result")
+    dst = tmp_path / "result" / "2023-01-01" / "2023-01-01_10-00-00_0001_EOSR7.jpg"
+    assert not index.exists(dst)  # 폴더가 아직 없음
+
+    success, _, _, _ = copy_file(src, dst, index=index)
+    assert success and dst.read_bytes() == b"source"
+    assert index.exists(dst)
+
+    other = make_src(tmp_path, "IMG_0001.mov", b"another file")
+    with patch.object(Path, "exists", side_effect=AssertionError("디스크 조회")):
+        resolved = resolve_collision(other, dst, index=index)
+        assert resolved.name == "2023-01-01_10-00-00_00011_EOSR7.jpg"
+        success, message, _, _ = copy_file(src, dst, index=index)
+    assert not success and "already exists" in message
+    assert index.dir_loads == 1
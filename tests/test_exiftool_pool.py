@@ -0,0 +1,99 @@
+import pytest
+import threading
+import time
+from pathlib import Path
+
+from msr.core.exiftool import ExifToolPool, ExifToolError, default_worker_count
+from msr.core.metadata import MetaRecord
+
+
+def fake_extract(files, session=None):
+    """앞 chunk일수록 오래 걸리도록 하여 완료 순서를 뒤섞는 가짜 추출 함수."""
+    time.sleep(0.05 / (int(files[0].stem) + 1))
+    return {p: MetaRecord(datetime_original="2023:01:01 10:00:00") for p in files}
+
+
+def test_default_worker_count_is_positive():
+    assert default_worker_count() >= 1
+
+
+def test_pool_invalid_worker_count_falls_back_to_auto():
+    pool = ExifToolPool(0)
+    try:
+        assert pool.workers == default_worker_count()
+    finally:
+        pool.close()
+
+
+def test_pool_imap_preserves_source_order():
+    """
+    완료 순서와 상관없이 결과는 제출(소스 정렬) 순서대로 나와야 합니다.
+    """
+    chunks = [[Path(f"{i}.jpg")] for i in range(8)]
+
+    with ExifToolPool(4) as pool:
+        ordered = [chunk for chunk, future in pool.imap(fake_extract, chunks)]
+        assert ordered == chunks
+
+
+def test_pool_runs_chunks_concurrently():
+    """
+    워커 수만큼 chunk가 동시에 실행되어야 합니다.
+    """
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_extract(files, session=None):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return {}
+
+    chunks = [[Path(f"{i}.jpg")] for i in range(6)]
+    with ExifToolPool(3) as pool:
+        for _, future in pool.imap(slow_extract, chunks):
+            future.result()
+
+    assert peak == 3
+
+
+def test_pool_each_worker_uses_its_own_session():
+    """
+    동시에 실행되는 작업은 서로 다른 세션을 받아야 합니다.
+    """
+    seen = []
+    barrier = threading.Barrier(2)
+
+    def record_session(files, session=None):
+        seen.append(session)
+        barrier.wait(timeout=5)
+        return {}
+
+    with ExifToolPool(2) as pool:
+        futures = [pool.submit(record_session, [Path(f"{i}.jpg")]) for i in range(2)]
+        for f in futures:
+            f.result()
+
+        assert len(set(map(id, seen))) == 2
+        assert all(s in pool.sessions for s in seen)
+
+
+def test_pool_propagates_errors_through_future():
+    def failing_extract(files, session=None):
+        raise ExifToolError("boom")
+
+    with ExifToolPool(2) as pool:
+        future = pool.submit(failing_extract, [Path("a.jpg")])
+        with pytest.raises(ExifToolError, match="boom"):
+            future.result()
+
+
+def test_pool_sessions_share_cancel_event():
+    cancel = threading.Event()
+    with ExifToolPool(2, cancel_event=cancel) as pool:
+        assert all(session.cancel_event is cancel for session in pool.sessions)
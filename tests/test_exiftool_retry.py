@@ -3,7 +3,7 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 import subprocess
 import json
-from msr.core.exiftool import extract_metadata_batch, ExifToolError
+from msr.core.exiftool import extract_metadata_batch, ExifToolError, ExtractionReport
 
 @pytest.fixture
 def mock_exiftool_path():
@@ -78,7 +78,7 @@ def test_extract_metadata_batch_max_retries_exceeded(mock_exiftool_path):
     최대 재시도 횟수를 초과할 때까지 계속 실패하는 경우를 테스트합니다.
     """
     # 2개의 파일이므로 1번 분할 가능. 
-    # MAX_RETRIES가 2이므로 깊이 2까지 내려감.
+    # 이분 탐색은 파일 1개 단위까지 내려감.
     files = [Path("fail1.jpg"), Path("fail2.jpg")]
 
     with patch("subprocess.run") as mock_run:
@@ -112,3 +112,154 @@ def test_extract_metadata_batch_file_not_found_retry(mock_exiftool_path):
         mock_run.side_effect = [FileNotFoundError(), MagicMock(stdout="[]"), MagicMock(stdout="[]")]
         results = extract_metadata_batch(files)
         assert results == {}
+
+
+def fake_run_with_bad_files(bad_names):
+    """bad_names가 인자에 포함되면 실패하는 가짜 subprocess.run (argfile에서 파일 목록을 읽음)."""
+    calls = []
+
+    def run(cmd, **kwargs):
+        argfile = Path(cmd[cmd.index("-@") + 1])
+        names = [Path(line).name for line in argfile.read_text(encoding="utf-8").splitlines()]
+        calls.append(names)
+        if any(n in bad_names for n in names):
+            raise subprocess.CalledProcessError(1, "cmd", stderr=f"Error: corrupt {names[0]}")
+        return MagicMock(stdout=json.dumps([{"SourceFile": n} for n in names]))
+
+    return run, calls
+
+
+def test_bisection_isolates_single_bad_file(mock_exiftool_path):
+    """
+    64개 중 손상 파일 1개만 결과에서 빠지고, 추가 호출은 O(log n)회여야 합니다.
+    """
+    files = [Path(f"IMG_{i:03d}.jpg") for i in range(64)]
+    run, calls = fake_run_with_bad_files({"IMG_037.jpg"})
+    report = ExtractionReport()
+
+    with patch("subprocess.run", side_effect=run):
+        results = extract_metadata_batch(files, report=report)
+
+    assert len(results) == 63
+    assert Path("IMG_037.jpg").resolve() not in results
+    assert list(report.failures) == [Path("IMG_037.jpg").resolve()]
+    assert "corrupt IMG_037.jpg" in report.failures[Path("IMG_037.jpg").resolve()]
+    # 깊이 log2(64)=6, 단계마다 최대 2회
+    assert report.retry_calls == len(calls) - 1
+    assert report.retry_calls <= 2 * 6
+    assert report.retry_seconds >= 0
+
+
+def test_bisection_isolates_multiple_bad_files(mock_exiftool_path):
+    files = [Path(f"IMG_{i:03d}.jpg") for i in range(20)]
+    bad = {"IMG_000.jpg", "IMG_011.jpg", "IMG_019.jpg"}
+    run, _ = fake_run_with_bad_files(bad)
+    report = ExtractionReport()
+
+    with patch("subprocess.run", side_effect=run):
+        results = extract_metadata_batch(files, report=report)
+
+    assert {p.name for p in results} == {f.name for f in files} - bad
+    assert {p.name for p in report.failures} == bad
+
+
+def test_bisection_reuses_session():
+    """
+    세션이 주어지면 분할 재시도도 같은 세션으로 실행되어야 합니다(새 프로세스 없음).
+    """
+    files = [Path(f"IMG_{i}.jpg") for i in range(4)]
+    session = MagicMock()
+
+    def execute(args, timeout=None, idle_timeout=None):
+        names = [Path(a).name for a in args if a.endswith(".jpg")]
+        if "IMG_2.jpg" in names:
+            raise ExifToolError("ExifTool session terminated unexpectedly")
+        return json.dumps([{"SourceFile": n} for n in names]), ""
+
+    session.execute.side_effect = execute
+    report = ExtractionReport()
+
+    with patch("subprocess.run") as mock_run:
+        results = extract_metadata_batch(files, session=session, report=report)
+
+    mock_run.assert_not_called()
+    assert {p.name for p in results} == {"IMG_0.jpg", "IMG_1.jpg", "IMG_3.jpg"}
+    assert report.failures == {Path("IMG_2.jpg").resolve(): "ExifTool session terminated unexpectedly"}
+    assert session.execute.call_count == report.retry_calls + 1
+
+
+def test_per_file_errors_are_reported_without_bisection():
+    """
+    세션의 stderr('Error: ... - <파일>')와 JSON Error 태그로 알려 준 파일별 오류는 배치를 실패시키지
+    않고, 분할 탐색 없이 그 파일의 사유로 기록되어야 합니다.
+    """
+    files = [Path(f"IMG_{i}.jpg") for i in range(4)]
+    missing, corrupt = (str(f.resolve()) for f in files[1:3])
+    session = MagicMock()
+    session.execute.return_value = (
+        json.dumps([
+            {"SourceFile": str(files[0].resolve()), "DateTimeOriginal": "2023:01:01 10:00:00"},
+            {"SourceFile": corrupt, "Error": "File format error"},
+            {"SourceFile": str(files[3].resolve()), "DateTimeOriginal": "2023:01:01 10:00:01"},
+        ]),
+        f"Error: File not found - {missing}\n    1 files could not be read\n",
+    )
+    report = ExtractionReport()
+
+    results = extract_metadata_batch(files, session=session, report=report)
+
+    assert set(results) == {files[0].resolve(), files[3].resolve()}
+    assert report.failures == {
+        files[1].resolve(): "Error: File not found",
+        files[2].resolve(): "Error: File format error",
+    }
+    assert session.execute.call_count == 1
+    assert report.retry_calls == 0
+
+
+def test_per_file_error_exit_status_does_not_fail_subprocess_batch(mock_exiftool_path):
+    """ExifTool은 파일 하나라도 오류면 1로 끝나지만, 파일별 오류면 나머지 출력을 그대로 씁니다."""
+    files = [Path("IMG_0.jpg"), Path("IMG_1.jpg")]
+    good = {"SourceFile": str(files[0].resolve()), "DateTimeOriginal": "2023:01:01 10:00:00"}
+    report = ExtractionReport()
+
+    with patch("subprocess.run") as mock_run:
+        mock_run.side_effect = subprocess.CalledProcessError(
+            1, "cmd", output=json.dumps([good]),
+            stderr=f"Error: File not found - {files[1].resolve()}\n",
+        )
+        results = extract_metadata_batch(files, report=report)
+
+    assert list(results) == [files[0].resolve()]
+    assert report.failures == {files[1].resolve(): "Error: File not found"}
+    assert mock_run.call_count == 1
+
+
+def test_file_processor_reports_per_file_errors(tmp_path):
+    """
+    ExifTool이 알려 준 파일별 오류는 사유와 함께 error.log에 기록되고, 나머지 파일은 처리되어야 합니다.
+    """
+    from queue import Queue
+    from msr.core.file_processor import FileProcessor
+
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    for i in range(4):
+        (src_dir / f"IMG_{i}.mov").write_text("x")
+
+    def execute(args, timeout=None, idle_timeout=None):
+        names = [a for a in args if a.endswith(".mov")]
+        bad = [n for n in names if n.endswith("IMG_1.mov")]
+        records = [
+            {"SourceFile": n, "MediaCreateDate": "2023:01:01 10:00:00"} for n in names if n not in bad
+        ]
+        return json.dumps(records), "".join(f"Error: File format error - {n}\n" for n in bad)
+
+    processor = FileProcessor(str(src_dir), Queue(), exiftool_workers=1, use_metadata_cache=False)
+    with patch("msr.core.exiftool.ExifToolSession.execute", side_effect=execute):
+        processor.process_files()
+
+    assert processor.summary.errors == 1
+    assert processor.summary.exiftool_retry_calls == 0
+    error_log = (src_dir / "result" / "error.log").read_text(encoding="utf-8")
+    assert "IMG_1.mov: 메타데이터 추출 실패: Error: File format error" in error_log
@@ -0,0 +1,217 @@
+import pytest
+import sys
+import textwrap
+from pathlib import Path
+
+import threading
+import time
+from unittest.mock import patch
+
+from msr.core import exiftool as exiftool_module
+from msr.core.exiftool import (
+    ExifToolCancelledError,
+    ExifToolError,
+    ExifToolSession,
+    ExifToolTimeoutError,
+    ExtractionReport,
+    extract_metadata_batch,
+    extraction_budget,
+)
+from msr.core.scanner import FileStat
+
+pytestmark = pytest.mark.skipif(sys.platform.startswith("win"), reason="shebang 기반 가짜 ExifTool 사용")
+
+# stay_open 프로토콜(-@ -, -executeN, -echo4, -stay_open False)만 흉내내는 가짜 ExifTool
+FAKE_EXIFTOOL = textwrap.dedent('''\
+    #!{python}
+    import json, sys, time
+    args = []
+    for line in sys.stdin:
+        arg = line.rstrip("\\n")
+        if arg == "False" and args[-1:] == ["-stay_open"]:
+            break
+        if not arg.startswith("-execute"):
+            args.append(arg)
+            continue
+        seq = arg[len("-execute"):]
+        echo = args[args.index("-echo4") + 1] if "-echo4" in args else ""
+        files = [a for a in args if a.endswith((".jpg", ".mp4"))]
+        if any("crash" in f for f in files):
+            sys.exit(1)
+        if any("hang" in f for f in files):
+            # 멈춤 파일 앞까지만 출력하고 응답 없이 대기 (손상 MOV 흉내)
+            done = files[:[i for i, f in enumerate(files) if "hang" in f][0]]
+            head = [{{"SourceFile": f, "DateTimeOriginal": "2023:01:01 10:00:00"}} for f in done]
+            sys.stdout.write(("[" + ",".join(json.dumps(e) for e in head) + ",\\n") if head else "")
+            sys.stdout.flush()
+            time.sleep(60)
+        entries = [{{"SourceFile": f, "DateTimeOriginal": "2023:01:01 10:00:00"}} for f in files]
+        sys.stdout.write(json.dumps(entries) + "\\n")
+        sys.stdout.write("{{ready" + seq + "}}\\n")
+        sys.stdout.flush()
+        sys.stderr.write(echo + "\\n")
+        sys.stderr.flush()
+        args = []
+''')
+
+
+@pytest.fixture
+def fake_exiftool(tmp_path):
+    exe = tmp_path / "exiftool"
+    exe.write_text(FAKE_EXIFTOOL.format(python=sys.executable), encoding="utf-8")
+    exe.chmod(0o755)
+    return exe
+
+
+def test_session_reused_across_batches(tmp_path, fake_exiftool):
+    """
+    여러 배치를 처리해도 ExifTool 프로세스는 1회만 기동되어야 합니다.
+    """
+    files = [tmp_path / f"IMG_{i}.jpg" for i in range(4)]
+
+    with ExifToolSession(fake_exiftool) as session:
+        first = extract_metadata_batch(files[:2], session=session)
+        second = extract_metadata_batch(files[2:], session=session)
+        assert session.start_count == 1
+        assert session.is_alive
+
+    assert not session.is_alive
+    assert set(first) == {p.resolve() for p in files[:2]}
+    assert set(second) == {p.resolve() for p in files[2:]}
+    assert first[files[0].resolve()].datetime_original == "2023:01:01 10:00:00"
+
+
+def test_session_restarts_after_process_death(tmp_path, fake_exiftool):
+    """
+    실행 중 프로세스가 죽으면 오류를 내고, 다음 호출에서 자동으로 재기동되어야 합니다.
+    """
+    with ExifToolSession(fake_exiftool) as session:
+        with pytest.raises(ExifToolError, match="terminated"):
+            session.execute(["-json", str(tmp_path / "crash.jpg")])
+        assert not session.is_alive
+
+        result = extract_metadata_batch([tmp_path / "IMG_1.jpg"], session=session)
+        assert len(result) == 1
+        assert session.start_count == 2
+
+
+def test_session_retry_split_reuses_session(tmp_path, fake_exiftool):
+    """
+    배치 실패 시 분할 재시도도 같은 세션(재기동 포함)을 사용해야 합니다.
+    """
+    files = [tmp_path / "IMG_1.jpg", tmp_path / "crash.jpg"]
+
+    with ExifToolSession(fake_exiftool) as session:
+        result = extract_metadata_batch(files, session=session)
+
+    assert set(result) == {files[0].resolve()}
+
+
+def test_session_close_without_start_is_noop():
+    """
+    한 번도 실행하지 않은 세션의 close는 아무 것도 하지 않아야 합니다.
+    """
+    session = ExifToolSession(Path("does/not/exist"))
+    session.close()
+    assert not session.is_alive
+    assert session.start_count == 0
+
+
+def test_session_missing_executable_raises():
+    """
+    실행 파일이 없으면 ExifToolError가 발생해야 합니다.
+    """
+    with ExifToolSession(Path("does/not/exist/exiftool")) as session:
+        with pytest.raises(ExifToolError, match="not found"):
+            session.execute(["-ver"])
+
+
+@pytest.fixture
+def short_timeout(monkeypatch):
+    """배치 시간 예산을 0.5초 + 파일당 0.1초로 줄인다."""
+    monkeypatch.setattr(exiftool_module, "TIMEOUT_BASE_SECONDS", 0.5)
+    monkeypatch.setattr(exiftool_module, "TIMEOUT_PER_FILE_SECONDS", 0.1)
+
+
+def test_session_timeout_kills_hung_process(tmp_path, fake_exiftool, short_timeout):
+    with ExifToolSession(fake_exiftool) as session:
+        started = time.monotonic()
+        with pytest.raises(ExifToolTimeoutError, match="timed out"):
+            session.execute(["-json", str(tmp_path / "hang.jpg")], timeout=0.3)
+        assert time.monotonic() - started < 5
+        assert not session.is_alive
+
+
+def test_hung_file_is_quarantined_and_rest_resumed(tmp_path, fake_exiftool, short_timeout):
+    """
+    멈춤 파일만 격리되고, 멈추기 전 받은 레코드와 나머지 파일은 모두 추출되어야 합니다.
+    """
+    files = [tmp_path / f"IMG_{i}.jpg" for i in range(3)]
+    files += [tmp_path / "hang.jpg"] + [tmp_path / f"IMG_{i}.jpg" for i in range(3, 6)]
+    report = ExtractionReport()
+
+    with ExifToolSession(fake_exiftool) as session:
+        results = extract_metadata_batch(files, session=session, report=report)
+
+    assert set(results) == {f.resolve() for f in files if f.name != "hang.jpg"}
+    assert report.quarantined == [(tmp_path / "hang.jpg").resolve()]
+    assert "timed out" in report.failures[(tmp_path / "hang.jpg").resolve()]
+
+
+def test_idle_timeout_kills_hung_file_long_before_batch_budget(tmp_path, fake_exiftool, monkeypatch):
+    """
+    배치 예산이 넉넉해도, 출력이 무응답 예산 동안 멈추면 멈춤 파일만 격리되어야 합니다.
+    """
+    monkeypatch.setattr(exiftool_module, "TIMEOUT_BASE_SECONDS", 0.5)
+    monkeypatch.setattr(exiftool_module, "TIMEOUT_PER_FILE_SECONDS", 60.0)
+    monkeypatch.setattr(exiftool_module, "IDLE_WINDOW_FILES", 0)
+    files = [tmp_path / f"IMG_{i}.jpg" for i in range(3)] + [tmp_path / "hang.jpg"]
+    report = ExtractionReport()
+
+    with ExifToolSession(fake_exiftool) as session:
+        started = time.monotonic()
+        results = extract_metadata_batch(files, session=session, report=report)
+        assert time.monotonic() - started < 10  # 배치 예산은 4 x 60초
+
+    assert set(results) == {f.resolve() for f in files[:3]}
+    assert report.quarantined == [(tmp_path / "hang.jpg").resolve()]
+    assert "no output" in report.failures[(tmp_path / "hang.jpg").resolve()]
+
+
+def test_extraction_budget_uses_scanned_sizes(tmp_path):
+    """
+    크기는 수집 단계의 file_stats에서 읽고(stat 없음), 무응답 예산은 가장 큰 파일 몇 개에만 비례해야 합니다.
+    """
+    mib = 1024 * 1024
+    files = [tmp_path / f"IMG_{i}.mov" for i in range(100)]
+    file_stats = {f: FileStat(20 * mib if i < 40 else mib, 0, i) for i, f in enumerate(files)}
+
+    with patch("msr.core.chunking.os.stat", side_effect=AssertionError("stat")):
+        timeout, idle_timeout = extraction_budget(files, file_stats)
+
+    window = exiftool_module.IDLE_WINDOW_FILES
+    assert timeout == pytest.approx(10 + 2 * 100 + (40 * 20 + 60) / 20)
+    assert idle_timeout == pytest.approx(10 + 2 * window + window * 20 / 20)
+
+
+def test_cancel_event_interrupts_in_flight_extraction(tmp_path, fake_exiftool):
+    """
+    stop_event(cancel_event)가 설정되면 실행 중인 명령이 시간 예산과 무관하게 즉시 중단되어야 합니다.
+    """
+    cancel = threading.Event()
+    files = [tmp_path / "IMG_1.jpg", tmp_path / "hang.jpg", tmp_path / "IMG_2.jpg"]
+    report = ExtractionReport()
+
+    with ExifToolSession(fake_exiftool, cancel_event=cancel) as session:
+        threading.Timer(0.3, cancel.set).start()
+        started = time.monotonic()
+        with pytest.raises(ExifToolCancelledError):
+            extract_metadata_batch(files, session=session, report=report)
+        assert time.monotonic() - started < 5
+
+        # 중단 후에는 새 명령도 실행하지 않는다.
+        with pytest.raises(ExifToolCancelledError):
+            session.execute(["-json", str(files[0])])
+
+    assert report.failures == {}
+    assert report.retry_calls == 0
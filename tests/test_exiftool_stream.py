@@ -0,0 +1,273 @@
+import pytest
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from queue import Queue
+from unittest.mock import MagicMock, patch
+
+from msr.core import exiftool as exiftool_module
+from msr.core.exiftool import (
+    ExifToolCancelledError,
+    ExifToolError,
+    ExtractionReport,
+    JsonArrayDecoder,
+    MetadataStream,
+    iter_metadata_batch,
+)
+from msr.core.file_processor import FileProcessor
+from msr.core.metadata import MetaRecord
+
+
+def exiftool_json_lines(entries: list[dict]) -> list[str]:
+    """ExifTool -json 과 같은 모양(여러 줄, 객체 사이 콤마)의 출력 줄 목록."""
+    text = "[" + ",\n".join(json.dumps(e, indent=2) for e in entries) + "]\n"
+    return text.splitlines(keepends=True)
+
+
+# --- JsonArrayDecoder tests ---
+
+def test_decoder_yields_objects_as_they_complete():
+    entries = [{"SourceFile": f"IMG_{i}.jpg", "DateTimeOriginal": "2023:01:01 10:00:00"} for i in range(3)]
+    decoder = JsonArrayDecoder()
+
+    seen = []
+    progress = []
+    for line in exiftool_json_lines(entries):
+        seen.extend(decoder.feed(line))
+        progress.append(len(seen))
+    decoder.close()
+
+    assert seen == entries
+    # 마지막 줄을 받기 전에 이미 앞 객체들이 나와 있어야 함
+    assert progress[-2] >= 2
+
+
+def test_decoder_char_by_char():
+    entries = [{"SourceFile": "a}b.jpg"}, {"SourceFile": "c]d.jpg", "Model": "x"}]
+    decoder = JsonArrayDecoder()
+    seen = []
+    for ch in json.dumps(entries):
+        seen.extend(decoder.feed(ch))
+    decoder.close()
+    assert seen == entries
+
+
+def test_decoder_empty_output_is_empty_array():
+    decoder = JsonArrayDecoder()
+    assert decoder.feed("") == []
+    decoder.close()
+
+
+@pytest.mark.parametrize("text", ['[{"SourceFile": "a.jpg"},', "not json", '[{"SourceFile": '])
+def test_decoder_invalid_or_truncated(text):
+    decoder = JsonArrayDecoder()
+    with pytest.raises(json.JSONDecodeError):
+        decoder.feed(text)
+        decoder.close()
+
+
+# --- iter_metadata_batch tests ---
+
+def test_iter_metadata_batch_streams_records_lazily(tmp_path):
+    files = [tmp_path / f"IMG_{i}.jpg" for i in range(3)]
+    entries = [{"SourceFile": str(f), "DateTimeOriginal": f"2023:01:0{i + 1} 10:00:00"}
+               for i, f in enumerate(files)]
+    lines_read = []
+
+    def execute_lines(args, timeout=None, idle_timeout=None):
+        for line in exiftool_json_lines(entries):
+            lines_read.append(line)
+            yield line
+
+    session = MagicMock()
+    session.execute_lines.side_effect = execute_lines
+
+    it = iter_metadata_batch(files, session=session)
+    first_path, first_meta = next(it)
+    assert first_path == files[0].resolve()
+    assert first_meta.datetime_original == "2023:01:01 10:00:00"
+    assert len(lines_read) < len(exiftool_json_lines(entries))  # 전체 출력을 기다리지 않음
+
+    rest = dict(it)
+    assert list(rest) == [f.resolve() for f in files[1:]]
+
+
+def test_iter_metadata_batch_retries_only_unyielded_files(tmp_path):
+    """
+    중간에 세션이 죽으면 이미 받은 레코드는 유지하고, 나머지 파일만 기존 배치 추출로 재시도해야 합니다.
+    """
+    files = [tmp_path / f"IMG_{i}.jpg" for i in range(3)]
+    first = exiftool_json_lines([{"SourceFile": str(files[0]), "DateTimeOriginal": "2023:01:01 10:00:00"},
+                                 {"SourceFile": str(files[1])}])
+
+    def execute_lines(args, timeout=None, idle_timeout=None):
+        yield from first[: len(first) // 2 + 1]
+        raise ExifToolError("ExifTool session terminated unexpectedly")
+
+    session = MagicMock()
+    session.execute_lines.side_effect = execute_lines
+    retry_result = {f.resolve(): MetaRecord(datetime_original="2023:01:02 10:00:00") for f in files[1:]}
+
+    with patch("msr.core.exiftool.extract_metadata_batch", return_value=retry_result) as mock_batch:
+        result = dict(iter_metadata_batch(files, session=session))
+
+    assert mock_batch.call_args[0][0] == files[1:]
+    assert result[files[0].resolve()].datetime_original == "2023:01:01 10:00:00"
+    assert set(result) == {f.resolve() for f in files}
+
+
+def test_iter_metadata_batch_reports_per_file_errors(tmp_path):
+    """JSON Error 태그와 세션 stderr의 파일별 오류는 재시도 없이 그 파일의 실패로 기록되어야 합니다."""
+    files = [tmp_path / f"IMG_{i}.jpg" for i in range(3)]
+    session = MagicMock()
+    session.execute_lines.return_value = iter(exiftool_json_lines([
+        {"SourceFile": str(files[0]), "DateTimeOriginal": "2023:01:01 10:00:00"},
+        {"SourceFile": str(files[1]), "Error": "File is empty"},
+    ]))
+    session.last_stderr = f"Error: File not found - {files[2].resolve()}\n"
+    report = ExtractionReport()
+
+    with patch("msr.core.exiftool.extract_metadata_batch") as mock_batch:
+        result = dict(iter_metadata_batch(files, session=session, report=report))
+
+    mock_batch.assert_not_called()
+    assert list(result) == [files[0].resolve()]
+    assert report.failures == {
+        files[1].resolve(): "Error: File is empty",
+        files[2].resolve(): "Error: File not found",
+    }
+
+
+def test_iter_metadata_batch_empty():
+    assert list(iter_metadata_batch([])) == []
+
+
+# --- MetadataStream tests ---
+
+def test_metadata_stream_get_waits_for_record():
+    stream = MetadataStream()
+    path = Path("IMG_1.jpg")
+    meta = MetaRecord(datetime_original="2023:01:01 10:00:00")
+
+    timer = threading.Timer(0.05, stream.put, args=(path, meta))
+    timer.start()
+    assert stream.get(path) is meta
+    timer.join()
+
+
+def test_metadata_stream_missing_after_finish():
+    stream = MetadataStream()
+    stream.finish()
+    assert stream.get(Path("missing.jpg")) is None
+
+
+def test_metadata_stream_raises_error_for_missing_records():
+    stream = MetadataStream()
+    ok = Path("ok.jpg")
+    stream.put(ok, MetaRecord())
+    stream.finish(ExifToolError("boom"))
+
+    assert stream.get(ok) is not None
+    with pytest.raises(ExifToolError, match="boom"):
+        stream.get(Path("missing.jpg"))
+
+
+def test_file_processor_streaming_mode(tmp_path):
+    """
+    스트리밍 모드에서도 일반 모드와 같은 처리 결과가 나와야 합니다.
+    """
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    files = [src_dir / "IMG_0001.mov", src_dir / "IMG_0002.mov", src_dir / "clip.mov"]
+    for f in files:
+        f.write_text(f.name)
+
+    records = [
+        (files[0].resolve(), MetaRecord(datetime_original="2023:01:01 10:00:00", normalized_camera="iPhone")),
+        (files[1].resolve(), MetaRecord(datetime_original=None)),
+    ]
+
+    processor = FileProcessor(str(src_dir), Queue(), exiftool_workers=2,
+                              use_metadata_cache=False, stream_metadata=True)
+    with patch("msr.core.file_processor.iter_metadata_batch", return_value=iter(records)) as mock_iter, \
+         patch("msr.core.file_processor.extract_metadata_batch") as mock_batch:
+        processor.process_files()
+
+    mock_iter.assert_called_once()
+    mock_batch.assert_not_called()
+    assert processor.summary.converted_success == 1
+    assert processor.summary.skipped_no_datetime == 1
+    assert processor.summary.errors == 1  # clip.mov: 레코드 없음
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="shebang 기반 가짜 ExifTool 사용")
+def test_iter_metadata_batch_subprocess_path(tmp_path):
+    """
+    세션 없이 호출하면 argfile로 프로세스를 1회 실행하고 stdout을 줄 단위로 해석해야 합니다.
+    """
+    exe = tmp_path / "exiftool"
+    exe.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys\n"
+        "files = [l.strip() for l in open(sys.argv[sys.argv.index('-@') + 1], encoding='utf-8')]\n"
+        "print(json.dumps([{'SourceFile': f, 'CreateDate': '2023:01:01 10:00:00'} for f in files], indent=2))\n",
+        encoding="utf-8",
+    )
+    exe.chmod(0o755)
+    files = [tmp_path / "IMG_1.jpg", tmp_path / "IMG_2.jpg"]
+
+    with patch("msr.core.exiftool.get_exiftool_path", return_value=exe):
+        result = list(iter_metadata_batch(files))
+
+    assert [p for p, _ in result] == [f.resolve() for f in files]
+    assert result[0][1].datetime_original == "2023:01:01 10:00:00"
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="shebang 기반 가짜 ExifTool 사용")
+def test_iter_metadata_batch_subprocess_path_honors_cancel_event(tmp_path):
+    """
+    세션 없이 실행 중이어도 cancel_event가 설정되면 시간 예산과 무관하게 프로세스를 종료해야 합니다.
+    """
+    exe = tmp_path / "exiftool"
+    exe.write_text(f"#!{sys.executable}\nimport time\ntime.sleep(60)\n", encoding="utf-8")
+    exe.chmod(0o755)
+    cancel = threading.Event()
+
+    with patch("msr.core.exiftool.get_exiftool_path", return_value=exe):
+        threading.Timer(0.3, cancel.set).start()
+        started = time.monotonic()
+        with pytest.raises(ExifToolCancelledError):
+            list(iter_metadata_batch([tmp_path / "IMG_1.jpg"], cancel_event=cancel))
+        assert time.monotonic() - started < 5
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="shebang 기반 가짜 ExifTool 사용")
+def test_subprocess_idle_timeout_resets_on_each_record(tmp_path, monkeypatch):
+    """
+    레코드가 계속 도착하면 전체 실행 시간이 무응답 예산보다 길어도 종료하지 않아야 합니다.
+    """
+    monkeypatch.setattr(exiftool_module, "TIMEOUT_BASE_SECONDS", 0.6)
+    monkeypatch.setattr(exiftool_module, "TIMEOUT_PER_FILE_SECONDS", 60.0)
+    monkeypatch.setattr(exiftool_module, "IDLE_WINDOW_FILES", 0)
+    exe = tmp_path / "exiftool"
+    exe.write_text(
+        f"#!{sys.executable}\n"
+        "import json, sys, time\n"
+        "files = [l.strip() for l in open(sys.argv[sys.argv.index('-@') + 1], encoding='utf-8')]\n"
+        "for i, f in enumerate(files):\n"
+        "    time.sleep(0.2)\n"
+        "    print(('[' if i == 0 else ',') + json.dumps({'SourceFile': f}), flush=True)\n"
+        "print(']')\n",
+        encoding="utf-8",
+    )
+    exe.chmod(0o755)
+    files = [tmp_path / f"IMG_{i}.jpg" for i in range(6)]
+    report = ExtractionReport()
+
+    with patch("msr.core.exiftool.get_exiftool_path", return_value=exe):
+        result = list(iter_metadata_batch(files, report=report))
+
+    assert [p for p, _ in result] == [f.resolve() for f in files]
+    assert report.retry_calls == 0
@@ -0,0 +1,133 @@
+import json
+import pytest
+from queue import Queue
+from unittest.mock import MagicMock, patch
+
+from msr.core.exiftool import (
+    EXIFTOOL_TAGS,
+    ExifToolError,
+    ExtractionReport,
+    extract_metadata_batch,
+    iter_metadata_batch,
+    tag_groups,
+)
+from msr.core.file_processor import FileProcessor
+
+
+class FakeSession:
+    """execute 인자를 기록하고, 경로별로 준비한 레코드(없으면 SourceFile만)를 JSON으로 돌려준다."""
+
+    def __init__(self, records):
+        self.records = records
+        self.calls = []
+        self.last_stderr = ""
+
+    def _output(self, args):
+        self.calls.append(args)
+        paths = [a for a in args if a.startswith("/")]
+        return json.dumps([{"SourceFile": p, **self.records.get(p, {})} for p in paths])
+
+    def execute(self, args, timeout=None, idle_timeout=None):
+        return self._output(args), ""
+
+    def execute_lines(self, args, timeout=None, idle_timeout=None):
+        yield from self._output(args).splitlines(keepends=True)
+
+
+def tags_of(args):
+    return {a for a in args if a.startswith("-") and a not in ("-json", "-s3")}
+
+
+def test_tag_groups_split_by_family(tmp_path):
+    photo, clip, other = tmp_path / "a.JPG", tmp_path / "b.mp4", tmp_path / "c.xyz"
+    groups = tag_groups([photo, clip, other, tmp_path / "d.heic"])
+
+    assert [files for _, files in groups] == [[photo, tmp_path / "d.heic"], [clip], [other]]
+    image_tags, video_tags, other_tags = (tags for tags, _ in groups)
+    assert "-TrackCreateDate" not in image_tags
+    assert "-DateTimeOriginal" not in video_tags
+    assert other_tags == EXIFTOOL_TAGS
+
+    with pytest.raises(ValueError):
+        tag_groups([photo], fast=3)
+
+
+def test_families_are_extracted_in_separate_calls(tmp_path):
+    photo, clip = tmp_path / "a.jpg", tmp_path / "b.mov"
+    session = FakeSession({
+        str(photo.resolve()): {"DateTimeOriginal": "2023:01:01 10:00:00"},
+        str(clip.resolve()): {"MediaCreateDate": "2023:01:02 10:00:00"},
+    })
+
+    result = extract_metadata_batch([photo, clip], session=session)
+
+    assert len(session.calls) == 2
+    assert "-DateTimeOriginal" in tags_of(session.calls[0])
+    assert "-TrackCreateDate" in tags_of(session.calls[1])
+    assert result[clip.resolve()].datetime_original == "2023:01:02 10:00:00"
+
+
+def test_failed_family_keeps_other_family_results(tmp_path):
+    photo, clip = tmp_path / "a.jpg", tmp_path / "b.mp4"
+    session = FakeSession({str(photo.resolve()): {"DateTimeOriginal": "2023:01:01 10:00:00"}})
+    original = session.execute
+
+    def execute(args, timeout=None, idle_timeout=None):
+        if str(clip.resolve()) in args:
+            raise ExifToolError("broken")
+        return original(args, timeout, idle_timeout)
+
+    session.execute = execute
+    report = ExtractionReport()
+    result = extract_metadata_batch([photo, clip], session=session, report=report)
+
+    assert set(result) == {photo.resolve()}
+    assert clip in report.failures
+
+
+def test_fast_requeries_undated_files_with_full_tags(tmp_path):
+    dated, undated = tmp_path / "a.jpg", tmp_path / "b.jpg"
+    session = FakeSession({str(dated.resolve()): {"DateTimeOriginal": "2023:01:01 10:00:00"}})
+    original = session._output
+
+    def output(args):
+        # -fast2 없이 끝까지 읽어야 b.jpg의 촬영일을 찾는다.
+        if "-fast2" not in args:
+            session.records[str(undated.resolve())] = {"DateTimeOriginal": "2023:01:03 10:00:00"}
+        return original(args)
+
+    session._output = output
+    report = ExtractionReport()
+    result = extract_metadata_batch([dated, undated], session=session, report=report, fast=2)
+
+    assert "-fast2" in session.calls[0]
+    assert session.calls[1][2:-1] == EXIFTOOL_TAGS
+    assert session.calls[1][-1] == str(undated.resolve())
+    assert report.fast_requeried == 1
+    assert result[undated.resolve()].datetime_original == "2023:01:03 10:00:00"
+
+
+def test_stream_holds_undated_records_until_requery(tmp_path):
+    undated, dated = tmp_path / "a.jpg", tmp_path / "b.jpg"
+    session = FakeSession({str(dated.resolve()): {"DateTimeOriginal": "2023:01:01 10:00:00"}})
+
+    order = [path for path, _ in iter_metadata_batch([undated, dated], session=session, fast=1)]
+
+    assert order == [dated.resolve(), undated.resolve()]
+    assert "-fast" in session.calls[0]
+    assert session.calls[1][2:-1] == EXIFTOOL_TAGS
+
+
+def test_file_processor_passes_fast_level(tmp_path):
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    (src_dir / "IMG_0001.jpg").write_bytes(b"x")
+    batch = MagicMock(return_value={})
+
+    processor = FileProcessor(str(src_dir), Queue(), use_metadata_cache=False, exiftool_fast=1)
+    with patch("msr.core.file_processor.extract_metadata_batch", batch):
+        processor.process_files()
+
+    assert batch.call_args.kwargs["fast"] == 1
+    with pytest.raises(ValueError):
+        FileProcessor(str(src_dir), Queue(), exiftool_fast=5)
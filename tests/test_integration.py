@@ -131,4 +131,49 @@ def test_idempotency_on_re_run(integration_setup):
         processor.process_files()
         
     # 두 번째 실행 결과에서 '이미 존재하여 스킵' 카운트 확인 (Summary 초기화 로직에 따라 다를 수 있음)
-    assert processor.summary.skipped_already_exists > 0
\ No newline at end of file
+    assert processor.summary.skipped_already_exists > 0
+
+
+@pytest.mark.parametrize("output_mode", ["hardlink", "move"])
+def test_output_modes_link_or_move_results(integration_setup, patch_extraction, output_mode):
+    """
+    hardlink/move 출력 방식: 결과 파일은 같고, 재실행 시 멱등성/충돌 판정이 그대로 동작합니다.
+    """
+    src_dir, files = integration_setup
+    valid_inode = files["valid"].stat().st_ino
+    mock_metadata = {
+        files["valid"]: MetaRecord(datetime_original="2023:01:01 10:00:00", normalized_camera="EOSR7"),
+        files["collision"]: MetaRecord(datetime_original="2023:01:01 10:00:00", normalized_camera="EOSR7"),
+    }
+
+    processor = FileProcessor(
+        str(src_dir), Queue(), use_metadata_cache=False, output_mode=output_mode
+    )
+    with patch_extraction(mock_metadata):
+        processor.process_files()
+        first = processor.summary
+        processor.summary = type(first)()
+        processor.process_files()
+
+    result_dir = src_dir / "result" / "2023-01-01"
+    out = result_dir / "2023-01-01_10-00-00_1234_EOSR7.jpg"
+    assert out.read_text() == "valid_content"
+    assert (result_dir / "2023-01-01_10-00-00_12341_EOSR7.jpg").read_text() == "collision_content"
+    assert out.stat().st_ino == valid_inode  # 데이터를 복사하지 않았다
+    assert first.converted_success == 2
+
+    if output_mode == "hardlink":
+        assert files["valid"].exists()
+        assert first.copy_methods == {"hardlink": 2}
+        # 재실행: 같은 inode는 같은 파일로 보고 충돌 번호를 새로 만들지 않는다.
+        assert processor.summary.skipped_already_exists == 2
+        assert processor.summary.collisions_resolved == 1
+        assert len(list(result_dir.iterdir())) == 2
+    else:
+        assert not files["valid"].exists() and not files["collision"].exists()
+        assert first.copy_methods == {"rename": 2}
+
+
+def test_invalid_output_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        FileProcessor(str(tmp_path), Queue(), output_mode="symlink")
@@ -0,0 +1,163 @@
+import pytest
+import struct
+from datetime import datetime
+
+from msr.core.isobmff import format_quicktime_time, read_isobmff_tags
+from msr.core.native_exif import extract_native_metadata
+
+# HEIC Exif 아이템 / CR3 CMT 블록용 TIFF 빌더 재사용
+from test_native_exif import CANON_TAGS, build_tiff
+
+QT_EPOCH = datetime(1904, 1, 1)
+
+
+def box(box_type: bytes, payload: bytes = b"") -> bytes:
+    return struct.pack(">I4s", len(payload) + 8, box_type) + payload
+
+
+def full_box(box_type: bytes, payload: bytes, version: int = 0) -> bytes:
+    return box(box_type, bytes([version, 0, 0, 0]) + payload)
+
+
+def qt_time(text: str) -> int:
+    return int((datetime.strptime(text, "%Y:%m:%d %H:%M:%S") - QT_EPOCH).total_seconds())
+
+
+def header_box(box_type: bytes, created: int, version: int = 0) -> bytes:
+    if version == 1:
+        return full_box(box_type, struct.pack(">QQ", created, created) + b"\x00" * 20, 1)
+    return full_box(box_type, struct.pack(">II", created, created) + b"\x00" * 20)
+
+
+def data_box(text: str) -> bytes:
+    return box(b"data", struct.pack(">II", 1, 0) + text.encode("utf-8"))
+
+
+def build_moov(media: str, movie: str, track: str, make_model=("Apple", "iPhone 13 Pro")) -> bytes:
+    keys = [b"com.apple.quicktime.make", b"com.apple.quicktime.model"]
+    keys_box = full_box(b"keys", struct.pack(">I", len(keys)) + b"".join(
+        struct.pack(">I4s", len(k) + 8, b"mdta") + k for k in keys))
+    ilst = box(b"ilst", b"".join(
+        box(struct.pack(">I", i + 1), data_box(v)) for i, v in enumerate(make_model)))
+    meta = box(b"meta", full_box(b"hdlr", b"\x00" * 4 + b"mdta" + b"\x00" * 13) + keys_box + ilst)
+    trak = box(b"trak", header_box(b"tkhd", qt_time(track)) +
+               box(b"mdia", header_box(b"mdhd", qt_time(media), version=1)))
+    return box(b"moov", header_box(b"mvhd", qt_time(movie)) + trak + meta)
+
+
+def test_format_quicktime_time():
+    assert format_quicktime_time(qt_time("2023:01:01 10:00:00")) == "2023:01:01 10:00:00"
+    assert format_quicktime_time(0) == "0000:00:00 00:00:00"
+    # 1970 이전 값은 ExifTool처럼 Unix 시간으로 간주
+    assert format_quicktime_time(86400) == "1970:01:02 00:00:00"
+
+
+def test_read_mov_with_moov_after_large_mdat(tmp_path):
+    """
+    moov가 거대한 mdat(64비트 크기) 뒤에 있어도 mdat을 건너뛰고 태그를 읽어야 합니다.
+    """
+    path = tmp_path / "IMG_0001.MOV"
+    mdat_size = 5 * 1024**3  # 5 GiB (sparse)
+    with open(path, "wb") as f:
+        f.write(box(b"ftyp", b"qt  \x00\x00\x00\x00qt  "))
+        f.write(struct.pack(">I4sQ", 1, b"mdat", mdat_size))
+        f.truncate(f.tell() + mdat_size - 16)
+        f.seek(0, 2)
+        f.write(build_moov("2023:05:01 09:00:00", "2023:05:01 09:00:01", "2023:05:01 09:00:02"))
+
+    tags = read_isobmff_tags(path)
+    assert tags == {
+        "MediaCreateDate": "2023:05:01 09:00:00",
+        "CreateDate": "2023:05:01 09:00:01",
+        "TrackCreateDate": "2023:05:01 09:00:02",
+        "Make": "Apple",
+        "Model": "iPhone 13 Pro",
+    }
+
+
+def test_read_mp4_udta_make_model(tmp_path):
+    path = tmp_path / "clip.mp4"
+    mak = struct.pack(">HH", 5, 0) + b"Canon"
+    mod = struct.pack(">HH", 12, 0) + b"Canon EOS R7"
+    trak = box(b"trak", box(b"mdia", header_box(b"mdhd", qt_time("2023:02:02 02:02:02"))))
+    moov = box(b"moov", trak + box(b"udta", box(b"\xa9mak", mak) + box(b"\xa9mod", mod)))
+    path.write_bytes(box(b"ftyp", b"mp42\x00\x00\x00\x00") + moov)
+
+    tags = read_isobmff_tags(path)
+    assert tags["MediaCreateDate"] == "2023:02:02 02:02:02"
+    assert tags["Make"] == "Canon"
+    assert tags["Model"] == "Canon EOS R7"
+
+
+def test_read_heic_exif_item(tmp_path):
+    path = tmp_path / "IMG_0002.HEIC"
+    tiff = build_tiff(">", **CANON_TAGS)
+    exif_item = struct.pack(">I", 0) + tiff
+
+    infe = full_box(b"infe", struct.pack(">HH4s", 7, 0, b"Exif") + b"\x00", version=2)
+    iinf = full_box(b"iinf", struct.pack(">H", 1) + infe)
+    ftyp = box(b"ftyp", b"heic\x00\x00\x00\x00mif1heic")
+
+    def build(offset):
+        # iloc v0: offset_size=4, length_size=4, base_offset_size=0
+        iloc = full_box(b"iloc", bytes([0x44, 0x00]) + struct.pack(">HHHHII", 1, 7, 0, 1, offset, len(exif_item)))
+        return ftyp + box(b"meta", full_box(b"hdlr", b"\x00" * 4 + b"pict" + b"\x00" * 13) + iinf + iloc)
+
+    head = build(0)
+    mdat_header_len = 8
+    path.write_bytes(build(len(head) + mdat_header_len) + box(b"mdat", exif_item))
+
+    tags = read_isobmff_tags(path)
+    assert tags is not None
+    assert tags["DateTimeOriginal"] == "2023:01:01 10:00:00"
+    assert tags["Make"] == "Canon"
+
+
+def test_read_cr3_canon_uuid(tmp_path):
+    path = tmp_path / "IMG_0003.CR3"
+    cmt1 = build_tiff("<", ifd0={0x010F: "Canon", 0x0110: "Canon EOS R7"})
+    cmt2 = build_tiff("<", ifd0={0x9003: "2023:03:03 03:03:03"})
+    uuid = box(b"uuid", bytes.fromhex("85c0b687820f11e08111f4ce462b6a48") +
+               box(b"CMT1", cmt1) + box(b"CMT2", cmt2))
+    path.write_bytes(box(b"ftyp", b"crx \x00\x00\x00\x01crx isom") + box(b"moov", uuid))
+
+    tags = read_isobmff_tags(path)
+    assert tags == {"Make": "Canon", "Model": "Canon EOS R7", "DateTimeOriginal": "2023:03:03 03:03:03"}
+
+
+@pytest.mark.parametrize("name, content", [
+    ("bad.mov", b"\x00\x00\x00\x02junk"),           # 잘못된 박스 크기
+    ("bad.mp4", b"\x00\x00\x01\x00moov\x00\x00"),   # 부모 범위를 넘는 박스
+    ("photo.jpg", b"\xff\xd8"),                     # 지원하지 않는 확장자
+])
+def test_read_isobmff_tags_invalid_returns_none(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    assert read_isobmff_tags(path) is None
+
+
+def test_extract_native_metadata_video_uses_video_priority(tmp_path):
+    path = tmp_path / "IMG_0004.mov"
+    path.write_bytes(box(b"ftyp", b"qt  ") +
+                     build_moov("2023:05:01 09:00:00", "2023:05:01 08:00:00", "2023:05:01 07:00:00"))
+
+    handled, remaining = extract_native_metadata([path])
+
+    assert remaining == []
+    meta = handled[path.resolve()]
+    assert meta.datetime_original == "2023:05:01 09:00:00"  # MediaCreateDate 우선
+    assert meta.normalized_camera == "iPhone"
+
+
+def test_extract_native_metadata_video_without_camera_falls_back(tmp_path):
+    """
+    MediaCreateDate가 있어도 Make/Model 박스가 없으면 ExifTool로 넘겨야 합니다.
+    """
+    path = tmp_path / "IMG_0005.mp4"
+    trak = box(b"trak", box(b"mdia", header_box(b"mdhd", qt_time("2023:02:02 02:02:02"))))
+    path.write_bytes(box(b"ftyp", b"mp42") + box(b"moov", trak))
+
+    handled, remaining = extract_native_metadata([path])
+
+    assert handled == {}
+    assert remaining == [path]
@@ -0,0 +1,96 @@
+import os
+import pytest
+from unittest.mock import patch
+
+from msr.core.copy_engine import PARTIAL_SUFFIX, copy_with_engine, partial_path
+from msr.core.journal import JOURNAL_FILENAME, RunJournal
+from msr.core.manifest import OUTCOME_CONVERTED
+from msr.core.metadata import MetaRecord
+
+
+def test_interrupted_copy_leaves_no_file_at_final_name(tmp_path):
+    src = tmp_path / "src.mov"
+    src.write_bytes(b"x" * 4096)
+    dst = tmp_path / "out" / "dst.mov"
+    dst.parent.mkdir()
+
+    def half_copy(src_fd, dst_fd, size):
+        os.write(dst_fd, b"x" * (size // 2))
+        raise KeyboardInterrupt  # 복사 도중 중단
+
+    with patch("msr.core.copy_engine._copy_data", side_effect=half_copy):
+        with pytest.raises(KeyboardInterrupt):
+            copy_with_engine(src, dst)
+    assert list(dst.parent.iterdir()) == []
+
+    stats = copy_with_engine(src, dst, durability="full")
+    assert dst.read_bytes() == src.read_bytes() and stats.bytes_copied == 4096
+    assert not partial_path(dst).exists()
+
+
+def test_copy_does_not_replace_existing_destination(tmp_path):
+    src = tmp_path / "a.jpg"
+    src.write_bytes(b"new")
+    dst = tmp_path / "b.jpg"
+    dst.write_bytes(b"old")
+    with pytest.raises(FileExistsError):
+        copy_with_engine(src, dst)
+    assert dst.read_bytes() == b"old"
+    assert not partial_path(dst).exists()
+
+
+def test_journal_round_trip_ignores_truncated_line(tmp_path):
+    result = tmp_path / "result"
+    result.mkdir()
+    src = tmp_path / "IMG_0001.jpg"
+    path = result / JOURNAL_FILENAME
+
+    journal = RunJournal(path, tmp_path, result)
+    assert not journal.interrupted
+    journal.commit(src, 10, 123, result / "2023-01-01" / "x.jpg", OUTCOME_CONVERTED)
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"src": "IMG_0002.jpg", "si')  # 쓰는 도중 종료
+
+    with RunJournal(path, tmp_path, result) as resumed:
+        assert resumed.interrupted and len(resumed) == 1
+        assert resumed.is_committed(src, 10, 123)
+        assert not resumed.is_committed(src, 10, 124)  # 그 뒤로 바뀐 파일은 다시 처리
+        resumed.complete()
+    assert not path.exists()
+
+
+def test_restarted_run_resumes_after_last_committed_file(tmp_path, run_processor):
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    files = []
+    for i in range(1, 4):
+        f = src_dir / f"IMG_{i:04d}.jpg"
+        f.write_bytes(b"x" * i)
+        files.append(f)
+    meta = MetaRecord(datetime_original="2023:01:01 10:00:00", normalized_camera="EOSR7")
+
+    # 앞 실행: 첫 파일을 확정한 뒤, 두 번째 파일을 복사하던 중 강제 종료됨
+    out_dir = src_dir / "result" / "2023-01-01"
+    out_dir.mkdir(parents=True)
+    first_dst = out_dir / "2023-01-01_10-00-00_0001_EOSR7.jpg"
+    first_dst.write_bytes(b"x")
+    partial = out_dir / f".2023-01-01_10-00-00_0002_EOSR7.jpg.999{PARTIAL_SUFFIX}"
+    partial.write_bytes(b"x")
+    st = files[0].stat()
+    with RunJournal(src_dir / "result" / JOURNAL_FILENAME, src_dir, src_dir / "result") as journal:
+        journal.commit(files[0], st.st_size, st.st_mtime_ns, first_dst, OUTCOME_CONVERTED)
+
+    run = run_processor(src_dir, default=meta)
+    processor = run.processor
+
+    assert run.extraction.extracted == files[1:]
+    assert not partial.exists()
+    assert sorted(p.name for p in out_dir.iterdir()) == [
+        "2023-01-01_10-00-00_0001_EOSR7.jpg",
+        "2023-01-01_10-00-00_0002_EOSR7.jpg",
+        "2023-01-01_10-00-00_0003_EOSR7.jpg",
+    ]
+    assert processor.summary.skipped_resumed == 1
+    assert processor.summary.converted_success == 2
+    assert not (src_dir / "result" / JOURNAL_FILENAME).exists()  # 완료되면 지운다
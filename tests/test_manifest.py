@@ -0,0 +1,112 @@
+import os
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from msr.core.dest_index import DestinationIndex
+from msr.core.manifest import (
+    MANIFEST_FILENAME,
+    OUTCOME_CONVERTED,
+    OUTCOME_ERROR,
+    SourceManifest,
+)
+from msr.core.metadata import MetaRecord
+
+
+@pytest.fixture
+def manifest_setup(tmp_path):
+    src = tmp_path / "source"
+    result = src / "result"
+    result.mkdir(parents=True)
+    return src, result
+
+
+def test_manifest_persists_and_detects_changes(manifest_setup):
+    src, result = manifest_setup
+    f = src / "IMG_0001.jpg"
+    f.write_text("a")
+    dst = result / "2023-01-01" / "out.jpg"
+    dst.parent.mkdir()
+    dst.write_text("a")
+
+    with SourceManifest(result / MANIFEST_FILENAME, src, result) as manifest:
+        manifest.record(f, 1, 100, dst, OUTCOME_CONVERTED)
+
+    manifest = SourceManifest(result / MANIFEST_FILENAME, src, result)
+    manifest.load()
+    assert manifest.get(f).destination == "2023-01-01/out.jpg"
+    assert manifest.is_unchanged(f, 1, 100)
+    assert not manifest.is_unchanged(f, 2, 100)
+    assert not manifest.is_unchanged(f, 1, 101)
+    assert not manifest.is_unchanged(src / "IMG_0002.jpg", 1, 100)
+
+    # 결과 파일이 지워졌으면 다음 실행(새 결과 폴더 색인)에서 다시 처리한다.
+    dst.unlink()
+    assert not manifest.is_unchanged(f, 1, 100, DestinationIndex(result))
+    manifest.close()
+
+
+def test_unchanged_check_reads_each_result_folder_once(manifest_setup):
+    src, result = manifest_setup
+    (result / "2023-01-01").mkdir()
+    names = [f"IMG_000{i}.jpg" for i in range(5)]
+    with SourceManifest(result / MANIFEST_FILENAME, src, result) as manifest:
+        for name in names:
+            (result / "2023-01-01" / name).write_text("a")
+            manifest.record(src / name, 1, 100, result / "2023-01-01" / name, OUTCOME_CONVERTED)
+
+    with SourceManifest(result / MANIFEST_FILENAME, src, result) as manifest:
+        manifest.load()
+        with patch.object(Path, "exists", side_effect=AssertionError("파일마다 stat")), \
+                patch("msr.core.dest_index.os.stat", side_effect=AssertionError("파일마다 stat")):
+            assert all(manifest.is_unchanged(src / name, 1, 100) for name in names)
+        assert manifest.dest_index.dir_loads == 1
+
+
+def test_manifest_retries_errors(manifest_setup):
+    src, result = manifest_setup
+    f = src / "IMG_0001.jpg"
+    with SourceManifest(result / MANIFEST_FILENAME, src, result) as manifest:
+        manifest.record(f, 1, 100, None, OUTCOME_ERROR)
+    with SourceManifest(result / MANIFEST_FILENAME, src, result) as manifest:
+        manifest.load()
+        assert not manifest.is_unchanged(f, 1, 100)
+
+
+def test_incremental_run_processes_only_new_and_changed_files(tmp_path, run_processor):
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    meta = MetaRecord(datetime_original="2023:01:01 10:00:00", normalized_camera="EOSR7")
+    old = src_dir / "IMG_0001.jpg"
+    changed = src_dir / "IMG_0002.jpg"
+    no_date = src_dir / "IMG_0003.jpg"
+    for f in (old, changed, no_date):
+        f.write_text(f.name)
+    metadata = {old: meta, changed: meta, no_date: MetaRecord(datetime_original=None)}
+
+    summary = run_processor(src_dir, metadata, incremental=True).summary
+    assert summary.converted_success == 2
+    assert summary.skipped_no_datetime == 1
+    assert summary.skipped_unchanged == 0
+
+    new = src_dir / "IMG_0004.jpg"
+    new.write_text("new")
+    metadata[new] = MetaRecord(datetime_original="2023:01:02 10:00:00", normalized_camera="EOSR7")
+    changed.write_text("changed content")
+    st = changed.stat()
+    os.utime(changed, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    metadata[changed] = MetaRecord(datetime_original="2023:01:03 10:00:00", normalized_camera="EOSR7")
+
+    run = run_processor(src_dir, metadata, incremental=True)
+    summary = run.summary
+    assert sorted(run.extraction.extracted) == [changed, new]
+    assert summary.total_files == 2
+    assert summary.skipped_unchanged == 2
+    assert summary.converted_success == 2
+    assert "스킵 (변경 없음): 2" in str(summary)
+
+    # 증분 모드가 아니면 모든 파일을 다시 본다.
+    run = run_processor(src_dir, metadata, incremental=False)
+    summary = run.summary
+    assert len(run.extraction.extracted) == 4
+    assert summary.skipped_unchanged == 0
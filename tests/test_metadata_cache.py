@@ -0,0 +1,144 @@
+import pytest
+import os
+from pathlib import Path
+from queue import Queue
+from unittest.mock import patch
+
+from msr.core.file_processor import FileProcessor
+from msr.core.metadata import MetaRecord
+from msr.core.metadata_cache import CACHE_FILENAME, MetadataCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with MetadataCache(tmp_path / CACHE_FILENAME) as c:
+        yield c
+
+
+def make_file(path: Path, content: str = "data") -> Path:
+    path.write_text(content)
+    return path
+
+
+def test_cache_miss_then_hit(tmp_path, cache):
+    f = make_file(tmp_path / "IMG_0001.jpg")
+    meta = MetaRecord(datetime_original="2023:01:01 10:00:00", camera_make="Canon",
+                      camera_model="Canon EOS R7", normalized_camera="EOSR7")
+
+    hits, misses = cache.lookup([f])
+    assert hits == {}
+    assert misses == [f]
+
+    cache.store({f.resolve(): meta})
+    hits, misses = cache.lookup([f])
+
+    assert misses == []
+    assert hits[f.resolve()] == meta
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_invalidated_when_file_changes(tmp_path, cache):
+    f = make_file(tmp_path / "IMG_0002.jpg")
+    cache.lookup([f])
+    cache.store({f.resolve(): MetaRecord(datetime_original="2023:01:01 10:00:00")})
+
+    f.write_text("changed content")
+    st = f.stat()
+    os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    hits, misses = cache.lookup([f])
+    assert hits == {}
+    assert misses == [f]
+
+
+def test_cache_persists_across_instances(tmp_path):
+    f = make_file(tmp_path / "IMG_0003.jpg")
+    db = tmp_path / CACHE_FILENAME
+    with MetadataCache(db) as c:
+        c.lookup([f])
+        c.store({f.resolve(): MetaRecord(datetime_original="2023:01:01 10:00:00")})
+
+    with MetadataCache(db) as c:
+        hits, _ = c.lookup([f])
+    assert hits[f.resolve()].datetime_original == "2023:01:01 10:00:00"
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    files = [make_file(tmp_path / f"IMG_{i}.jpg") for i in range(4)]
+    db = tmp_path / CACHE_FILENAME
+    with MetadataCache(db, max_entries=2) as c:
+        for i, f in enumerate(files):
+            c.lookup([f])
+            c.store({f.resolve(): MetaRecord(datetime_original=f"2023:01:0{i + 1} 10:00:00")})
+            # last_used 차이를 만들기 위해 직접 갱신
+            c._conn.execute("UPDATE metadata SET last_used = ? WHERE path = ?", (i, str(f.resolve())))
+        assert c.evict() == 2
+
+        hits, misses = c.lookup(files)
+    assert set(hits) == {files[2].resolve(), files[3].resolve()}
+    assert misses == files[:2]
+
+
+def test_close_is_idempotent(tmp_path):
+    c = MetadataCache(tmp_path / CACHE_FILENAME)
+    c.close()
+    c.close()
+
+
+def test_rerun_only_extracts_cache_misses(tmp_path):
+    """
+    재실행 시 변경되지 않은 파일은 ExifTool 추출 대상에서 빠지고, 요약에 적중/미적중이 기록되어야 합니다.
+    """
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    old_file = make_file(src_dir / "IMG_0001.mov", "old")
+    meta = {old_file: MetaRecord(datetime_original="2023:01:01 10:00:00", camera_make="Apple",
+                                 camera_model="iPhone 13", normalized_camera="iPhone")}
+
+    with patch("msr.core.file_processor.extract_metadata_batch", return_value=meta) as mock_extract:
+        FileProcessor(str(src_dir), Queue(), exiftool_workers=1).process_files()
+    mock_extract.assert_called_once()
+    assert (src_dir / "result" / CACHE_FILENAME).exists()
+
+    new_file = make_file(src_dir / "IMG_0002.mov", "new")
+    new_meta = {new_file: MetaRecord(datetime_original="2023:01:02 10:00:00", camera_make="Apple",
+                                     camera_model="iPhone 13", normalized_camera="iPhone")}
+    processor = FileProcessor(str(src_dir), Queue(), exiftool_workers=1)
+    with patch("msr.core.file_processor.extract_metadata_batch", return_value=new_meta) as mock_extract:
+        processor.process_files()
+
+    mock_extract.assert_called_once()
+    assert mock_extract.call_args[0][0] == [new_file]
+    assert processor.summary.metadata_cache_hits == 1
+    assert processor.summary.metadata_cache_misses == 1
+    assert processor.summary.converted_success == 1
+    assert processor.summary.skipped_already_exists == 1
+
+
+def test_cache_can_be_disabled(tmp_path):
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    make_file(src_dir / "IMG_0001.mov")
+
+    processor = FileProcessor(str(src_dir), Queue(), exiftool_workers=1, use_metadata_cache=False)
+    with patch("msr.core.file_processor.extract_metadata_batch", return_value={}):
+        processor.process_files()
+
+    assert not (src_dir / "result" / CACHE_FILENAME).exists()
+    assert processor.summary.metadata_cache_misses == 0
+
+
+def test_cache_lookup_uses_scanner_stats(tmp_path, cache):
+    """
+    수집 단계의 stat이 주어지면 그 값을 캐시 키로 사용하고 다시 stat하지 않아야 합니다.
+    """
+    f = make_file(tmp_path / "IMG_0004.jpg")
+    st = f.stat()
+    stats = {f: (st.st_size, st.st_mtime_ns, st.st_ino)}
+    cache.lookup([f], stats)
+    cache.store({f.resolve(): MetaRecord(datetime_original="2023:01:01 10:00:00")})
+
+    with patch.object(MetadataCache, "file_key", side_effect=AssertionError("stat called")):
+        hits, misses = cache.lookup([f], stats)
+    assert list(hits) == [f.resolve()]
+    assert misses == []
@@ -0,0 +1,182 @@
+import pytest
+import struct
+from queue import Queue
+from unittest.mock import patch
+
+from msr.core.file_processor import FileProcessor
+from msr.core.metadata import MetaRecord, extract_and_normalize_metadata
+from msr.core.native_exif import (
+    extract_native_metadata,
+    parse_tiff_tags,
+    read_exif_tags,
+)
+
+
+def build_tiff(endian: str = "<", ifd0: dict | None = None, exif: dict | None = None) -> bytes:
+    """
+    IFD0(ASCII 태그 + Exif 포인터)와 Exif IFD(ASCII 태그)만 가진 최소 TIFF 바이트를 만든다.
+    태그 값은 {tag_id: str} 형태.
+    """
+    ifd0 = ifd0 or {}
+    exif = exif or {}
+    magic = b"II*\x00" if endian == "<" else b"MM\x00*"
+
+    def ifd_size(n):
+        return 2 + n * 12 + 4
+
+    ifd0_entries = len(ifd0) + (1 if exif else 0)
+    ifd0_offset = 8
+    exif_offset = ifd0_offset + ifd_size(ifd0_entries)
+    data_offset = exif_offset + (ifd_size(len(exif)) if exif else 0)
+
+    blobs = b""
+
+    def entries_for(tags):
+        nonlocal blobs
+        out = []
+        for tag, text in sorted(tags.items()):
+            raw = text.encode("utf-8") + b"\x00"
+            if len(raw) <= 4:
+                field = raw.ljust(4, b"\x00")
+            else:
+                field = struct.pack(endian + "I", data_offset + len(blobs))
+                blobs += raw
+            out.append(struct.pack(endian + "HHI", tag, 2, len(raw)) + field)
+        return out
+
+    e0 = entries_for(ifd0)
+    if exif:
+        e0.append(struct.pack(endian + "HHII", 0x8769, 4, 1, exif_offset))
+    ifd0_bytes = struct.pack(endian + "H", len(e0)) + b"".join(e0) + b"\x00" * 4
+    exif_bytes = b""
+    if exif:
+        ee = entries_for(exif)
+        exif_bytes = struct.pack(endian + "H", len(ee)) + b"".join(ee) + b"\x00" * 4
+
+    return magic + struct.pack(endian + "I", ifd0_offset) + ifd0_bytes + exif_bytes + blobs
+
+
+def build_jpeg(tiff: bytes) -> bytes:
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    xmp = b"http://ns.adobe.com/xap/1.0/\x00<x/>"
+    app1_xmp = b"\xff\xe1" + struct.pack(">H", len(xmp) + 2) + xmp
+    payload = b"Exif\x00\x00" + tiff
+    app1 = b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+    return b"\xff\xd8" + app0 + app1_xmp + app1 + b"\xff\xda\x00\x02" + b"\x00" * 32 + b"\xff\xd9"
+
+
+CANON_TAGS = {
+    "ifd0": {0x010F: "Canon", 0x0110: "Canon EOS R7"},
+    "exif": {0x9003: "2023:01:01 10:00:00", 0x9004: "2023:01:01 10:00:01"},
+}
+
+
+@pytest.mark.parametrize("endian", ["<", ">"])
+def test_parse_tiff_tags_both_byte_orders(endian):
+    tags = parse_tiff_tags(build_tiff(endian, **CANON_TAGS))
+    assert tags == {
+        "Make": "Canon",
+        "Model": "Canon EOS R7",
+        "DateTimeOriginal": "2023:01:01 10:00:00",
+        "CreateDate": "2023:01:01 10:00:01",
+    }
+
+
+def test_parse_tiff_tags_rejects_non_tiff():
+    with pytest.raises(ValueError):
+        parse_tiff_tags(b"not a tiff header")
+
+
+def test_read_exif_tags_jpeg_skips_xmp_app1(tmp_path):
+    path = tmp_path / "IMG_0001.JPG"
+    path.write_bytes(build_jpeg(build_tiff(">", **CANON_TAGS)))
+
+    tags = read_exif_tags(path)
+    assert tags is not None
+    assert tags["DateTimeOriginal"] == "2023:01:01 10:00:00"
+    assert tags["Model"] == "Canon EOS R7"
+
+
+def test_read_exif_tags_dng(tmp_path):
+    path = tmp_path / "IMG_0002.dng"
+    path.write_bytes(build_tiff("<", **CANON_TAGS) + b"\x00" * 1024)
+
+    tags = read_exif_tags(path)
+    assert tags is not None
+    assert tags["CreateDate"] == "2023:01:01 10:00:01"
+
+
+@pytest.mark.parametrize("name, content", [
+    ("IMG_0003.jpg", b"plain text, not a jpeg"),
+    ("IMG_0004.jpg", b"\xff\xd8\xff\xda\x00\x02"),  # Exif 없이 바로 SOS
+    ("IMG_0005.dng", b"II*\x00\xff\xff\x00\x00"),    # IFD0 오프셋 범위 초과
+    ("IMG_0006.mp4", b"\x00\x00\x00\x18ftypmp42"),  # 지원하지 않는 확장자
+])
+def test_read_exif_tags_unhandled_returns_none(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    assert read_exif_tags(path) is None
+
+
+def test_extract_native_metadata_matches_exiftool_normalization(tmp_path):
+    """
+    내장 리더 결과는 같은 태그로 extract_and_normalize_metadata를 호출한 것과 동일해야 합니다.
+    """
+    path = tmp_path / "IMG_0007.jpg"
+    path.write_bytes(build_jpeg(build_tiff("<", **CANON_TAGS)))
+
+    handled, remaining = extract_native_metadata([path])
+
+    assert remaining == []
+    expected = extract_and_normalize_metadata(path.resolve(), {
+        "SourceFile": str(path),
+        "DateTimeOriginal": "2023:01:01 10:00:00",
+        "CreateDate": "2023:01:01 10:00:01",
+        "Make": "Canon",
+        "Model": "Canon EOS R7",
+    })
+    assert handled[path.resolve()] == expected
+    assert expected.normalized_camera == "EOSR7"
+
+
+def test_extract_native_metadata_defers_files_without_datetime_original(tmp_path):
+    """
+    DateTimeOriginal이 없거나 읽을 수 없는 파일은 입력 순서대로 ExifTool 대상으로 남아야 합니다.
+    """
+    no_dto = tmp_path / "IMG_0008.jpg"
+    no_dto.write_bytes(build_jpeg(build_tiff("<", ifd0={0x010F: "Apple"},
+                                             exif={0x9004: "2023:01:01 10:00:00"})))
+    video = tmp_path / "IMG_0009.mov"
+    video.write_bytes(b"\x00" * 16)
+    good = tmp_path / "IMG_0010.jpg"
+    good.write_bytes(build_jpeg(build_tiff("<", **CANON_TAGS)))
+
+    handled, remaining = extract_native_metadata([no_dto, video, good])
+
+    assert remaining == [no_dto, video]
+    assert list(handled) == [good.resolve()]
+
+
+def test_native_exif_files_bypass_exiftool(tmp_path):
+    """
+    내장 EXIF 리더로 처리된 JPEG는 ExifTool 배치에 포함되지 않아야 합니다.
+    """
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    native_file = src_dir / "IMG_0001.jpg"
+    native_file.write_bytes(build_jpeg(build_tiff("<", **CANON_TAGS)))
+    other_file = src_dir / "IMG_0002.mov"
+    other_file.write_text("video")
+
+    event_queue = Queue()
+    processor = FileProcessor(str(src_dir), event_queue, exiftool_workers=1)
+    mock_metadata = {other_file: MetaRecord(datetime_original="2023:01:02 10:00:00", normalized_camera="iPhone")}
+
+    with patch("msr.core.file_processor.extract_metadata_batch", return_value=mock_metadata) as mock_extract:
+        processor.process_files()
+
+    mock_extract.assert_called_once()
+    assert mock_extract.call_args[0][0] == [other_file]
+    assert processor.summary.converted_success == 2
+    assert (src_dir / "result" / "2023-01-01" / "2023-01-01_10-00-00_0001_EOSR7.jpg").exists()
+    assert (src_dir / "result" / "2023-01-02" / "2023-01-02_10-00-00_0002_iPhone.mov").exists()
@@ -0,0 +1,119 @@
+import threading
+import time
+import pytest
+
+from msr.core.metadata import MetaRecord
+from msr.core.pipeline import Channel, PipelineAborted, Stage
+
+
+def test_channel_preserves_order_until_close():
+    abort = threading.Event()
+    channel = Channel(3, abort)
+
+    def produce():
+        for i in range(10):
+            channel.put(i)
+        channel.close()
+
+    producer = Stage("producer", produce, abort)
+    producer.start()
+    assert list(channel) == list(range(10))
+    producer.join_and_raise()
+
+
+def test_channel_put_blocks_when_full_and_wakes_on_abort():
+    """가득 찬 Channel은 생산자를 대기시키고(back-pressure), abort가 설정되면 깨운다."""
+    abort = threading.Event()
+    channel = Channel(2, abort)
+    channel.put(1)
+    channel.put(2)
+
+    producer = Stage("producer", lambda: channel.put(3), abort)
+    producer.start()
+    time.sleep(0.3)
+    assert producer.is_alive()
+
+    abort.set()
+    producer.join(timeout=2)
+    assert not producer.is_alive()
+    assert producer.error is None  # PipelineAborted는 정상 종료로 본다
+    with pytest.raises(PipelineAborted):
+        next(iter(channel))
+
+
+def test_stage_error_sets_abort_and_is_reraised():
+    abort = threading.Event()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    stage = Stage("failing", fail, abort)
+    stage.start()
+    with pytest.raises(RuntimeError, match="boom"):
+        stage.join_and_raise()
+    assert abort.is_set()
+
+
+def test_pipeline_logs_in_source_order_with_collisions(tmp_path, run_processor):
+    """
+    같은 결과명을 가진 파일이 여러 chunk에 걸쳐 있어도, 로그/충돌 번호가 소스 정렬 순서대로 결정된다.
+    """
+    src_dir = tmp_path / "source"
+    files = []
+    for i in range(8):
+        sub = src_dir / f"d{i:02d}"
+        sub.mkdir(parents=True)
+        f = sub / "IMG_1234.jpg"
+        f.write_text("x" * (i + 1))  # 크기가 달라야 같은 파일로 보지 않는다
+        files.append(f)
+    meta = MetaRecord(datetime_original="2023:01:01 10:00:00", normalized_camera="EOSR7")
+    metadata = {f: meta for f in files}
+
+    run = run_processor(
+        src_dir, metadata, exiftool_workers=2, chunk_min_size=1, chunk_max_size=3
+    )
+    processor, events = run.processor, run.events
+
+    summary = next(e["summary"] for e in events if e["type"] == "COMPLETE")
+    assert summary.total_files == 8
+    assert summary.converted_success == 8
+    assert summary.collisions_resolved == 7
+
+    successes = [e["msg"] for e in events if e["type"] == "LOG" and e["msg"].startswith("성공:")]
+    expected = [
+        f"성공: IMG_1234.jpg -> 2023-01-01_10-00-00_1234{n or ''}_EOSR7.jpg" for n in range(8)
+    ]
+    assert successes == expected
+    for n, f in enumerate(files):
+        suffix = str(n or "")
+        out = src_dir / "result" / "2023-01-01" / f"2023-01-01_10-00-00_1234{suffix}_EOSR7.jpg"
+        assert out.read_text() == f.read_text()
+
+    progress = [e["current"] for e in events if e["type"] == "PROGRESS"]
+    assert progress == sorted(progress)
+    assert progress[-1] == 8
+    # 충돌 번호는 복사 전에 실행 전체에 대해 정해진다.
+    assert [t.final_dst_path.name for t in processor.run_plan] == [
+        f"2023-01-01_10-00-00_1234{n or ''}_EOSR7.jpg" for n in range(8)
+    ]
+
+
+def test_pipeline_stop_event_ends_all_stages(tmp_path, run_processor):
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    files = []
+    for i in range(50):
+        f = src_dir / f"IMG_{i:04d}.jpg"
+        f.write_text("x")
+        files.append(f)
+    meta = MetaRecord(datetime_original="2023:01:01 10:00:00", normalized_camera="EOSR7")
+    stop_event = threading.Event()
+    stop_event.set()
+
+    events = run_processor(
+        src_dir, {f: meta for f in files}, stop_event=stop_event, chunk_min_size=1
+    ).events
+
+    logs = [e["msg"] for e in events if e["type"] == "LOG"]
+    assert logs.count("작업이 사용자에 의해 중단되었습니다.") <= 1
+    assert not any(t.name.startswith("msr-") for t in threading.enumerate())
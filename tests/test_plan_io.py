@@ -0,0 +1,151 @@
+import os
+import pytest
+from pathlib import Path
+from queue import Queue
+from unittest.mock import patch
+
+from msr.core.copy_engine import PARTIAL_SUFFIX
+from msr.core.exiftool import ExifToolError
+from msr.core.file_processor import FileProcessor
+from msr.core.journal import JOURNAL_FILENAME
+from msr.core.metadata import MetaRecord
+from msr.core.plan_io import PlanFileError, PlanRow, PlanWriter, read_plan
+
+META = MetaRecord(datetime_original="2023:01:01 10:00:00", normalized_camera="EOSR7")
+
+
+def _source(tmp_path: Path) -> list[Path]:
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    files = []
+    for name in ("IMG_0001.jpg", "IMG_0002.jpg", "DSC0003.jpg"):
+        f = src_dir / name
+        f.write_bytes(name.encode())
+        files.append(f)
+    return files
+
+
+@pytest.fixture
+def dry_run(run_processor):
+    """모든 파일에 META를 돌려주는 추출로 계획만 세워 plan_file에 쓴다."""
+
+    def run(src_dir: Path, plan_file: Path) -> FileProcessor:
+        run = run_processor(src_dir, default=META, dry_run=True, plan_path=str(plan_file))
+        return run.processor
+
+    return run
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".csv"])
+def test_plan_file_round_trip(tmp_path, suffix):
+    rows = [
+        PlanRow("a/IMG_0001.jpg", 10, 123, "COPY_RENAME", "2023-01-01/x.jpg", "2023-01-01/x_1.jpg"),
+        PlanRow("b.jpg", 3, 4, "SKIP", reason="IMG 패턴 아님"),
+        PlanRow("c.jpg", None, None, "ERROR", reason="메타데이터 추출 실패, \"따옴표\""),
+        PlanRow("d.jpg", 1, 2, "COPY_PASS", "2023-01-01/d.jpg", "2023-01-01/d.jpg", True),
+    ]
+    path = tmp_path / f"plan{suffix}"
+    with PlanWriter(path) as writer:
+        for row in rows:
+            writer.write(row)
+    assert list(read_plan(path)) == rows
+
+
+def test_read_plan_rejects_paths_outside_roots(tmp_path):
+    path = tmp_path / "plan.jsonl"
+    with PlanWriter(path) as writer:
+        writer.write(PlanRow("a.jpg", 1, 2, "COPY_PASS", "../../etc/x.jpg", "../../etc/x.jpg"))
+    with pytest.raises(PlanFileError):
+        list(read_plan(path))
+
+
+def test_dry_run_writes_plan_and_copies_nothing(tmp_path, dry_run):
+    files = _source(tmp_path)
+    src_dir = files[0].parent
+    plan_file = tmp_path / "plan.csv"
+
+    processor = dry_run(src_dir, plan_file)
+
+    rows = list(read_plan(plan_file))
+    assert [r.src for r in rows] == ["DSC0003.jpg", "IMG_0001.jpg", "IMG_0002.jpg"]
+    assert [r.action for r in rows] == ["SKIP", "COPY_RENAME", "COPY_RENAME"]
+    assert rows[1].final_dst == "2023-01-01/2023-01-01_10-00-00_0001_EOSR7.jpg"
+    assert rows[1].size == files[0].stat().st_size
+    assert rows[1].mtime_ns == files[0].stat().st_mtime_ns
+    assert not (src_dir / "result" / "2023-01-01").exists()
+    assert not (src_dir / "result" / JOURNAL_FILENAME).exists()
+    assert processor.summary.converted_success == 0
+
+
+def test_dry_run_records_batch_failure_per_file(tmp_path):
+    files = _source(tmp_path)
+    plan_file = tmp_path / "plan.jsonl"
+    processor = FileProcessor(
+        str(files[0].parent), Queue(), use_metadata_cache=False, dry_run=True,
+        plan_path=str(plan_file),
+    )
+    with patch(
+        "msr.core.file_processor.extract_metadata_batch", side_effect=ExifToolError("boom")
+    ):
+        processor.process_files()
+    rows = list(read_plan(plan_file))
+    assert len(rows) == 3 and {r.action for r in rows} == {"ERROR"}
+
+
+def test_apply_plan_copies_without_extraction(tmp_path, dry_run):
+    files = _source(tmp_path)
+    src_dir = files[0].parent
+    plan_file = tmp_path / "plan.jsonl"
+    dry_run(src_dir, plan_file)
+
+    processor = FileProcessor(str(src_dir), Queue(), use_metadata_cache=False)
+    with patch(
+        "msr.core.file_processor.extract_metadata_batch", side_effect=AssertionError("ExifTool")
+    ), patch("msr.core.file_processor.ExifToolPool", side_effect=AssertionError("ExifTool")):
+        processor.apply_plan(str(plan_file))
+
+    out_dir = src_dir / "result" / "2023-01-01"
+    assert sorted(p.name for p in out_dir.iterdir()) == [
+        "2023-01-01_10-00-00_0001_EOSR7.jpg",
+        "2023-01-01_10-00-00_0002_EOSR7.jpg",
+    ]
+    assert processor.summary.converted_success == 2
+    assert processor.summary.skipped_not_img_pattern == 1
+    assert processor.summary.errors == 0
+
+
+def test_apply_plan_reports_source_changed_since_planning(tmp_path, dry_run):
+    files = _source(tmp_path)
+    src_dir = files[0].parent
+    plan_file = tmp_path / "plan.jsonl"
+    dry_run(src_dir, plan_file)
+
+    files[0].write_bytes(b"edited after planning")
+    os.unlink(files[1])
+    processor = FileProcessor(str(src_dir), Queue(), use_metadata_cache=False)
+    processor.apply_plan(str(plan_file))
+
+    assert processor.summary.errors == 2
+    assert not (src_dir / "result" / "2023-01-01").exists()
+    assert "계획 이후" in (src_dir / "result" / "error.log").read_text(encoding="utf-8")
+
+
+def test_apply_plan_sweeps_only_planned_folders(tmp_path, dry_run):
+    files = _source(tmp_path)
+    src_dir = files[0].parent
+    plan_file = tmp_path / "plan.jsonl"
+    dry_run(src_dir, plan_file)
+    planned = src_dir / "result" / "2023-01-01"
+    other = src_dir / "result" / "2022-12-31"
+    planned.mkdir()
+    other.mkdir()
+    (planned / f".x.jpg.1{PARTIAL_SUFFIX}").write_bytes(b"x")
+    (other / f".y.jpg.1{PARTIAL_SUFFIX}").write_bytes(b"y")
+
+    processor = FileProcessor(str(src_dir), Queue(), use_metadata_cache=False)
+    with patch("msr.core.copy_engine.os.walk", side_effect=AssertionError("result/ 전체 탐색")):
+        processor.apply_plan(str(plan_file))
+
+    assert not (planned / f".x.jpg.1{PARTIAL_SUFFIX}").exists()
+    assert (other / f".y.jpg.1{PARTIAL_SUFFIX}").exists()
+    assert processor.summary.converted_success == 2
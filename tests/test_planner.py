@@ -1,7 +1,7 @@
 import pytest
 from pathlib import Path
 from msr.core.metadata import MetaRecord
-from msr.core.planner import Action, Plan, generate_plan
+from msr.core.planner import Action, Plan, generate_plan, generate_plans
 
 # Mock Path objects for testing
 MOCK_SRC_PATH_IMG_JPG = Path("C:/source/photos/IMG_1234.JPG")
@@ -124,3 +124,32 @@ def test_generate_plan(src_path, meta_record, expected_plan):
     """
     actual_plan = generate_plan(src_path, meta_record)
     assert actual_plan == expected_plan
+
+
+# --- generate_plans tests ---
+
+BATCH_DATETIMES = [
+    None, "", "2023:01:01 10:00:00", "2023:01:01 10:00:00.123+09:00", "2023:01:01 10:00:00+09:00",
+    "2023:01:01 10:00:00-05:00", "2023:1:5 1:2:3", " 2023:01:01 10:00:00", "2024:02:29 10:00:00",
+    "2023:02:29 10:00:00", "1900:02:29 00:00:00", "2000:02:29 00:00:00", "2023:13:01 10:00:00",
+    "2023:04:31 10:00:00", "2023:01:01 24:00:00", "2023:01:01 23:59:60", "0999:01:01 00:00:00",
+    "2023:01:01 10:00:00Z", "2023:01:01  10:00:00", "2023-01-01 10:00:00", "garbage",
+]
+BATCH_NAMES = [
+    "IMG_1234.JPG", "img_12ab.heic", "IMG_1234567890123456.jpg", "2023-01-01_10-00-00_ID_CAM.mp4",
+    "2023-01-01_10-00-00_ID_\u212a.mp4", "IMG_\u212a1.jpg", "MyPhoto.PNG", "IMG_.jpg", "IMG_1234.",
+]
+
+
+def test_generate_plans_matches_generate_plan():
+    """일괄 API는 촬영일 형식/날짜 검증/파일명 패턴의 모든 경우에 generate_plan과 같은 결과를 낸다."""
+    records = [
+        (Path("C:/source") / name, MetaRecord(datetime_original=dt, normalized_camera="EOSR7"))
+        for dt in BATCH_DATETIMES
+        for name in BATCH_NAMES
+    ]
+    assert generate_plans(records) == [generate_plan(src, meta) for src, meta in records]
+
+
+def test_generate_plans_empty():
+    assert generate_plans([]) == []
@@ -0,0 +1,98 @@
+import os
+from pathlib import Path
+from queue import Queue
+from unittest.mock import patch
+
+from msr.core.dest_index import DestinationIndex
+from msr.core.file_processor import FileProcessor
+from msr.core.metadata import MetaRecord
+from msr.core.planner import Action, Plan
+from msr.core.run_plan import CopyTask, DestinationAssigner, assign_destinations
+from msr.core.scanner import FileStat
+
+NAME = "2023-01-01_10-00-00_1234{}_EOSR7.jpg"
+
+
+def make_task(src_dir: Path, result: Path, sub: str, data: bytes) -> CopyTask:
+    src = src_dir / sub / "IMG_1234.jpg"
+    src.parent.mkdir(parents=True)
+    src.write_bytes(data)
+    plan = Plan(Action.COPY_RENAME, src, Path("2023-01-01"), NAME.format(""))
+    return CopyTask(src, plan, result / "2023-01-01" / NAME.format(""))
+
+
+def stats_of(tasks):
+    return {
+        t.src_path: FileStat(t.src_path.stat().st_size, t.src_path.stat().st_mtime_ns, 0)
+        for t in tasks
+    }
+
+
+def test_assign_destinations_resolves_whole_run_in_source_order(tmp_path):
+    result = tmp_path / "result"
+    out = result / "2023-01-01"
+    out.mkdir(parents=True)
+    (out / NAME.format("")).write_bytes(b"already here")
+    tasks = [
+        make_task(tmp_path / "src", result, "a", b"first"),
+        make_task(tmp_path / "src", result, "b", b"second!"),
+        make_task(tmp_path / "src", result, "c", b"first"),
+    ]
+    # c는 a와 내용/수정시간이 같은 중복 원본이다.
+    st = tasks[0].src_path.stat()
+    os.utime(tasks[2].src_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    skipped = CopyTask(tmp_path / "x.jpg", Plan(Action.SKIP, tmp_path / "x.jpg", reason="촬영일 없음"))
+
+    frozen = assign_destinations(
+        [tasks[0], skipped, tasks[1], tasks[2]],
+        DestinationAssigner(DestinationIndex(result)),
+        stats_of(tasks),
+    )
+
+    assert isinstance(frozen, tuple)
+    assert frozen[1] is skipped
+    a, _, b, c = frozen
+    assert (a.final_dst_path.name, a.needs_transfer) == (NAME.format("1"), True)
+    assert (b.final_dst_path.name, b.needs_transfer) == (NAME.format("2"), True)
+    assert c.final_dst_path == a.final_dst_path and c.already_exists and not c.needs_transfer
+
+
+def test_existing_same_file_is_planned_as_already_exists(tmp_path):
+    result = tmp_path / "result"
+    task = make_task(tmp_path / "src", result, "a", b"same")
+    dst = result / "2023-01-01" / NAME.format("")
+    dst.parent.mkdir(parents=True)
+    dst.write_bytes(b"same")
+    st = task.src_path.stat()
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    (frozen,) = assign_destinations(
+        [task], DestinationAssigner(DestinationIndex(result)), stats_of([task])
+    )
+    assert frozen.final_dst_path == dst and frozen.already_exists
+
+
+def test_processor_plans_every_file_before_copying(tmp_path):
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    for i in range(6):
+        (src_dir / f"IMG_{i:04d}.jpg").write_bytes(b"x" * (i + 1))
+    meta = MetaRecord(datetime_original="2023:01:01 10:00:00", normalized_camera="EOSR7")
+    out_dir = src_dir / "result" / "2023-01-01"
+    copied_during_extraction = []
+
+    def fake_extract(chunk, session=None, report=None, **options):
+        copied_during_extraction.extend(out_dir.glob("*.jpg") if out_dir.exists() else [])
+        return {p.resolve(): meta for p in chunk}
+
+    processor = FileProcessor(
+        str(src_dir), Queue(), use_metadata_cache=False, chunk_min_size=1, chunk_max_size=1,
+        exiftool_workers=1,
+    )
+    with patch("msr.core.file_processor.extract_metadata_batch", side_effect=fake_extract):
+        processor.process_files()
+
+    assert copied_during_extraction == []
+    assert len(processor.run_plan) == 6
+    assert processor.summary.converted_success == 6
+    assert len(list(out_dir.glob("*.jpg"))) == 6
@@ -1,8 +1,10 @@
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock
+import os
+from unittest.mock import MagicMock, patch
 
 from msr.core.file_processor import FileProcessor, SUPPORTED_EXTENSIONS
+from msr.core.scanner import FileStat
 
 @pytest.fixture
 def file_processor_instance(tmp_path):
@@ -13,6 +15,22 @@ def file_processor_instance(tmp_path):
     mock_event_queue = MagicMock() # event_queue는 이 테스트에서 사용되지 않으므로 mock 처리
     return FileProcessor(str(tmp_path), mock_event_queue)
 
+class ListChannel(list):
+    """_scan_stage의 출력 채널 대신 쓰는 목록."""
+
+    def put(self, item):
+        self.append(item)
+
+    def close(self):
+        pass
+
+
+def scan(processor: FileProcessor) -> list[Path]:
+    """실제 수집 단계(_scan_stage)를 실행해 내보낸 파일 목록을 돌려준다."""
+    out = ListChannel()
+    processor._scan_stage(out)
+    return list(out)
+
 def create_files(base_path: Path, file_names: list[str]):
     """Helper function to create dummy files within a given base_path."""
     for name in file_names:
@@ -22,7 +40,7 @@ def test_scan_empty_directory(file_processor_instance):
     """
     Test case: Scanning an empty source directory should return an empty list.
     """
-    files = file_processor_instance._scan_files()
+    files = scan(file_processor_instance)
     assert len(files) == 0
 
 def test_scan_supported_and_unsupported_files(tmp_path, file_processor_instance):
@@ -36,7 +54,7 @@ def test_scan_supported_and_unsupported_files(tmp_path, file_processor_instance)
         tmp_path / "video.mp4"
     ]
     
-    files = file_processor_instance._scan_files()
+    files = scan(file_processor_instance)
     assert len(files) == len(expected_files)
     # Convert to set for order-independent comparison, then back to list for sorting check if needed.
     assert set(files) == set(expected_files)
@@ -51,7 +69,7 @@ def test_scan_excludes_result_directory(tmp_path, file_processor_instance):
     
     expected_files = [tmp_path / "photo_outside.jpg"]
     
-    files = file_processor_instance._scan_files()
+    files = scan(file_processor_instance)
     assert len(files) == len(expected_files)
     assert set(files) == set(expected_files)
 
@@ -72,7 +90,7 @@ def test_scan_recursive_subdirectories(tmp_path, file_processor_instance):
         tmp_path / "subdir1" / "nested" / "nested_video.mov"
     ]
     
-    files = file_processor_instance._scan_files()
+    files = scan(file_processor_instance)
     assert len(files) == len(expected_files)
     assert set(files) == set(expected_files)
 
@@ -90,8 +108,8 @@ def test_scan_returns_sorted_paths(tmp_path, file_processor_instance):
         tmp_path / "c_video.mp4"
     ]
     
-    files = file_processor_instance._scan_files()
-    assert files == expected_files # _scan_files already sorts, so compare directly with sorted expected.
+    files = scan(file_processor_instance)
+    assert files == expected_files # 스캐너가 정렬 순서로 내보낸다.
 
 def test_scan_case_insensitive_extensions(tmp_path, file_processor_instance):
     """
@@ -104,7 +122,7 @@ def test_scan_case_insensitive_extensions(tmp_path, file_processor_instance):
         tmp_path / "photo.JPG"
     ]
     
-    files = file_processor_instance._scan_files()
+    files = scan(file_processor_instance)
     assert len(files) == len(expected_files)
     assert set(files) == set(expected_files)
 
@@ -122,6 +140,58 @@ def test_scan_result_folder_name_as_part_of_other_folder(tmp_path, file_processo
         tmp_path / "root_image.jpg"
     ]
     
-    files = file_processor_instance._scan_files()
+    files = scan(file_processor_instance)
     assert len(files) == len(expected_files)
     assert set(files) == set(expected_files)
+
+def test_scan_does_not_descend_into_result(tmp_path, file_processor_instance):
+    """
+    result/ 는 루트에서 통째로 제외되어 하위 디렉터리를 열지 않아야 합니다.
+    (하위 폴더가 result/ 아래에 있는 경우에만 제외, 중첩된 다른 result 폴더는 대상)
+    """
+    (tmp_path / "result" / "2023-01-01").mkdir(parents=True)
+    create_files(tmp_path / "result" / "2023-01-01", ["copied.jpg"])
+    (tmp_path / "trip" / "result").mkdir(parents=True)
+    create_files(tmp_path / "trip" / "result", ["nested.jpg"])
+
+    opened = []
+    real_scandir = os.scandir
+
+    def spy_scandir(path):
+        opened.append(Path(path))
+        return real_scandir(path)
+
+    with patch("msr.core.scanner.os.scandir", side_effect=spy_scandir):
+        files = scan(file_processor_instance)
+
+    assert files == [tmp_path / "trip" / "result" / "nested.jpg"]
+    assert not any(p.is_relative_to(tmp_path / "result") for p in opened)
+
+def test_scan_keeps_stat_data(tmp_path, file_processor_instance):
+    """
+    Test case: Scanned files should keep size/mtime/inode from the DirEntry for later stages.
+    """
+    (tmp_path / "IMG_0001.jpg").write_bytes(b"12345")
+    (tmp_path / "notes.txt").write_text("x")
+
+    files = scan(file_processor_instance)
+
+    st = os.stat(files[0])
+    assert file_processor_instance.file_stats == {
+        tmp_path / "IMG_0001.jpg": FileStat(5, st.st_mtime_ns, st.st_ino)
+    }
+
+def test_scan_sorted_order_matches_path_sort_across_directories(tmp_path, file_processor_instance):
+    """
+    Test case: Depth-first streaming order must equal sorted(Path) even when names interleave dirs/files.
+    """
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a-b").mkdir()
+    create_files(tmp_path, ["a.jpg", "a0.jpg", ".jpg"])
+    create_files(tmp_path / "a", ["z.jpg"])
+    create_files(tmp_path / "a-b", ["c.mp4"])
+
+    files = scan(file_processor_instance)
+
+    assert files == sorted(files)
+    assert len(files) == 4  # ".jpg"는 확장자 없는 점 파일
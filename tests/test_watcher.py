@@ -0,0 +1,144 @@
+import sys
+import threading
+import time
+import pytest
+from pathlib import Path
+from queue import Queue
+
+from msr.core.copy_engine import PARTIAL_SUFFIX
+from msr.core.file_processor import FileProcessor, SUPPORTED_EXTENSIONS, WATCH_MARKER_FILENAME
+from msr.core.metadata import MetaRecord
+from msr.core.watcher import InotifyWatcher, PollingWatcher, SettleTracker
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify는 Linux 전용")
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_settle_tracker_waits_until_file_stops_changing(tmp_path):
+    f = tmp_path / "IMG_0001.jpg"
+    f.write_text("a")
+    tracker = SettleTracker(settle_seconds=1.0)
+    tracker.add([f], now=0.0)
+
+    assert tracker.ready(now=0.0) == []  # 첫 확인: 현재 크기/mtime 기록
+    f.write_text("ab")
+    assert tracker.ready(now=0.9) == []  # 바뀌었으므로 다시 기다림
+    assert tracker.ready(now=1.5) == []
+    assert tracker.ready(now=2.0) == [f]
+    assert len(tracker) == 0
+
+
+def test_settle_tracker_drops_vanished_files(tmp_path):
+    f = tmp_path / "IMG_0001.jpg"
+    f.write_text("a")
+    tracker = SettleTracker(settle_seconds=0.0)
+    tracker.add([f], now=0.0)
+    f.unlink()
+    assert tracker.ready(now=1.0) == []
+    assert len(tracker) == 0
+
+
+def test_polling_watcher_reports_new_and_changed_files(tmp_path):
+    existing = tmp_path / "IMG_0001.jpg"
+    existing.write_text("a")
+    (tmp_path / "result").mkdir()
+    watcher = PollingWatcher(tmp_path, SUPPORTED_EXTENSIONS, interval=0.0)
+
+    new = tmp_path / "sub" / "IMG_0002.jpg"
+    new.parent.mkdir()
+    new.write_text("b")
+    (tmp_path / "result" / "copy.jpg").write_text("c")
+    (tmp_path / "notes.txt").write_text("d")
+    assert watcher.poll(0.0) == {new}
+
+    existing.write_text("changed")
+    assert watcher.poll(0.0) == {existing}
+    assert watcher.poll(0.0) == set()
+
+
+@linux_only
+def test_inotify_watcher_follows_new_directories_and_skips_result(tmp_path):
+    (tmp_path / "result").mkdir()
+    watcher = InotifyWatcher(tmp_path, SUPPORTED_EXTENSIONS)
+    try:
+        sub = tmp_path / "DCIM" / "100CANON"
+        sub.mkdir(parents=True)
+        inside = sub / "IMG_0001.jpg"
+        inside.write_text("a")
+        (tmp_path / "result" / "copy.jpg").write_text("c")
+
+        seen: set[Path] = set()
+        assert wait_for(lambda: seen.update(watcher.poll(0.1)) or inside in seen)
+
+        later = sub / "IMG_0002.mov"
+        later.write_text("b")
+        assert wait_for(lambda: seen.update(watcher.poll(0.1)) or later in seen)
+        assert not any("result" in p.parts for p in seen)
+    finally:
+        watcher.close()
+
+
+def test_watch_folder_processes_dropped_files(tmp_path, patch_extraction):
+    src_dir = tmp_path / "source"
+    src_dir.mkdir()
+    before = src_dir / "IMG_0001.jpg"
+    before.write_text("before")
+    meta = MetaRecord(datetime_original="2023:01:01 10:00:00", normalized_camera="EOSR7")
+    stop_event = threading.Event()
+    event_queue = Queue()
+    processor = FileProcessor(str(src_dir), event_queue, stop_event, use_metadata_cache=False)
+    watcher = PollingWatcher(src_dir, SUPPORTED_EXTENSIONS, interval=0.05)
+
+    with patch_extraction(default=meta) as fake:
+        thread = threading.Thread(
+            target=processor.watch_folder,
+            kwargs={"settle_seconds": 0.1, "batch_window": 0.1, "watcher": watcher},
+        )
+        thread.start()
+        try:
+            out_dir = src_dir / "result" / "2023-01-01"
+            assert wait_for(lambda: (out_dir / "2023-01-01_10-00-00_0001_EOSR7.jpg").exists())
+
+            dropped = src_dir / "IMG_0002.jpg"
+            dropped.write_text("dropped")
+            assert wait_for(lambda: (out_dir / "2023-01-01_10-00-00_0002_EOSR7.jpg").exists())
+            time.sleep(0.3)
+        finally:
+            stop_event.set()
+            thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert fake.extracted == [before, dropped]  # 처리한 파일은 다시 추출하지 않는다
+    events = []
+    while not event_queue.empty():
+        events.append(event_queue.get())
+    summary = next(e["summary"] for e in events if e["type"] == "COMPLETE")
+    assert summary.total_files == 2
+    assert summary.converted_success == 2
+
+
+@pytest.mark.parametrize("interrupted", [False, True])
+def test_watch_folder_sweeps_partial_files_only_after_killed_watch(tmp_path, interrupted):
+    src_dir = tmp_path / "source"
+    partial = src_dir / "result" / "2023-01-01" / f".x.jpg.1{PARTIAL_SUFFIX}"
+    partial.parent.mkdir(parents=True)
+    partial.write_bytes(b"x")
+    marker = src_dir / "result" / WATCH_MARKER_FILENAME
+    if interrupted:
+        marker.touch()  # 강제 종료된 앞 감시가 남긴 표시 파일
+
+    stop_event = threading.Event()
+    stop_event.set()
+    processor = FileProcessor(str(src_dir), Queue(), stop_event, use_metadata_cache=False)
+    processor.watch_folder(watcher=PollingWatcher(src_dir, SUPPORTED_EXTENSIONS, interval=0.05))
+
+    assert partial.exists() != interrupted
+    assert not marker.exists()  # 정상 종료하면 표시 파일을 지운다
@@ -0,0 +1,105 @@
+"""
+메모리 벤치마크: 파일 1개당 메타데이터/계획 표현이 차지하는 바이트(이전 표현 vs 현재 표현).
+파이프라인이 실제로 쓰는 표현만 잰다: chunk마다의 {경로: MetaRecord} dict와 generate_plans의 계획.
+
+    python tools/bench_memory.py [레코드 수(기본 1000000)]
+
+- 이전: __dict__가 있는 dataclass, 파일마다 새로 만든 제조사/모델 문자열(JSON 해석 결과처럼),
+  파일마다 새 dst_dir Path(generate_plan).
+- 현재: __slots__ MetaRecord/Plan(제조사/모델 intern), 계획은 generate_plans(같은 날짜 폴더
+  Path 공유).
+- 원본 Path 자체는 두 표현이 같으므로 빼고, 그 위에 더해지는 바이트만 tracemalloc으로 잰다.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from msr.core.metadata import MetaRecord
+from msr.core.planner import Action, generate_plans
+
+from bench_planner import build_records
+
+
+@dataclass
+class LegacyMetaRecord:
+    """이전 MetaRecord(__slots__ 없음)."""
+    datetime_original: Optional[str] = None
+    camera_make: Optional[str] = None
+    camera_model: Optional[str] = None
+    normalized_camera: str = "UNKNOWN"
+
+
+@dataclass
+class LegacyPlan:
+    """이전 Plan(__slots__ 없음)."""
+    action: Action
+    src_path: Path
+    dst_dir: Optional[Path] = None
+    dst_name: Optional[str] = None
+    reason: Optional[str] = None
+
+
+def measure(build: Callable[[], object]) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+
+def main(argv: list[str]) -> int:
+    count = int(argv[1]) if len(argv) > 1 else 1_000_000
+    # ExifTool -json 출력 1건씩(측정 밖). 해석한 문자열은 기종이 같아도 파일마다 다른 객체다.
+    raw = [
+        (path, json.dumps([meta.datetime_original, "Canon", "Canon EOS R7"]))
+        for path, meta in build_records(count)
+    ]
+
+    _, legacy_meta_bytes = measure(lambda: [
+        (path, LegacyMetaRecord(*json.loads(line), "EOSR7")) for path, line in raw
+    ])
+    records, slotted_meta_bytes = measure(lambda: [
+        (path, MetaRecord(*json.loads(line), "EOSR7")) for path, line in raw
+    ])
+
+    plans = generate_plans(records)
+    legacy_plans_src = [
+        (p.action, p.src_path, str(p.dst_dir) if p.dst_dir else None, p.dst_name, p.reason)
+        for p in plans
+    ]
+    del plans
+    # generate_plan은 파일마다 dst_dir Path를 새로 만들었다.
+    _, legacy_plan_bytes = measure(lambda: [
+        LegacyPlan(action, src, Path(d) if d else None, name, reason)
+        for action, src, d, name, reason in legacy_plans_src
+    ])
+    _, plan_bytes = measure(lambda: generate_plans(records))  # type: ignore[arg-type]
+
+    def per_file(n: int) -> str:
+        return f"{n / count:7.1f} B/파일"
+
+    print(f"레코드 {count:,}개 (원본 Path 제외)")
+    print(f"메타데이터  이전 dataclass            : {per_file(legacy_meta_bytes)}")
+    print(f"메타데이터  __slots__ + intern        : {per_file(slotted_meta_bytes)}")
+    print(f"계획        이전 dataclass            : {per_file(legacy_plan_bytes)}")
+    print(f"계획        __slots__ + 폴더 Path 공유: {per_file(plan_bytes)}")
+    before = legacy_meta_bytes + legacy_plan_bytes
+    after = slotted_meta_bytes + plan_bytes
+    print(f"합계 {per_file(before)} -> {per_file(after)} ({before / after:.2f}배 작음)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,82 @@
+"""
+계획 생성 마이크로벤치마크: generate_plan(파일마다) vs generate_plans(일괄).
+
+    python tools/bench_planner.py [레코드 수(기본 1000000)] [반복 횟수(기본 3)]
+
+- 레코드는 IMG 패턴 85%, PASS 패턴 5%, 그 밖의 이름 10%, 촬영일 없음 5%로 만든다
+  (촬영일 문자열의 일부는 ExifTool처럼 .ms/+TZ가 붙는다).
+- 두 API의 결과가 모두 같은지 확인한 뒤, 반복 중 가장 빠른 시간으로 파일당 비용(µs)을 출력한다.
+- 메타데이터 추출/복사는 포함하지 않는다(순수 계획 비용).
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from msr.core.metadata import MetaRecord
+from msr.core.planner import generate_plan, generate_plans
+
+
+def build_records(count: int, seed: int = 0) -> list[tuple[Path, MetaRecord]]:
+    rng = random.Random(seed)
+    root = Path("/mnt/nas/photos/DCIM")
+    records = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.85:
+            name = f"IMG_{i % 10000:04d}.{rng.choice(('JPG', 'HEIC', 'CR3', 'MOV'))}"
+        elif roll < 0.90:
+            name = f"2023-05-{i % 28 + 1:02d}_10-00-00_{i}_EOSR7.jpg"
+        else:
+            name = f"DSC{i:05d}.JPG"
+        if rng.random() < 0.05:
+            shot = None
+        else:
+            shot = (
+                f"{rng.randint(2015, 2025)}:{rng.randint(1, 12):02d}:{rng.randint(1, 28):02d} "
+                f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+            )
+            if rng.random() < 0.3:
+                shot += ".123+09:00"
+        meta = MetaRecord(datetime_original=shot, normalized_camera="EOSR7")
+        records.append((root / f"{100 + i // 5000}CANON" / name, meta))
+    return records
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str]) -> int:
+    count = int(argv[1]) if len(argv) > 1 else 1_000_000
+    repeat = int(argv[2]) if len(argv) > 2 else 3
+    records = build_records(count)
+
+    single = [generate_plan(src, meta) for src, meta in records]
+    batch = generate_plans(records)
+    if single != batch:
+        print("결과가 다릅니다: generate_plans != generate_plan", file=sys.stderr)
+        return 1
+    del single, batch
+
+    t_single = best_of(repeat, lambda: [generate_plan(src, meta) for src, meta in records])
+    t_batch = best_of(repeat, lambda: generate_plans(records))
+    print(f"레코드 {count:,}개, {repeat}회 중 최소")
+    print(f"generate_plan  : {t_single:7.2f}초 ({t_single / count * 1e6:6.2f} µs/파일)")
+    print(f"generate_plans : {t_batch:7.2f}초 ({t_batch / count * 1e6:6.2f} µs/파일)")
+    print(f"속도 향상      : {t_single / t_batch:.2f}배")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))